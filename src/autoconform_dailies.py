@@ -1,12 +1,14 @@
 import os
 import sys
 import re
+import json
 import subprocess
 from pprint import pformat
 from pathlib import Path
 from timecode import Timecode as tc
 import OpenEXR
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 import signal
 from datetime import datetime as dt
 import opentimelineio as otio
@@ -19,7 +21,6 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal,  QUrl
 from PyQt5.QtGui import QPalette, QColor
 
 from pymediainfo import MediaInfo
-from functools import cached_property
 from dvr_tools.logger_config import get_logger
 from dvr_tools.css_style import apply_style
 from dvr_tools.resolve_utils import ResolveObjects, get_resolve_shot_list
@@ -27,6 +28,9 @@ from config.config_loader import load_config
 from config.config import get_config
 from config.global_config import GLOBAL_CONFIG
 from common_tools.edl_parsers import detect_edl_parser
+from common_tools.timecode_utils import timecode_to_frames
+from common_tools.probe_cache import ProbeCache
+from common_tools.frame_sequence import FrameSequence
 
 logger = get_logger(__file__)
 
@@ -39,6 +43,19 @@ SHOTS_PATH = {"win32": GLOBAL_CONFIG["scripts_settings"]["autoconform"]["shots_p
 AUTOCONFORM_OUTPUT = GLOBAL_CONFIG["output_folders"]["autoconform"]
 
 SEQCHECKER_OUTPUT = GLOBAL_CONFIG["output_folders"]["sequence_checker"]
+SEQCHECKER_SETTINGS = GLOBAL_CONFIG["scripts_settings"]["sequence_checker"]
+SEQCHECKER_CACHE = "sequence_checker_cache.sqlite"
+
+# Длина n-грамм индекса имен шотов
+SHOT_INDEX_GRAM = 3
+# Символы регулярного выражения, при которых имя шота ищется полным перебором путей
+SHOT_REGEX_CHARS = set("\\^$*+?{}[]|()")
+
+def iter_grams(text: str):
+    """
+    Все подстроки длины SHOT_INDEX_GRAM.
+    """
+    return (text[i:i + SHOT_INDEX_GRAM] for i in range(len(text) - SHOT_INDEX_GRAM + 1))
 
 class OTIOCreator:
     """
@@ -49,6 +66,10 @@ class OTIOCreator:
         self.resolve_shot_list = resolve_shot_list
         self.send_warning = lambda msg: None
         self.frame_mask = get_config()["patterns"]["frame_number"]
+        self.shot_name_mask = get_config()["patterns"]["shot_name"]
+        self.shot_lookup_mode = get_config()["scripts_settings"]["autoconform"].get("shot_lookup_mode", "index")
+        self.probe_workers = get_config()["scripts_settings"]["autoconform"].get("probe_workers", 16)
+        self.shot_objects = {}
         self.gui = gui
         self.signals = signals
 
@@ -69,6 +90,59 @@ class OTIOCreator:
                     paths.append(os.path.join(root, file))
         
         return paths
+
+    def build_shots_index(self, paths) -> tuple[dict, list]:
+        """
+        Строит n-граммный индекс путей к шотам.
+        Индексируется имя шота, полученное из имени папки(файла) маской patterns["shot_name"].
+        Если маска обрезала имя (номер кадра, расширение), путь попадает в список непроиндексированных
+        и при поиске всегда проверяется полностью, поэтому индекс не теряет совпадений.
+
+        :return: Кортеж ({n-грамма: множество позиций путей}, позиции непроиндексированных путей).
+        """
+        index = {}
+        unindexed = []
+        for position, path in enumerate(paths):
+            folder_name = os.path.basename(path)
+            if not self.not_movie_bool and not folder_name.endswith((".mov", ".mp4")):
+                continue
+
+            shot_token = re.sub(self.shot_name_mask, '', folder_name)
+            if shot_token != folder_name:
+                unindexed.append(position)
+                continue
+
+            for gram in set(iter_grams(shot_token)):
+                index.setdefault(gram, set()).add(position)
+
+        return index, unindexed
+
+    def get_index_candidates(self, pattern) -> list | None:
+        """
+        Позиции путей, которые могут содержать имя шота.
+        Каждая подстрока имени без символов регулярного выражения обязана целиком входить в имя папки,
+        поэтому пересечение позиций ее n-грамм содержит все совпадения поиска подстрокой.
+
+        :return: Отсортированные позиции путей или None, если имя нельзя искать по индексу.
+        """
+        if SHOT_REGEX_CHARS.intersection(pattern):
+            return None
+        # '.' в имени шота - любой символ, поэтому n-граммы берутся только из частей между точками
+        grams = {gram for part in pattern.split(".") for gram in iter_grams(part)}
+        if not grams:
+            return None
+
+        positions = None
+        for gram in sorted(grams, key=lambda gram: len(self.shots_index.get(gram, ()))):
+            found = self.shots_index.get(gram)
+            if not found:
+                positions = set()
+                break
+            positions = set(found) if positions is None else positions & found
+            if not positions:
+                break
+
+        return sorted(positions.union(self.unindexed_positions))
     
     def is_drop_frames(self, shot_frames, shot_path, shot_name):
         """
@@ -122,15 +196,18 @@ class OTIOCreator:
             gap_dur = self.timecode_to_frame(edl_record_in) - self.timecode_to_frame(edl_start_timecodes[track_index])
         return gap_dur
     
-    def is_miss_frames(self, shot_name, frames_list) -> bool: 
+    def is_miss_frames(self, shot_name, frame_sequence) -> bool: 
         """
         Метод проверяет есть ли потерянные кадры в секвенции.
         Работает только с секвенциями.
+
+        :param frame_sequence: Основная секвенция папки (FrameSequence) или None, если в папке нет кадров с номером.
         """
-        frames_numbers_list = [int(re.search(self.frame_mask, i).group(0).split(".")[0]) for i in frames_list]  
-        if not all(frames_numbers_list[i] + 1 == frames_numbers_list[i + 1] 
-                   for i in range(len(frames_numbers_list) - 1)):
-            message = f"🔴  Шот {shot_name} имеет потерянные фреймы. Необходимо добавить шот вручную."
+        if frame_sequence is None or frame_sequence.has_gaps:
+            if frame_sequence is None:
+                message = f"🔴  В папке шота {shot_name} нет кадров с номером. Необходимо добавить шот вручную."
+            else:
+                message = f"🔴  Шот {shot_name} имеет потерянные фреймы. Необходимо добавить шот вручную."
             self.send_warning(message)
             logger.warning(message)
             self.gui.otio_counter += 1
@@ -138,11 +215,25 @@ class OTIOCreator:
             return False
         return True
     
+    def is_multiple_sequences(self, shot) -> bool:
+        """
+        Проверяет, есть ли в папке шота несколько секвенций.
+        Шот не пропускается: в конформ идет основная секвенция (SequenceFrames.frame_sequence).
+        """
+        if len(shot.sequences) < 2:
+            return False
+        others = ", ".join(seq.pattern for seq in shot.sequences if seq is not shot.frame_sequence)
+        message = (f"🟡  В папке шота {os.path.basename(shot.path)} несколько секвенций. "
+                   f"Используется {shot.frame_sequence.pattern}, пропущены: {others}")
+        self.send_warning(message)
+        logger.warning(message)
+        return True
+
     def timecode_to_frame(self, timecode)-> int:
         """
         Метод получает таймкод во фреймах.
         """
-        return tc(self.frame_rate, timecode).frames
+        return timecode_to_frames(self.frame_rate, timecode)
     
     def frame_to_timecode(self, frames):
         """
@@ -154,24 +245,39 @@ class OTIOCreator:
             """
             Метод обходит папку с секвенциями или видеофайлами и отбирает только те, 
             которые пересекаются с именем шота из EDL.
+            В режиме "index" перебираются только пути-кандидаты из n-граммного индекса.
+            Результат для имени шота запоминается на время запуска.
 
             :param shot_name: Имя шота из EDL.
 
             :return: Список путей с фильтрованными по имени шота фолдерами(секвенциями) или видеофайлами.
             Если присутствует несколько версий шота, в аутпут списке будут несколько версий.
             """
+            cached = self.filtred_shots.get(shot_name)
+            if cached is not None:
+                return list(cached)
+
+            pattern = shot_name.lower()
+            candidates = None
+            if self.shot_lookup_mode != "substring":
+                candidates = self.get_index_candidates(pattern)
+            if candidates is None:
+                candidates = range(len(self.shots_paths))
+
             target_list = []
 
-            for folder_path in self.shots_paths:
+            for position in candidates:
+                folder_path = self.shots_paths[position]
                 folder_name = os.path.basename(folder_path)
                 if self.not_movie_bool:
-                    if re.search(shot_name.lower(), folder_name): 
+                    if re.search(pattern, folder_name): 
                         target_list.append(folder_path)
                 else:
-                    if folder_name.endswith((".mov", ".mp4")) and re.search(shot_name.lower(), folder_name): 
+                    if folder_name.endswith((".mov", ".mp4")) and re.search(pattern, folder_name): 
                         target_list.append(folder_path)
 
-            return target_list
+            self.filtred_shots[shot_name] = target_list
+            return list(target_list)
 
     def split_name(self, clip_name) -> tuple:
         """
@@ -332,9 +438,7 @@ class OTIOCreator:
         Сравнивает проектный fps и fps шота.
         """
         try:
-            frame = OpenEXR.InputFile(shot.first_frame_path)
-            header = frame.header()
-            frame_fps = header.get('nuke/input/frame_rate')
+            frame_fps = shot.exr_header["frame_rate"]
 
             if frame_fps is not None:
                 # Иногда информация о фрейм рейте хранится в байтовом представлении. Учитываем это.
@@ -362,7 +466,8 @@ class OTIOCreator:
             if self.is_duplicate(shot.name, self.resolve_shot_list):
                 return False
 
-        if not self.is_miss_frames(shot.name, shot.frames_list):
+        self.is_multiple_sequences(shot)
+        if not self.is_miss_frames(shot.name, shot.frame_sequence):
             return False
         if not self.is_correct_fps(shot):
             return False
@@ -386,7 +491,7 @@ class OTIOCreator:
                     return []
                 
                 if self.not_movie_bool:
-                    shot = SequenceFrames(shot_path, self.clip_extension)
+                    shot = self.get_shot_object(shot_path)
                     if not shot:
                         continue
 
@@ -396,7 +501,7 @@ class OTIOCreator:
 
                     shots_versions.append(shot)         
                 else:
-                    shot = MovieObject(shot_path)
+                    shot = self.get_shot_object(shot_path)
                     if not shot:
                         continue
 
@@ -412,6 +517,51 @@ class OTIOCreator:
             self.gui.update_result_label()
             return []
         
+    def get_shot_object(self, shot_path):
+        """
+        Возвращает объект шота из предварительно собранных или создает новый.
+        """
+        shot = self.shot_objects.get(shot_path)
+        if shot is None:
+            if self.not_movie_bool:
+                shot = SequenceFrames(shot_path, self.clip_extension, probe_cache=self.probe_cache)
+            else:
+                shot = MovieObject(shot_path, probe_cache=self.probe_cache)
+            self.shot_objects[shot_path] = shot
+        return shot
+
+    def get_probe_cache_path(self) -> Path | None:
+        """
+        Путь к персистентному кешу проб шотов проекта.
+        """
+        project = self.user_config.get("project")
+        if not project or project == "Select Project":
+            return None
+        return Path(ROOT_PROJECTS) / project / AUTOCONFORM_OUTPUT / "probe_cache.pickle"
+
+    def prefetch_shots(self, edl_data) -> None:
+        """
+        Параллельно собирает данные всех шотов из EDL до начала конформа:
+        список кадров, заголовок первого EXR кадра или данные MediaInfo видеофайла.
+        """
+        for data in edl_data:
+            for shot_path in self.get_filtred_shots(data.edl_shot_name):
+                self.get_shot_object(shot_path)
+
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as executor:
+            list(executor.map(lambda shot: shot.prefetch(), self.shot_objects.values()))
+
+        logger.info(f"Предварительно прочитаны данные {len(self.shot_objects)} шотов")
+
+    def save_probe_cache(self) -> None:
+        """
+        Сохраняет кеш проб шотов. Ошибка сохранения не прерывает конформ.
+        """
+        try:
+            self.probe_cache.save()
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить кеш проб шотов: {e}")
+
     def cut_slate(self, source_in_tc) -> int:
         """
         Метод отрезает 1 кадр слейта в .mov дейлизах, оставляя его в захлесте
@@ -639,10 +789,18 @@ class OTIOCreator:
         self.start_frame_ui = self.user_config["start_frame_ui"]
         self.not_movie_bool = self.clip_extension not in ("mov", "mp4")
         self.shots_paths = self.get_shots_paths(self.user_config["shots_folder"])
+        self.filtred_shots = {}
+        if self.shot_lookup_mode != "substring":
+            self.shots_index, self.unindexed_positions = self.build_shots_index(self.shots_paths)
         self.include_slate = self.user_config["include_slate"]
+        probe_cache_path = self.get_probe_cache_path()
+        self.probe_cache = ProbeCache(str(probe_cache_path) if probe_cache_path else None)
+        self.shot_objects = {}
 
         try:
             edl_data = detect_edl_parser(self.frame_rate, self.edl_path)
+            self.prefetch_shots(edl_data)
+            self.save_probe_cache()
             self.otio_timeline = otio.schema.Timeline(name="Timeline") 
             self.create_video_tracks()
             # edl_start_timecodes: - Список промежуточных значений edl_record_out для вычисления GAP на каждом треке
@@ -699,6 +857,7 @@ class OTIOCreator:
 
                     edl_start_timecodes[track_index] = edl_record_out
 
+            self.save_probe_cache()
             timeline_objects = self.count_timeline_objects()
             return self.otio_timeline, timeline_objects
 
@@ -711,8 +870,10 @@ class MovieObject:
     """
     Класс-объект видеофайла .MOV или .MP4.
     """
-    def __init__(self, path, frame_pattern=None):
+    def __init__(self, path, frame_pattern=None, probe_cache=None):
         self.path = path
+        self.probe_cache = probe_cache
+        self._video_track = None
 
     @property
     def name(self)-> str:
@@ -720,22 +881,52 @@ class MovieObject:
         Получение имени клипа.
         """
         return os.path.basename(self.path)
+
+    @staticmethod
+    def probe_video_track(path) -> dict | None:
+        """
+        Читает через MediaInfo данные первого видеотрека: длительность в мс и стартовый таймкод.
+        """
+        media_info = MediaInfo.parse(path)
+        for track in media_info.tracks:
+            if track.track_type == "Video":
+                return {"duration": track.duration, "other_delay": track.other_delay}
+        return None
+
+    @property
+    def video_track(self) -> dict | None:
+        """
+        Данные видеотрека. MediaInfo вызывается один раз на объект (или берется из кеша проб).
+        """
+        if self._video_track is None:
+            if self.probe_cache is not None:
+                self._video_track = self.probe_cache.probe(self.path, "mediainfo", self.probe_video_track)
+            else:
+                self._video_track = self.probe_video_track(self.path)
+        return self._video_track
+
+    def prefetch(self) -> None:
+        """
+        Предварительное чтение данных видеофайла.
+        """
+        try:
+            self.video_track
+        except Exception as e:
+            logger.debug(f"Не удалось прочитать данные {self.path}: {e}")
     
     def get_duration(self, frame_rate:int)-> int:
         """
         Получение длительности видеофайла.
         """
         try:
-            media_info = MediaInfo.parse(self.path)
-
-            for track in media_info.tracks:
-                if track.track_type == "Video":
-                    duration_seconds = track.duration / 1000  # переводим из миллисекунд в секунды
-                    duration_frames = duration_seconds * frame_rate  # умножаем на частоту кадров
-
-                    # Переводим в целое количество кадров
-                    duration = int(duration_frames)
-                    return duration
+            track = self.video_track
+            if track is not None:
+                duration_seconds = track["duration"] / 1000  # переводим из миллисекунд в секунды
+                duration_frames = duration_seconds * frame_rate  # умножаем на частоту кадров
+
+                # Переводим в целое количество кадров
+                duration = int(duration_frames)
+                return duration
                 
         except Exception as e:
             print(f"Ошибка при получении длительности видео: {e}")
@@ -746,22 +937,21 @@ class MovieObject:
         Получение стартового таймкода, конечного таймкода и длительности видеофайла.
         """
         try:
-            media_info = MediaInfo.parse(self.path)
             # Получаем длительность и начальный таймкод видео
-            for track in media_info.tracks:
-                if track.track_type == "Video":
+            track = self.video_track
+            if track is not None:
 
-                    # Длительность видео в секундах
-                    duration_seconds = track.duration / 1000  # переводим из миллисекунд в секунды
-                    duration_frames = duration_seconds * frame_rate  # умножаем на частоту кадров
-                    duration = int(duration_frames)
+                # Длительность видео в секундах
+                duration_seconds = track["duration"] / 1000  # переводим из миллисекунд в секунды
+                duration_frames = duration_seconds * frame_rate  # умножаем на частоту кадров
+                duration = int(duration_frames)
 
-                    # Извлекаем начальный таймкод
-                    if track.other_delay:
-                        start_timecode = tc(frame_rate, track.other_delay[4]).frames - 1  # -1 для корректного восприятия в Davinci Resolve
+                # Извлекаем начальный таймкод
+                if track["other_delay"]:
+                    start_timecode = timecode_to_frames(frame_rate, track["other_delay"][4]) - 1  # -1 для корректного восприятия в Davinci Resolve
 
-                    end_timecode = start_timecode + duration
-                    return (start_timecode, end_timecode, duration)
+                end_timecode = start_timecode + duration
+                return (start_timecode, end_timecode, duration)
             
         except Exception as e:
             print(f"Ошибка при получении длительности видео: {e}")
@@ -771,11 +961,17 @@ class SequenceFrames:
     """
     Класс-объект секвенций EXR или JPG.
     """
-    def __init__(self, path_to_sequence, extension, frame_pattern=None):
+    def __init__(self, path_to_sequence, extension, frame_pattern=None, probe_cache=None):
         self.path = path_to_sequence
         self.extension = extension
         self.frame_mask = get_config()["patterns"]["frame_number"]
         self.shot_name_mask = get_config()["patterns"]["shot_name"]
+        self.probe_cache = probe_cache
+        self._frames_list = None
+        self._sequences = None
+        self._frame_sequence = None
+        self._frame_sequence_ready = False
+        self._exr_header = None
 
     def __repr__(self):
         return F"Sequence'{self.name}'"
@@ -788,18 +984,89 @@ class SequenceFrames:
             raise ValueError("Некорректное значение индекса")
         return self.frames_list[index]
 
-    @cached_property
+    def list_frames(self, path) -> list:
+        """
+        Читает список кадров секвенции отсортированных по возрастанию.
+        """
+        return sorted([f for f in os.listdir(path) if f.lower().endswith(f'.{self.extension.lower()}')])
+
+    @property
     def frames_list(self):
         """
         Получаем список кадров секвенции отсортированных по возрастанию.
         """
-        return sorted([f for f in os.listdir(self.path) if f.lower().endswith(f'.{self.extension.lower()}')])
+        if self._frames_list is None:
+            if self.probe_cache is not None:
+                self._frames_list = self.probe_cache.probe(self.path, f"frames.{self.extension.lower()}", self.list_frames)
+            else:
+                self._frames_list = self.list_frames(self.path)
+        return self._frames_list
+
+    @property
+    def sequences(self) -> list[FrameSequence]:
+        """
+        Все секвенции кадров папки, сгруппированные по префиксу и суффиксу имени.
+        """
+        if self._sequences is None:
+            self._sequences = FrameSequence.from_names(self.path, self.frames_list)
+        return self._sequences
+
+    @property
+    def frame_sequence(self) -> FrameSequence | None:
+        """
+        Секвенция кадров с номерами в NumPy массиве.
+        Если в папке несколько секвенций, берется основная: с префиксом, совпадающим с именем папки,
+        а среди них (или при отсутствии совпадений) - с наибольшим количеством кадров.
+        None, если в папке нет кадров с номером.
+        """
+        if not self._frame_sequence_ready:
+            folder_name = os.path.basename(os.path.normpath(self.path)).lower()
+            self._frame_sequence = max(
+                self.sequences,
+                key=lambda seq: (seq.prefix.rstrip("._").lower() == folder_name, len(seq)),
+                default=None)
+            self._frame_sequence_ready = True
+        return self._frame_sequence
+
+    @staticmethod
+    def read_exr_header(frame_path) -> dict:
+        """
+        Читает из заголовка EXR кадра таймкод и FPS.
+        """
+        header = OpenEXR.InputFile(frame_path).header()
+        timecode = header.get('timeCode', None)
+        return {"timeCode": str(timecode) if timecode else None,
+                "frame_rate": header.get('nuke/input/frame_rate')}
+
+    @property
+    def exr_header(self) -> dict:
+        """
+        Данные заголовка первого кадра. Файл открывается один раз на объект (или берется из кеша проб).
+        """
+        if self._exr_header is None:
+            if self.probe_cache is not None:
+                self._exr_header = self.probe_cache.probe(self.first_frame_path, "exr_header", self.read_exr_header)
+            else:
+                self._exr_header = self.read_exr_header(self.first_frame_path)
+        return self._exr_header
+
+    def prefetch(self) -> None:
+        """
+        Предварительное чтение списка кадров и заголовка первого кадра.
+        """
+        try:
+            if self.frames_list and self.extension.lower() == "exr":
+                self.exr_header
+        except Exception as e:
+            logger.debug(f"Не удалось прочитать данные секвенции {self.path}: {e}")
     
-    @cached_property
+    @property
     def first_frame_path(self):
         """
         Определяем путь к первому кадру секвенции.
         """
+        if self.frame_sequence is not None:
+            return os.path.join(self.path, self.frame_sequence.names[0])
         return os.path.join(self.path, self.frames_list[0])
     
     @property
@@ -807,6 +1074,8 @@ class SequenceFrames:
         """
         Определяем путь к последнему кадру секвенции.
         """
+        if self.frame_sequence is not None:
+            return os.path.join(self.path, self.frame_sequence.names[-1])
         return os.path.join(self.path, self.frames_list[-1])
     
     @property
@@ -814,6 +1083,8 @@ class SequenceFrames:
         """
         Извлекаем номер кадра из имени первого кадра секвенции.
         """
+        if self.frame_sequence is not None:
+            return self.frame_sequence.first_str
         match = re.search(self.frame_mask, self.first_frame_path)
         if not match:
             raise ValueError(f"Невозможно извлечь номер кадра из кадра {self.first_frame_path}.")
@@ -824,6 +1095,8 @@ class SequenceFrames:
         """
         Извлекаем номер кадра из имени последнего кадра секвенции.
         """
+        if self.frame_sequence is not None:
+            return self.frame_sequence.last_str
         match = re.search(self.frame_mask, self.last_frame_path)
         if not match:
             raise ValueError(f"Невозможно извлечь номер кадра из кадра {self.last_frame_number}.")
@@ -855,25 +1128,22 @@ class SequenceFrames:
         Настроен на композы из Nuke.
         """
         try:
-            frame = OpenEXR.InputFile(self.first_frame_path)
-            header = frame.header()
-            timecode = header.get('timeCode', None) 
+            timecode_str = self.exr_header["timeCode"]
             start_timecode = None
 
-            if timecode:
+            if timecode_str:
 
                 # Таймкод хранится в формате объекта. Преобразуем в строку и извлекаем время.
-                timecode_str = str(timecode)
                 time_match = timecode_str.split("time: ")[1].split(",")[0].strip()  # Извлекаем значение времени
 
                 start_timecode = self.format_timecode(time_match)  # Приводим к двухзначному формату
                  
             if start_timecode is None:
-                start_timecode = tc(project_fps, "00:00:00:00").frames - 1  # компенсация некорректной конвертации таймкода во фреймы
+                start_timecode = timecode_to_frames(project_fps, "00:00:00:00") - 1  # компенсация некорректной конвертации таймкода во фреймы
                 end_timecode = start_timecode + (len(self.frames_list))
                 duration = (end_timecode - start_timecode)
             else:
-                start_timecode = tc(project_fps, start_timecode).frames - 1  # компенсация некорректной конвертации таймкода во фреймы
+                start_timecode = timecode_to_frames(project_fps, start_timecode) - 1  # компенсация некорректной конвертации таймкода во фреймы
                 end_timecode = start_timecode + (len(self.frames_list))
                 duration = (end_timecode - start_timecode)
                           
@@ -1053,11 +1323,13 @@ class ConformCheckerMixin:
 
         try:
             parser = detect_edl_parser(fps, lines=united_edls)
+            edl_shot_names = [edl_event.shot_name.lower() for edl_event in parser.iter_events()]
             for shot_name in shots_list:
                 
-                for edl_line in parser:
-                    if edl_line.edl_shot_name.lower() in shot_name.lower():
+                for edl_shot_name in edl_shot_names:
+                    if edl_shot_name in shot_name.lower():
                         triger_flag = True
+                        break
                 
                 if not triger_flag:
                     self.warning_signal.emit(f"🔴  Шот {shot_name} отсутствует в монтаже")
@@ -1080,11 +1352,20 @@ class EXRCheckerMixin:
     def _read_stdout(self, output_path: str):
         """
         Читка потока вывода дочернего процесса.
+        Проверщик пишет события JSON Lines: прогресс показывается на кнопке проверки,
+        найденные ошибки добавляются в лог по мере обнаружения.
         """
         if not self.sequence_check_proc:
             return
 
         try:
+            for line in self.sequence_check_proc.stdout:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                self._on_check_event(event)
+
             self.sequence_check_proc.wait()
 
             if self.fatal_error:
@@ -1107,8 +1388,31 @@ class EXRCheckerMixin:
 
         finally:
             self.sequence_check_proc = None
+            self.seq_check_progress_signal.emit("")
             self.check_sequence.setEnabled(True)
 
+    def _on_check_event(self, event: dict):
+        """
+        Обработка события прогресса проверщика секвенций.
+        """
+        if event.get("event") == "finding" and not event.get("cached"):
+            self._append_log(f'🔴  {event["message"]}')
+
+        elif event.get("event") == "progress":
+            frames_total = event.get("frames_total") or 1
+            percent = int(event.get("frames_done", 0) * 100 / frames_total)
+            text = f'Checking {percent}%  {event.get("fps", 0):.0f} fps  {event.get("mb_per_sec", 0):.0f} MB/s'
+            if event.get("eta") is not None:
+                minutes, seconds = divmod(int(event["eta"]), 60)
+                text += f'  ETA {minutes:02d}:{seconds:02d}'
+            self.seq_check_progress_signal.emit(text)
+
+        elif event.get("event") == "done" and event.get("report_json"):
+            url = Path(event["report_json"]).resolve().as_uri()
+            self._append_log(
+                f'Проверено кадров: {event.get("frames", 0)}, декодировано: {event.get("frames_decoded", 0)} '
+                f'за {event.get("seconds", 0):.0f} с. Отчет: <a href="{url}">{url}</a>')
+
     def _read_stderr(self):
         """
         Читка потока ошибок дочернего процесса.
@@ -1228,6 +1532,7 @@ class ConfigValidator:
 class Autoconform(QWidget, ConformCheckerMixin, EXRCheckerMixin):
     warning_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
+    seq_check_progress_signal = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
@@ -1237,6 +1542,7 @@ class Autoconform(QWidget, ConformCheckerMixin, EXRCheckerMixin):
 
         self.warning_signal.connect(self.append_warning_field)
         self.error_signal.connect(self.on_error_signal)
+        self.seq_check_progress_signal.connect(self.update_check_progress)
 
         self.sequence_check_proc: subprocess.Popen | None = None
         self.seq_check_stdout_thread = None
@@ -1494,14 +1800,22 @@ class Autoconform(QWidget, ConformCheckerMixin, EXRCheckerMixin):
             return
 
         output_path = self.get_output_path()
+        cache_path = output_path.parent.parent / SEQCHECKER_CACHE
         checker_module_path = self.get_module_path()
 
         try:
             self.sequence_check_proc = subprocess.Popen(
-                [sys.executable, str(checker_module_path), sequences_path, str(output_path), self.format_menu.currentText().lower()],
+                [sys.executable, str(checker_module_path), sequences_path, str(output_path), self.format_menu.currentText().lower(),
+                 "--workers", str(SEQCHECKER_SETTINGS.get("workers", 0)),
+                 "--executor", SEQCHECKER_SETTINGS.get("executor", "process"),
+                 "--cache", str(cache_path)],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
+                encoding="utf-8",
+                errors="replace",
+                # Дочерний процесс пишет stdout/stderr в UTF-8 независимо от кодировки консоли Windows
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"},
                 bufsize=1
             )
 
@@ -1675,6 +1989,12 @@ class Autoconform(QWidget, ConformCheckerMixin, EXRCheckerMixin):
         """
         self.warning_field.append(message)
 
+    def update_check_progress(self, text):
+        """
+        Показывает прогресс проверки секвенций на кнопке проверки.
+        """
+        self.check_sequence.setText(text or "Shots Errors Check")
+
     def on_error_signal(self, message):
         QMessageBox.critical(self, "Error", message)
         logger.exception(message)
@@ -0,0 +1,178 @@
+import numpy as np
+from common_tools.timecode_utils import timecode_to_frames, get_codec
+
+def get_frame_range(fps, shot_data: dict) -> tuple[int, int]:
+    """
+    Диапазон исходника шота (src_in, src_out_full) в кадрах.
+    """
+    return (timecode_to_frames(fps, shot_data["src_in"]),
+            timecode_to_frames(fps, shot_data["src_out_full"]))
+
+def classify_range_change(base_range: tuple[int, int], target_range: tuple[int, int]) -> tuple[str, int, int] | None:
+    """
+    Сравнивает диапазоны исходника шота в двух монтажах.
+
+    :return: None, если диапазоны не пересекаются, иначе кортеж (категория, start, end),
+    где категория - 'No changes', 'Less' или 'More', start - на сколько кадров раньше начинается шот
+    в новом монтаже, end - на сколько кадров позже он заканчивается.
+    """
+    base_in, base_out = base_range
+    targ_in, targ_out = target_range
+
+    if max(base_in, targ_in) > min(base_out, targ_out):
+        return None
+
+    start_diff = targ_in - base_in   # Сдвиг начала
+    end_diff = targ_out - base_out   # Сдвиг конца
+
+    if start_diff == 0 and end_diff == 0:
+        return "No changes", 0, 0
+    if (start_diff >= 0 and end_diff <= 0):
+        return "Less", -start_diff, end_diff
+    return "More", -start_diff, end_diff
+
+def compare_edits(fps, base_edit: dict, target_edit: dict) -> tuple[dict, dict]:
+    """
+    Сравнивает два монтажа за один проход по каждому из них.
+    Шоты сопоставляются через словарь по имени шота.
+
+    :param base_edit: Шоты старого монтажа {shot_name: shot_data} в формате EditDatabase.
+    :param target_edit: Шоты нового монтажа в том же формате.
+    :return: Кортеж (reedit_data, reedit_data_edl).
+    reedit_data - категории для отчета: 'No changes' - имена шотов,
+    'More'/'Less' - кортежи (shot_name, start, end), 'Leave'/'New' - имена шотов.
+    reedit_data_edl - данные шотов для EDL по категориям 'More', 'Less',
+    'Phase changed', 'Take changed' и 'New'.
+    """
+    reedit_data = {}
+    reedit_data_edl = {}
+    leave = []
+
+    target_by_name = {shot_data["shot_name"]: shot_data for shot_data in target_edit.values()}
+
+    for base_shot, base_shot_data in base_edit.items():
+        if base_shot not in target_edit:
+            leave.append(base_shot)
+
+        shot_name = base_shot_data["shot_name"]
+        target_shot_data = target_by_name.get(shot_name)
+        if target_shot_data is None:
+            continue
+
+        # Проверяем на предмет смены дубля
+        if base_shot_data["src_name"] != target_shot_data["src_name"]:
+            reedit_data_edl.setdefault("Take changed", []).append(base_shot_data)
+            continue
+
+        # Проверяем на предмет пересечения диапазонов
+        change = classify_range_change(get_frame_range(fps, base_shot_data), get_frame_range(fps, target_shot_data))
+        if change is None:
+            reedit_data_edl.setdefault("Phase changed", []).append(base_shot_data)
+            continue
+
+        category, start, end = change
+        if category == "No changes":
+            reedit_data.setdefault(category, []).append(shot_name)
+        else:
+            reedit_data.setdefault(category, []).append((shot_name, start, end))
+            reedit_data_edl.setdefault(category, []).append(target_shot_data)
+
+    if leave:
+        reedit_data["Leave"] = leave
+
+    for target_shot, target_shot_data in target_edit.items():
+        if target_shot not in base_edit:
+            reedit_data.setdefault("New", []).append(target_shot)
+            reedit_data_edl.setdefault("New", []).append(target_shot_data)
+
+    return reedit_data, reedit_data_edl
+
+class EditHistory:
+    """
+    История монтажей проекта в виде матриц шот × монтаж.
+
+    Для каждого шота и монтажа хранится диапазон исходника в кадрах и номер дубля (src_name).
+    Изменения между соседними монтажами цепочки и запас кадров (handles),
+    нужный шоту по всем версиям, считаются векторно за один проход.
+    """
+    def __init__(self, fps, edit_names: list[str], shots: dict):
+        """
+        :param edit_names: Монтажи в хронологическом порядке.
+        :param shots: Данные шотов {shot_name: {edit_name: shot_data}} в формате EditDatabase.
+        """
+        self.fps = fps
+        self.edit_names = list(edit_names)
+        self.shot_names = list(shots)
+
+        shape = (len(self.shot_names), len(self.edit_names))
+        self.src_in = np.zeros(shape, dtype=np.int64)
+        self.src_out = np.zeros(shape, dtype=np.int64)
+        self.takes = np.full(shape, -1, dtype=np.int64)
+
+        codec = get_codec(fps)
+        edit_index = {edit_name: j for j, edit_name in enumerate(self.edit_names)}
+        take_ids = {}
+        for i, edits in enumerate(shots.values()):
+            for edit_name, shot_data in edits.items():
+                j = edit_index.get(edit_name)
+                if j is None:
+                    continue
+                self.src_in[i, j] = codec.to_frames(shot_data["src_in"])
+                self.src_out[i, j] = codec.to_frames(shot_data["src_out_full"])
+                self.takes[i, j] = take_ids.setdefault(shot_data["src_name"], len(take_ids))
+
+        self.present = self.takes >= 0
+
+    def changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Изменения каждого шота относительно предыдущего монтажа цепочки.
+
+        :return: Кортеж (categories, start, end) матриц шот × монтаж.
+        categories - 'No changes', 'More', 'Less', 'New', 'Leave', 'Take changed',
+        'Phase changed' или '' (шота нет ни в одном из двух монтажей и для первого монтажа).
+        start/end - на сколько кадров раньше начинается и позже заканчивается шот (для More/Less).
+        """
+        categories = np.full(self.present.shape, "", dtype=object)
+        start = np.zeros(self.present.shape, dtype=np.int64)
+        end = np.zeros(self.present.shape, dtype=np.int64)
+        if len(self.edit_names) < 2:
+            return categories, start, end
+
+        prev_present, curr_present = self.present[:, :-1], self.present[:, 1:]
+        both = prev_present & curr_present
+        same_take = both & (self.takes[:, :-1] == self.takes[:, 1:])
+        overlap = same_take & (np.maximum(self.src_in[:, :-1], self.src_in[:, 1:])
+                               <= np.minimum(self.src_out[:, :-1], self.src_out[:, 1:]))
+
+        start_diff = self.src_in[:, 1:] - self.src_in[:, :-1]
+        end_diff = self.src_out[:, 1:] - self.src_out[:, :-1]
+        no_changes = overlap & (start_diff == 0) & (end_diff == 0)
+        less = overlap & ~no_changes & (start_diff >= 0) & (end_diff <= 0)
+
+        categories[:, 1:] = np.select(
+            [~prev_present & curr_present, prev_present & ~curr_present, both & ~same_take,
+             same_take & ~overlap, no_changes, less, overlap],
+            ["New", "Leave", "Take changed", "Phase changed", "No changes", "Less", "More"],
+            default="")
+        start[:, 1:] = np.where(overlap, -start_diff, 0)
+        end[:, 1:] = np.where(overlap, end_diff, 0)
+        return categories, start, end
+
+    def handles(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Запас кадров, нужный каждому шоту относительно его первой версии в цепочке:
+        на сколько кадров раньше начала (head) и позже конца (tail) шот выходил в версиях
+        с тем же дублем.
+        """
+        rows = np.arange(len(self.shot_names))
+        first = np.argmax(self.present, axis=1)
+        same_take = self.present & (self.takes == self.takes[rows, first][:, None])
+
+        info = np.iinfo(np.int64)
+        min_in = np.where(same_take, self.src_in, info.max).min(axis=1, initial=info.max)
+        max_out = np.where(same_take, self.src_out, info.min).max(axis=1, initial=info.min)
+
+        has_data = self.present.any(axis=1)
+        head = np.where(has_data, self.src_in[rows, first] - min_in, 0)
+        tail = np.where(has_data, max_out - self.src_out[rows, first], 0)
+        return head, tail
@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import dataclasses
+from pathlib import Path
+from collections import OrderedDict
+from config.global_config import GLOBAL_CONFIG
+
+CACHE_SETTINGS = GLOBAL_CONFIG["scripts_settings"]["edl_cache"]
+
+def get_local_cache_dir() -> str:
+    """
+    Локальная папка кеша текущего пользователя.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "autoconform", "edl_cache")
+
+class EDLParseCache:
+    """
+    Кеш распарсенных EDL.
+
+    Хранит в памяти (LRU) определенный тип EDL файла и готовые записи парсера.
+    Ключ файла - (путь, размер, mtime), записи дополнительно разделены по (FPS, тип парсера).
+    Ключ берется вызывающим кодом до чтения файла (file_key), поэтому данные,
+    прочитанные из файла, никогда не сохраняются под ключом более новой версии файла.
+
+    Опционально дублирует записи в JSON файлы в локальной папке sidecar_dir.
+    JSON хранит только значения полей записей, поэтому чтение файла кеша не выполняет код.
+    Файлы старше max_age_days и сверх max_files (самые давно использованные) удаляются при записи.
+    Чтение и запись файлов выполняются вне блокировки кеша.
+    """
+    def __init__(self, max_items: int=64, sidecar_dir: str=None, max_files: int=500, max_age_days: float=30):
+        self.max_items = max_items
+        self.sidecar_dir = sidecar_dir
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(edl_path: str) -> tuple:
+        """
+        Ключ файла. Изменение размера или времени модификации делает старые данные невалидными.
+        """
+        stat = os.stat(edl_path)
+        return (os.path.abspath(edl_path), stat.st_size, stat.st_mtime_ns)
+
+    def _sidecar_path(self, path: str) -> Path:
+        """
+        Путь к JSON файлу кеша для указанного EDL.
+        """
+        name = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return Path(self.sidecar_dir) / f"{name}.json"
+
+    def _load_sidecar(self, key: tuple) -> dict | None:
+        """
+        Загружает данные из JSON файла, если они соответствуют текущему ключу.
+        Записи парсера возвращаются строками значений полей (rows) и собираются в get_entries.
+        """
+        if not self.sidecar_dir:
+            return None
+        sidecar_path = self._sidecar_path(key[0])
+        try:
+            with open(sidecar_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if tuple(data["key"]) != key:
+                return None
+            record = {
+                "variant": tuple(data["variant"]) if data["variant"] is not None else None,
+                "entries": {},
+                "rows": {(item["fps"], tuple(item["variant"])): item["rows"] for item in data["entries"]},
+            }
+            # Время изменения файла - время последнего использования для вытеснения
+            os.utime(sidecar_path)
+            return record
+        except Exception:
+            return None
+
+    def _dump_record(self, key: tuple, record: dict) -> str | None:
+        """
+        Сериализует запись кеша в JSON. Вызывается под блокировкой, пока запись не изменяется другими потоками.
+        """
+        if not self.sidecar_dir:
+            return None
+        entries = [{"fps": fps, "variant": list(variant), "rows": [dataclasses.astuple(entry) for entry in items]}
+                   for (fps, variant), items in record["entries"].items()]
+        entries.extend({"fps": fps, "variant": list(variant), "rows": rows}
+                       for (fps, variant), rows in record["rows"].items() if (fps, variant) not in record["entries"])
+        try:
+            return json.dumps({"key": list(key), "variant": record["variant"], "entries": entries},
+                              ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+
+    def _save_sidecar(self, key: tuple, data: str | None) -> None:
+        """
+        Атомарно сохраняет данные, сериализованные _dump_record, в JSON файл.
+        """
+        if data is None:
+            return
+        try:
+            sidecar_path = self._sidecar_path(key[0])
+            sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, sidecar_path)
+            self._prune()
+        except Exception:
+            pass
+
+    def _prune(self) -> None:
+        """
+        Удаляет файлы кеша старше max_age_days и самые давно использованные сверх max_files.
+        """
+        files = []
+        with os.scandir(self.sidecar_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith((".json", ".tmp")) and entry.is_file():
+                    files.append((entry.stat().st_mtime, entry.path))
+        files.sort(reverse=True)
+        expired = time.time() - self.max_age_days * 86400
+        for i, (mtime, path) in enumerate(files):
+            if i >= self.max_files or mtime < expired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _record(self, key: tuple, create: bool=False) -> dict | None:
+        """
+        Возвращает запись кеша по ключу файла с обновлением LRU порядка.
+        Запись из файла кеша загружается вне блокировки.
+        """
+        with self._lock:
+            record = self._items.get(key)
+            if record is not None:
+                self._items.move_to_end(key)
+                return record
+
+        loaded = self._load_sidecar(key)
+
+        with self._lock:
+            # Запись могла появиться в другом потоке, пока читался файл
+            record = self._items.get(key) or loaded
+            if record is None:
+                if not create:
+                    return None
+                record = {"variant": None, "entries": {}, "rows": {}}
+            self._items[key] = record
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+            return record
+
+    def get_variant(self, key: tuple):
+        """
+        Возвращает ранее определенный тип EDL файла или None.
+
+        :param key: Ключ файла из file_key.
+        """
+        record = self._record(key)
+        return record["variant"] if record else None
+
+    def put_variant(self, key: tuple, variant) -> None:
+        """
+        Сохраняет определенный тип EDL файла в памяти.
+        На диск тип записывается вместе с записями парсера в put_entries.
+        """
+        record = self._record(key, create=True)
+        with self._lock:
+            record["variant"] = variant
+
+    def get_entries(self, key: tuple, fps, variant, entry_type=None) -> list | None:
+        """
+        Возвращает записи парсера для (FPS, тип парсера) или None.
+        Записи общие для всех вызовов и не должны изменяться.
+
+        :param entry_type: Класс записи (dataclass) для сборки записей, загруженных из файла кеша.
+        """
+        record = self._record(key)
+        if record is None:
+            return None
+        item_key = (str(fps), variant)
+        with self._lock:
+            entries = record["entries"].get(item_key)
+            if entries is None and entry_type is not None and item_key in record["rows"]:
+                try:
+                    entries = [entry_type(*row) for row in record["rows"].pop(item_key)]
+                except TypeError:
+                    # Формат записей изменился - файл кеша не подходит
+                    return None
+                record["entries"][item_key] = entries
+            return entries
+
+    def put_entries(self, key: tuple, fps, variant, entries: list) -> None:
+        """
+        Сохраняет записи парсера для (FPS, тип парсера).
+        """
+        record = self._record(key, create=True)
+        with self._lock:
+            record["entries"][(str(fps), variant)] = entries
+            data = self._dump_record(key, record)
+        self._save_sidecar(key, data)
+
+    def clear(self) -> None:
+        """
+        Очищает кеш в памяти.
+        """
+        with self._lock:
+            self._items.clear()
+
+# Кеш на диске включается в конфиге и хранится в локальной папке пользователя
+EDL_CACHE = EDLParseCache(
+    sidecar_dir=get_local_cache_dir() if CACHE_SETTINGS.get("sidecar") else None,
+    max_files=CACHE_SETTINGS.get("max_files", 500),
+    max_age_days=CACHE_SETTINGS.get("max_age_days", 30))
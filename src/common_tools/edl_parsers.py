@@ -1,11 +1,102 @@
 import re
+import itertools
 from pathlib import Path
 from dataclasses import dataclass
-from timecode import Timecode as tc
+from common_tools.timecode_utils import get_codec
+from common_tools.edl_cache import EDL_CACHE
+
+EVENT_LINE_RE = re.compile(r'^\d+\s')
+LOC_LINE_RE = re.compile(r'^\*LOC', re.IGNORECASE)
+FROM_CLIP_NAME_RE = re.compile(r'^\*\s*FROM CLIP NAME:', re.IGNORECASE)
 
 class EDLParserError(Exception):
     pass
 
+class EDLEvent:
+    """
+    Компактная запись события EDL без парсинга таймкодов.
+
+    parts - поля основной строки события, retime - наличие маркера "M2" в блоке,
+    shot_name - имя шота из блока события.
+    """
+    __slots__ = ("parts", "retime", "shot_name")
+
+    def __init__(self, parts: list[str], retime: bool, shot_name: str | None):
+        self.parts = parts
+        self.retime = retime
+        self.shot_name = shot_name
+
+def tokenize_edl(lines, match_shot_name=None):
+    """
+    Однопроходный токенизатор EDL. Читает строки потоком и отдает события по мере закрытия блока.
+
+    :param lines: Итерируемый объект со строками EDL (файловый объект или список).
+    :param match_shot_name: Функция извлечения имени шота из строки блока.
+    Если не передана, именем шота считается имя источника из основной строки.
+    """
+    parts = None
+    retime = False
+    shot_name = None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+
+        if EVENT_LINE_RE.match(line):  # основная строка
+            if parts is not None:
+                yield EDLEvent(parts, retime, shot_name)
+
+            parts = line.split()
+            retime = False
+            shot_name = None
+            if len(parts) < 8:
+                parts = None
+            elif match_shot_name is None:
+                shot_name = parts[1]
+            continue
+
+        if parts is None:
+            continue
+
+        if line.startswith("M2"):
+            retime = True
+
+        if match_shot_name is not None and line.startswith("*"):
+            name = match_shot_name(line)
+            if name:
+                shot_name = name
+
+    if parts is not None:
+        yield EDLEvent(parts, retime, shot_name)
+
+def iter_cached(parser):
+    """
+    Итерация парсера через кеш EDL_CACHE.
+    Повторные проходы по тому же неизмененному файлу берут готовые записи из кеша.
+    """
+    if not parser.use_cache or parser.edl_path is None:
+        yield from parser.parse()
+        return
+
+    try:
+        key = EDL_CACHE.file_key(parser.edl_path)
+    except OSError:
+        # Ошибку чтения файла отдаст сам парсер
+        yield from parser.parse()
+        return
+
+    entries = EDL_CACHE.get_entries(key, parser.fps, parser.cache_variant, parser.EDLEntry)
+    if entries is not None:
+        yield from entries
+        return
+
+    entries = []
+    for entry in parser.parse():
+        entries.append(entry)
+        yield entry
+    # Файл изменился во время чтения - записи не соответствуют ни одному ключу
+    if EDL_CACHE.file_key(parser.edl_path) == key:
+        EDL_CACHE.put_entries(key, parser.fps, parser.cache_variant, entries)
+
 class EDLParser_v23:
     """
     Класс-итератор. Итерируется по EDL файлу формата без *loc, *from clip name, * from clip name.
@@ -28,91 +119,97 @@ class EDLParser_v23:
         retime: bool
         edl_edit_name: str
 
-    def __init__(self, fps: int, edl_path: str=None, lines:list[str]=None):
+    cache_variant = ("EDLParser_v23",)
+
+    def __init__(self, fps: int, edl_path: str=None, lines:list[str]=None, use_cache: bool=True):
         self.edl_path = edl_path
         self._lines = lines
         self.fps = fps
+        self.codec = get_codec(fps)
+        self.use_cache = use_cache
 
     def convert(self, source_in: str, record_in: str, record_out: str) -> str:
         """
         Высчитывает на основе входящих таймкодов end source timecode для шотов с ретаймом.
         """
-        record_duration = tc(self.fps, record_out).frames - tc(self.fps, record_in).frames 
-        end_source_tc_frames = (tc(self.fps, source_in).frames) + record_duration
-        end_source_tc_timecode = tc(self.fps, frames=end_source_tc_frames)
+        to_frames = self.codec.to_frames
+        record_duration = to_frames(record_out) - to_frames(record_in)
+        end_source_tc_frames = to_frames(source_in) + record_duration
 
-        return str(end_source_tc_timecode)
+        return self.codec.to_timecode(end_source_tc_frames)
     
     def is_retime(self, data: list) -> bool:
         """
         Метод определения ретайма.
         На случай, если в EDL нет маркера ретайма "M2".
         """
-        edl_source_in=tc(self.fps, data[4]).frames
-        edl_source_out=tc(self.fps, data[5]).frames
-        edl_record_in=tc(self.fps, data[6]).frames
-        edl_record_out=tc(self.fps, data[7]).frames
+        to_frames = self.codec.to_frames
+        edl_source_in = to_frames(data[4])
+        edl_source_out = to_frames(data[5])
+        edl_record_in = to_frames(data[6])
+        edl_record_out = to_frames(data[7])
 
         if edl_record_out - edl_record_in != edl_source_out - edl_source_in:
             return True
 
-    def __iter__(self):
-        try:
-                
-            if self._lines is not None:
-                lines = self._lines
-            else:    
-                with open(self.edl_path, 'r') as edl_file:
-                    lines = edl_file.readlines()
-            if self.edl_path:
-                edit_name = str(Path(self.edl_path).stem)
-            if lines and "TITLE" in lines[0]:
-                edit_name = lines[0].strip().split(":", 1)[1].strip() # Отрезаем слово 'TITLE'
-
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-
-                if re.match(r'^\d+\s', line):
-                    parts = line.split()
-                    if len(parts) < 8:
-                        i += 1
-                        continue
+    def _read_lines(self):
+        """
+        Потоковое чтение строк EDL без загрузки файла целиком.
+        """
+        if self._lines is not None:
+            yield from self._lines
+        else:
+            with open(self.edl_path, 'r') as edl_file:
+                yield from edl_file
 
-                    retime_val = False
-                    j = i + 1
+    def iter_events(self):
+        """
+        Итерируется по сырым событиям EDL без парсинга таймкодов.
+        """
+        return tokenize_edl(self._read_lines())
 
-                    while j < len(lines):
-                        next_line = lines[j].strip()
-                        if re.match(r'^\d+\s', next_line): 
-                            break
-                        if next_line.startswith("M2"):
-                            retime_val = True
-                        j += 1
+    def __iter__(self):
+        return iter_cached(self)
 
-                    source_out_full = parts[5]
+    def parse(self):
+        """
+        Парсинг EDL без использования кеша.
+        """
+        try:
+            lines = self._read_lines()
+            first_line = next(lines, None)
 
-                    if retime_val or self.is_retime(parts):
-                        parts[5] = self.convert(parts[4], parts[6], parts[7])
-                        retime_val = True
-
-                    yield self.EDLEntry(
-                        edl_record_id=parts[0],
-                        edl_shot_name=parts[1],
-                        edl_source_name = parts[1],
-                        edl_track_type=parts[2],
-                        edl_transition=parts[3],
-                        edl_source_in=parts[4],
-                        edl_source_out=parts[5], # Изменена для ретаймов из AVID
-                        edl_source_out_src = source_out_full, # Исходная, не измененная строка
-                        edl_record_in=parts[6],
-                        edl_record_out=parts[7],
-                        retime=retime_val,
-                        edl_edit_name=edit_name,
-                    )
-                    i = j
-                else:
-                    i += 1
+            if self.edl_path:
+                edit_name = str(Path(self.edl_path).stem)
+            if first_line and "TITLE" in first_line:
+                edit_name = first_line.strip().split(":", 1)[1].strip() # Отрезаем слово 'TITLE'
+
+            if first_line is not None:
+                lines = itertools.chain((first_line,), lines)
+
+            for event in tokenize_edl(lines):
+                parts = event.parts
+                retime_val = event.retime
+                source_out_full = parts[5]
+
+                if retime_val or self.is_retime(parts):
+                    parts[5] = self.convert(parts[4], parts[6], parts[7])
+                    retime_val = True
+
+                yield self.EDLEntry(
+                    edl_record_id=parts[0],
+                    edl_shot_name=parts[1],
+                    edl_source_name = parts[1],
+                    edl_track_type=parts[2],
+                    edl_transition=parts[3],
+                    edl_source_in=parts[4],
+                    edl_source_out=parts[5], # Изменена для ретаймов из AVID
+                    edl_source_out_src = source_out_full, # Исходная, не измененная строка
+                    edl_record_in=parts[6],
+                    edl_record_out=parts[7],
+                    retime=retime_val,
+                    edl_edit_name=edit_name,
+                )
         except Exception as e:
             raise EDLParserError(f"Ошибка парсера EDL: {e}")
         
@@ -135,27 +232,33 @@ class EDLParser:
         retime: bool
         edl_edit_name: str | None
 
-    def __init__(self, fps: int, edl_path:str=None, lines:list[str]=None, convert_src_out:bool=True):
+    def __init__(self, fps: int, edl_path:str=None, lines:list[str]=None, convert_src_out:bool=True,
+                 use_cache: bool=True):
         self.edl_path = edl_path
         self._lines = lines
         self.fps = fps
+        self.codec = get_codec(fps)
         self.convert_src_out = convert_src_out
+        self.use_cache = use_cache
+        self.cache_variant = ("EDLParser", convert_src_out)
 
     def is_retime(self, data: list) -> bool:
         """
         Определение ретайма по разнице длительностей
         """
-        edl_source_in = tc(self.fps, data[4]).frames
-        edl_source_out = tc(self.fps, data[5]).frames
-        edl_record_in = tc(self.fps, data[6]).frames
-        edl_record_out = tc(self.fps, data[7]).frames
+        to_frames = self.codec.to_frames
+        edl_source_in = to_frames(data[4])
+        edl_source_out = to_frames(data[5])
+        edl_record_in = to_frames(data[6])
+        edl_record_out = to_frames(data[7])
         return (edl_record_out - edl_record_in) != (edl_source_out - edl_source_in)
 
     def convert(self, source_in: str, record_in: str, record_out: str) -> str:
         """Пересчёт source_out для ретайма"""
-        record_duration = tc(self.fps, record_out).frames - tc(self.fps, record_in).frames
-        end_source_tc_frames = tc(self.fps, source_in).frames + record_duration
-        return str(tc(self.fps, frames=end_source_tc_frames))
+        to_frames = self.codec.to_frames
+        record_duration = to_frames(record_out) - to_frames(record_in)
+        end_source_tc_frames = to_frames(source_in) + record_duration
+        return self.codec.to_timecode(end_source_tc_frames)
 
     def _match_shot_name(self, line: str) -> str | None:
         """
@@ -164,114 +267,121 @@ class EDLParser:
         line = line.strip()
 
         # *LOC или *LOC: → берём последнее слово
-        if re.match(r'^\*LOC', line, re.IGNORECASE):
+        if LOC_LINE_RE.match(line):
             parts = line.split()
             return parts[-1] if parts else None
 
         # *FROM CLIP NAME → берём последнее слово
-        if re.match(r'^\*\s*FROM CLIP NAME:', line, re.IGNORECASE):
+        if FROM_CLIP_NAME_RE.match(line):
             parts = line.split()
             return parts[-1] if parts else None
 
         return None
 
+    def _read_lines(self):
+        """
+        Потоковое чтение строк EDL без загрузки файла целиком.
+        """
+        if self._lines is not None:
+            yield from self._lines
+        else:
+            with open(self.edl_path, 'r', encoding="utf-8") as edl_file:
+                yield from edl_file
+
+    def iter_events(self):
+        """
+        Итерируется по сырым событиям EDL без парсинга таймкодов.
+        События без имени шота пропускаются.
+        """
+        for event in tokenize_edl(self._read_lines(), self._match_shot_name):
+            if event.shot_name:
+                yield event
+
     def __iter__(self):
+        return iter_cached(self)
+
+    def parse(self):
+        """
+        Парсинг EDL без использования кеша.
+        """
         try:
             
-            if self._lines is not None:
+            if self.edl_path is None:
                 lines = self._lines
                 if lines and "TITLE" in lines[0]:
                     edit_name = lines[0].strip().split(":", 1)[1].strip()
             else:
-                with open(self.edl_path, 'r', encoding="utf-8") as edl_file:
-                    lines = edl_file.readlines()
                 edit_name = Path(self.edl_path).stem
 
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-
-                if re.match(r'^\d+\s', line):  # основная строка
-                    parts = line.split()
-                    if len(parts) < 8:
-                        i += 1
-                        continue
-
-                    shot_name = None
-                    retime_val = False
-                    j = i + 1
-
-                    # проход по блоку
-                    while j < len(lines):
-                        next_line = lines[j].strip()
-                        if re.match(r'^\d+\s', next_line):
-                            break
-
-                        if next_line.startswith("M2"):
-                            retime_val = True
-
-                        name = self._match_shot_name(next_line)
-                        if name:
-                            shot_name = name
-
-                        j += 1
-
-                    source_out_full = parts[5]
-
-                    # если ретайм → всегда пересчитываем source_out
-                    if retime_val or self.is_retime(parts):
-                        if self.convert_src_out:
-                            parts[5] = self.convert(parts[4], parts[6], parts[7])
-                            retime_val = True
-                        else:
-                            retime_val = True
-
-                    if not shot_name:
-                        i = j
-                        continue
-
-                    yield self.EDLEntry(
-                        edl_record_id=parts[0],
-                        edl_source_name=parts[1] if len(parts) > 1 else None,
-                        edl_shot_name=shot_name,
-                        edl_track_type=parts[2],
-                        edl_transition=parts[3],
-                        edl_source_in=parts[4],
-                        edl_source_out=parts[5],
-                        edl_source_out_src = source_out_full, # Исходная, не измененная строка
-                        edl_record_in=parts[6],
-                        edl_record_out=parts[7],
-                        retime=retime_val,
-                        edl_edit_name=edit_name,
-                    )
-
-                    i = j
-                else:
-                    i += 1
+            for event in self.iter_events():
+                parts = event.parts
+                retime_val = event.retime
+                source_out_full = parts[5]
+
+                # если ретайм → всегда пересчитываем source_out
+                if retime_val or self.is_retime(parts):
+                    if self.convert_src_out:
+                        parts[5] = self.convert(parts[4], parts[6], parts[7])
+                    retime_val = True
+
+                yield self.EDLEntry(
+                    edl_record_id=parts[0],
+                    edl_source_name=parts[1] if len(parts) > 1 else None,
+                    edl_shot_name=event.shot_name,
+                    edl_track_type=parts[2],
+                    edl_transition=parts[3],
+                    edl_source_in=parts[4],
+                    edl_source_out=parts[5],
+                    edl_source_out_src = source_out_full, # Исходная, не измененная строка
+                    edl_record_in=parts[6],
+                    edl_record_out=parts[7],
+                    retime=retime_val,
+                    edl_edit_name=edit_name,
+                )
 
         except Exception as e:
             raise EDLParserError(f"Ошибка парсера EDL: {e}")
 
+def sniff_edl_variant(lines) -> tuple:
+    """
+    Определяем тип EDL по строкам файла. Строки читаются до первого маркера типа.
+    """
+    for string in lines:
+        if any(x in string.lower() for x in ("* from clip name",)):
+            return ("EDLParser", False)
+        if any(x in string.lower() for x in ("*loc", "*from clip name")):
+            return ("EDLParser", True)
+    return EDLParser_v23.cache_variant
+
 def detect_edl_parser(fps: int, edl_path:str=None, lines:list[str]=None):
     """
     Определяем тип EDL файла по содержимому файла.
+    Для файлов тип берется из EDL_CACHE. Если его там нет, файл читается потоком до первого маркера типа
+    (EDL без маркеров - до конца), а записи парсер читает сам при первой итерации.
+    Тип определяется одинаково для файла и для списка строк.
 
     :param lines: Список со строками из EDL.
     :return: Класс EDL парсера
     """
     if lines is not None:
-        for string in lines:
-            if any(x in string.lower() for x in ("* from clip name",)):
-                return EDLParser(fps, lines=lines, convert_src_out=False)
-            if any(x in string.lower() for x in ("*loc", "*from clip name")):
-                return EDLParser(fps, lines=lines, convert_src_out=True)
-        return EDLParser_v23(fps, lines=lines)
+        variant = sniff_edl_variant(lines)
+        if variant == EDLParser_v23.cache_variant:
+            return EDLParser_v23(fps, lines=lines)
+        return EDLParser(fps, lines=lines, convert_src_out=variant[1])
         
     elif edl_path is not None:
-        with open(edl_path, "r", encoding="utf-8") as f:
-            for string in f:
-                if any(x in string.lower() for x in ("* from clip name",)):
-                    return EDLParser(fps, edl_path=edl_path, convert_src_out=False)
-                if any(x in string.lower() for x in ("*loc", "*from clip name")):
-                    return EDLParser(fps, edl_path=edl_path, convert_src_out=True)
-            return EDLParser_v23(fps, edl_path=edl_path)
\ No newline at end of file
+        try:
+            key = EDL_CACHE.file_key(edl_path)
+            variant = EDL_CACHE.get_variant(key)
+        except OSError:
+            key = variant = None
+
+        if variant is None:
+            with open(edl_path, "r", encoding="utf-8") as f:
+                variant = sniff_edl_variant(f)
+            if key is not None:
+                EDL_CACHE.put_variant(key, variant)
+
+        if variant == EDLParser_v23.cache_variant:
+            return EDLParser_v23(fps, edl_path=edl_path)
+        return EDLParser(fps, edl_path=edl_path, convert_src_out=variant[1])
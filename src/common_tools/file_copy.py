@@ -0,0 +1,308 @@
+import os
+import json
+import errno
+import shutil
+import hashlib
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Размер одного вызова copy_file_range
+COPY_RANGE_CHUNK = 64 * 1024 * 1024
+
+# Ошибки, при которых copy_file_range не поддерживается для этой пары файлов
+_COPY_RANGE_FALLBACK = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM}
+
+# Буфер копирования с подсчетом хеша
+HASH_BUFFER = 8 * 1024 * 1024
+HASH_NAME = "blake2b"
+
+# Манифест копирования в папке назначения
+MANIFEST_NAME = ".copy_manifest.json"
+
+# Буфер копирования переиспользуется в каждом потоке пула
+_local = threading.local()
+
+class CopyError(Exception):
+    """
+    Ошибка копирования файла с путями источника и назначения.
+    """
+    def __init__(self, src: str, dst: str, error: Exception):
+        super().__init__(f"{src} → {dst}: {error}")
+        self.src = src
+        self.dst = dst
+        self.error = error
+
+def _copy_range(src: str, dst: str) -> bool:
+    """
+    Копирование средствами ядра через os.copy_file_range.
+    Возвращает False, если файловая система его не поддерживает и ничего не было записано.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        first = True
+        while True:
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, COPY_RANGE_CHUNK)
+            except OSError as e:
+                if first and e.errno in _COPY_RANGE_FALLBACK:
+                    return False
+                raise
+            if copied == 0:
+                return True
+            first = False
+
+def copy_file(src: str, dst: str, resume: bool=False, metadata: bool=False) -> bool:
+    """
+    Копирует файл с правами доступа (как shutil.copy).
+
+    Используется os.copy_file_range, где он есть, иначе shutil.copyfile,
+    который сам выбирает fcopyfile на macOS и sendfile на Linux.
+
+    :param resume: Пропустить файл, если в назначении уже есть файл того же размера.
+    :param metadata: Копировать также время модификации и флаги (как shutil.copy2).
+    :return: False, если файл пропущен.
+    """
+    if resume:
+        try:
+            if os.stat(dst).st_size == os.stat(src).st_size:
+                return False
+        except FileNotFoundError:
+            pass
+
+    if not (hasattr(os, "copy_file_range") and _copy_range(src, dst)):
+        shutil.copyfile(src, dst)
+    if metadata:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copymode(src, dst)
+    return True
+
+def _get_buffer() -> bytearray:
+    """
+    Буфер чтения текущего потока пула.
+    """
+    if not hasattr(_local, "buffer"):
+        _local.buffer = bytearray(HASH_BUFFER)
+    return _local.buffer
+
+def file_digest(path: str) -> str:
+    """
+    Хеш BLAKE2b содержимого файла в формате записей манифеста.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = _get_buffer()
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+class CopyManifest:
+    """
+    Манифест папки назначения: для каждого скопированного файла размер и mtime источника
+    на момент копирования и хеш скопированных данных.
+
+    Файл считается актуальным, если запись есть в манифесте, источник не изменился
+    и копия имеет записанный размер. Содержимое копии при этом не читается: повреждение копии
+    без изменения размера обнаруживается только проверкой хеша (verify_digest).
+    Недописанные после сбоя файлы в манифест не попадают и копируются заново.
+    """
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, MANIFEST_NAME)
+        self.changed = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = data["files"] if data.get("algorithm") == HASH_NAME else {}
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def is_current(self, name: str, src_stat: os.stat_result, dst: str) -> bool:
+        entry = self.files.get(name)
+        if entry is None or entry["size"] != src_stat.st_size or entry["mtime_ns"] != src_stat.st_mtime_ns:
+            return False
+        try:
+            return os.stat(dst).st_size == entry["size"]
+        except FileNotFoundError:
+            return False
+
+    def verify_digest(self, name: str, dst: str) -> bool:
+        """
+        Перечитывает копию и сравнивает ее хеш с записанным в манифесте.
+        """
+        entry = self.files.get(name)
+        if entry is None or HASH_NAME not in entry:
+            return False
+        try:
+            return file_digest(dst) == entry[HASH_NAME]
+        except OSError:
+            return False
+
+    def record(self, name: str, entry: dict) -> None:
+        self.files[name] = entry
+        self.changed = True
+
+    def save(self) -> None:
+        """
+        Атомарно сохраняет манифест, если он изменился.
+        """
+        if not self.changed:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"algorithm": HASH_NAME, "files": self.files}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+def hashed_copy(src: str, dst: str, metadata: bool=False) -> dict:
+    """
+    Копирует файл одним проходом чтения, считая хеш BLAKE2b копируемых данных.
+    Данные пишутся во временный файл рядом с назначением, который переименовывается
+    только после проверки размера, поэтому на месте назначения не бывает недописанных файлов.
+
+    :return: Запись манифеста {"size", "mtime_ns", "blake2b"}.
+    """
+    folder, name = os.path.split(dst)
+    tmp_path = os.path.join(folder, f".{name}.part")
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = _get_buffer()
+    view = memoryview(buffer)
+    try:
+        with open(src, "rb") as fsrc, open(tmp_path, "wb") as fdst:
+            src_stat = os.fstat(fsrc.fileno())
+            while True:
+                size = fsrc.readinto(buffer)
+                if not size:
+                    break
+                digest.update(view[:size])
+                fdst.write(view[:size])
+            written = fdst.tell()
+
+        if written != src_stat.st_size:
+            raise OSError(f"Записано {written} байт из {src_stat.st_size}")
+
+        if metadata:
+            shutil.copystat(src, tmp_path)
+        else:
+            shutil.copymode(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {"size": src_stat.st_size, "mtime_ns": src_stat.st_mtime_ns, HASH_NAME: digest.hexdigest()}
+
+def _copy_task(src: str, dst: str, resume: bool, metadata: bool) -> bool:
+    try:
+        return copy_file(src, dst, resume, metadata)
+    except Exception as e:
+        raise CopyError(src, dst, e) from e
+
+def _checksum_task(src: str, dst: str, resume: bool, metadata: bool, manifest: CopyManifest,
+                   verify: bool) -> dict | None:
+    """
+    Копирование с хешем. Возвращает запись манифеста или None, если файл актуален.
+    """
+    try:
+        name = os.path.basename(dst)
+        if (resume and manifest.is_current(name, os.stat(src), dst)
+                and (not verify or manifest.verify_digest(name, dst))):
+            return None
+        return hashed_copy(src, dst, metadata)
+    except Exception as e:
+        raise CopyError(src, dst, e) from e
+
+def iter_copy(tasks, workers: int=8, resume: bool=False, metadata: bool=False, max_pending: int=None,
+              checksum: bool=False, verify: bool=False):
+    """
+    Копирует файлы пулом потоков и отдает результаты по мере готовности.
+
+    Папки назначения создаются заранее одним проходом. При первой ошибке или закрытии
+    генератора оставшиеся задачи отменяются, при ошибке выбрасывается CopyError.
+
+    :param tasks: Пары путей (src, dst).
+    :param resume: Пропускать уже скопированные файлы. Без checksum - по совпадению размера,
+    с checksum - по манифесту папки назначения.
+    :param max_pending: Сколько задач держать в очереди пула, по умолчанию workers * 2.
+    Большее значение позволяет пулу копировать, пока вызывающий код занят обработкой результата.
+    :param checksum: Копировать с подсчетом хеша и вести манифест в каждой папке назначения.
+    Манифест папки сохраняется, когда скопированы все ее файлы, и при остановке копирования.
+    Без checksum используется os.copy_file_range/shutil.copyfile без чтения данных в Python.
+    :param verify: Вместе с checksum и resume: перед пропуском файла перечитать копию и сверить ее хеш
+    с манифестом. Поврежденные копии того же размера копируются заново ценой чтения всех копий.
+    :return: Генератор кортежей (индекс задачи, скопирован ли файл).
+    """
+    tasks = list(tasks)
+    folders = {}
+    for _, dst in tasks:
+        folder = os.path.dirname(dst)
+        folders[folder] = folders.get(folder, 0) + 1
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    manifests = {folder: CopyManifest(folder) for folder in folders} if checksum else {}
+
+    workers = max(1, workers)
+    max_pending = max(1, max_pending or workers * 2)
+    task_iter = enumerate(tasks)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def submit(batch: int) -> None:
+            for index, (src, dst) in islice(task_iter, batch):
+                if checksum:
+                    future = executor.submit(_checksum_task, src, dst, resume, metadata,
+                                             manifests[os.path.dirname(dst)], verify)
+                else:
+                    future = executor.submit(_copy_task, src, dst, resume, metadata)
+                pending[future] = index
+
+        pending = {}
+        try:
+            submit(max_pending)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    result = future.result()
+                    if checksum:
+                        # Манифест меняется только в этом потоке
+                        dst = tasks[index][1]
+                        folder = os.path.dirname(dst)
+                        if result is not None:
+                            manifests[folder].record(os.path.basename(dst), result)
+                        folders[folder] -= 1
+                        if folders[folder] == 0:
+                            manifests[folder].save()
+                        result = result is not None
+                    submit(1)
+                    yield index, result
+        finally:
+            # При ошибке или досрочном закрытии генератора ждем только уже запущенные копирования
+            for future in pending:
+                future.cancel()
+            for manifest in manifests.values():
+                manifest.save()
+
+def copy_files(tasks, workers: int=8, resume: bool=False, progress=None, checksum: bool=False,
+               verify: bool=False) -> tuple[int, int]:
+    """
+    Копирует файлы пулом потоков ограниченной ширины (см. iter_copy).
+
+    :param tasks: Пары путей (src, dst).
+    :param progress: Вызывается как progress(done, total) после каждого файла.
+    :return: Кортеж (скопировано, пропущено).
+    """
+    tasks = list(tasks)
+    copied = skipped = 0
+    for _, is_copied in iter_copy(tasks, workers, resume, checksum=checksum, verify=verify):
+        if is_copied:
+            copied += 1
+        else:
+            skipped += 1
+        if progress is not None:
+            progress(copied + skipped, len(tasks))
+
+    return copied, skipped
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+class FileLock:
+    """
+    Межпроцессная эксклюзивная блокировка через lock-файл.
+    Работает между рабочими станциями на общем сетевом диске (SMB),
+    если файловая система поддерживает блокировки.
+    """
+    def __init__(self, path: str, timeout: float=60.0, poll_interval: float=0.1):
+        self.path = str(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    @property
+    def is_locked(self) -> bool:
+        return self._fd is not None
+
+    def _try_lock(self, fd: int) -> None:
+        if sys.platform == "win32":
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(self, fd: int) -> None:
+        if sys.platform == "win32":
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def acquire(self) -> None:
+        """
+        Ожидает блокировку не дольше timeout секунд.
+        Повторный вызов при уже полученной блокировке ничего не делает.
+        """
+        if self._fd is not None:
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._try_lock(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Не удалось получить блокировку {self.path}")
+                time.sleep(self.poll_interval)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            self._unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,184 @@
+import os
+import re
+import numpy as np
+
+# 015_3030_comp_v002.1004.exr или 015_3030_comp_v002_1004.exr -> префикс, номер кадра, суффикс
+FRAME_NAME_RE = re.compile(r'^(.*?)(\d+)([._]\w+)$')
+
+class FrameSequence:
+    """
+    Секвенция кадров одной папки с общим префиксом и суффиксом.
+
+    Номера кадров хранятся в отсортированном NumPy массиве, поэтому первый/последний кадр,
+    длительность и проверка пропущенных кадров не требуют повторного разбора имен.
+    """
+    def __init__(self, path: str, prefix: str, suffix: str, padding: int,
+                 frames: np.ndarray, names: list[str], sizes: np.ndarray | None=None,
+                 mtimes: np.ndarray | None=None):
+        self.path = path
+        self.prefix = prefix
+        self.suffix = suffix
+        self.padding = padding
+        self.frames = frames
+        self.names = names
+        self.sizes = sizes
+        self.mtimes = mtimes
+
+    def __repr__(self):
+        return f"FrameSequence('{self.pattern}', {self.first}-{self.last})"
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def pattern(self) -> str:
+        """
+        Имя секвенции в формате prefix[first-last]suffix.
+        """
+        return f"{self.prefix}[{self.first_str}-{self.last_str}]{self.suffix}"
+
+    @property
+    def first(self) -> int:
+        return int(self.frames[0])
+
+    @property
+    def last(self) -> int:
+        return int(self.frames[-1])
+
+    @property
+    def first_str(self) -> str:
+        """
+        Номер первого кадра с исходным паддингом.
+        """
+        return f"{self.first:0{self.padding}d}"
+
+    @property
+    def last_str(self) -> str:
+        """
+        Номер последнего кадра с исходным паддингом.
+        """
+        return f"{self.last:0{self.padding}d}"
+
+    @property
+    def duration(self) -> int:
+        """
+        Длительность секвенции по диапазону номеров кадров.
+        """
+        return self.last - self.first + 1
+
+    @property
+    def has_gaps(self) -> bool:
+        """
+        True, если номера кадров идут не подряд (пропуски или дубликаты номеров).
+        """
+        return bool(np.any(np.diff(self.frames) != 1))
+
+    def missing_frames(self) -> np.ndarray:
+        """
+        Номера отсутствующих кадров внутри диапазона секвенции.
+        """
+        return np.setdiff1d(np.arange(self.first, self.last + 1), self.frames, assume_unique=False)
+
+    def gap_ranges(self) -> list[tuple[int, int]]:
+        """
+        Диапазоны пропущенных кадров [(start, end), ...].
+        """
+        steps = np.diff(self.frames)
+        idx = np.nonzero(steps > 1)[0]
+        return [(int(self.frames[i]) + 1, int(self.frames[i + 1]) - 1) for i in idx]
+
+    @property
+    def paths(self) -> list[str]:
+        """
+        Полные пути к кадрам в порядке номеров.
+        """
+        return [os.path.join(self.path, name) for name in self.names]
+
+    @classmethod
+    def from_names(cls, path: str, names, sizes=None, mtimes=None) -> list["FrameSequence"]:
+        """
+        Группирует имена файлов одной папки в секвенции по (префикс, суффикс).
+        Имена без номера кадра пропускаются.
+
+        :param sizes: Размеры файлов в порядке names.
+        :param mtimes: Время модификации файлов (st_mtime_ns) в порядке names.
+        """
+        groups = {}
+        for i, name in enumerate(names):
+            match = FRAME_NAME_RE.match(name)
+            if not match:
+                continue
+            prefix, number, suffix = match.groups()
+            group = groups.setdefault((prefix, suffix), ([], [], [], []))
+            group[0].append(number)
+            group[1].append(name)
+            if sizes is not None:
+                group[2].append(sizes[i])
+            if mtimes is not None:
+                group[3].append(mtimes[i])
+
+        sequences = []
+        for (prefix, suffix), (numbers, group_names, group_sizes, group_mtimes) in groups.items():
+            frames = np.asarray([int(number) for number in numbers], dtype=np.int64)
+            order = np.argsort(frames, kind="stable")
+            sequences.append(cls(
+                path, prefix, suffix, len(numbers[order[0]]),
+                frames[order],
+                [group_names[i] for i in order],
+                np.asarray(group_sizes, dtype=np.int64)[order] if sizes is not None else None,
+                np.asarray(group_mtimes, dtype=np.int64)[order] if mtimes is not None else None,
+            ))
+
+        sequences.sort(key=lambda seq: (seq.prefix, seq.suffix))
+        return sequences
+
+def _normalize_extensions(extensions) -> tuple:
+    if isinstance(extensions, str):
+        extensions = (extensions,)
+    return tuple(ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions)
+
+def _scan(path: str, extensions: tuple, with_stats: bool) -> tuple[list[FrameSequence], list[str]]:
+    """
+    Один проход os.scandir по папке: секвенции и список подпапок.
+    """
+    names = []
+    sizes = [] if with_stats else None
+    mtimes = [] if with_stats else None
+    subfolders = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+            elif entry.name.lower().endswith(extensions) and entry.is_file():
+                names.append(entry.name)
+                if with_stats:
+                    stat = entry.stat()
+                    sizes.append(stat.st_size)
+                    mtimes.append(stat.st_mtime_ns)
+
+    return FrameSequence.from_names(path, names, sizes, mtimes), sorted(subfolders)
+
+def scan_folder(path: str, extensions, with_stats: bool=False) -> list[FrameSequence]:
+    """
+    Сканирует одну папку через os.scandir и возвращает найденные секвенции.
+
+    :param extensions: Расширение или кортеж расширений вида ".exr" или "exr" (без учета регистра).
+    :param with_stats: Сохранить размеры и время модификации кадров из DirEntry.stat().
+    """
+    return _scan(path, _normalize_extensions(extensions), with_stats)[0]
+
+def scan_tree(root: str, extensions, with_stats: bool=False):
+    """
+    Рекурсивно обходит дерево папок и отдает секвенции каждой папки.
+    """
+    extensions = _normalize_extensions(extensions)
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            sequences, subfolders = _scan(folder, extensions, with_stats)
+        except OSError:
+            continue
+
+        yield from sequences
+        stack.extend(reversed(subfolders))
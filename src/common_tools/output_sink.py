@@ -0,0 +1,83 @@
+import io
+import os
+
+# Временный файл создается с правами 0666, ядро само применяет umask процесса, как для open(path, "w")
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+class OutputSink:
+    """
+    Буферизованный вывод текстового документа (EDL, локаторы AVID, SRT) в один или несколько путей.
+
+    Все записи копятся в одном буфере в памяти. При закрытии содержимое один раз
+    записывается в каждый путь (основной и бекап) через временный файл в той же папке
+    и os.replace, поэтому на сетевом диске открывается по одному файлу на путь,
+    а недописанный документ никогда не оказывается на месте целевого.
+    При исключении внутри with целевые файлы не изменяются.
+    """
+    def __init__(self, *paths, encoding: str="utf-8"):
+        self.paths = [str(path) for path in paths]
+        self.encoding = encoding
+        self._buffer = io.StringIO()
+        self._closed = False
+
+    def write(self, text: str) -> None:
+        self._buffer.write(text)
+
+    def write_edl_event(self, record_id: str, clip_name: str, track_type: str, transition: str,
+                        src_in: str, src_out: str, rec_in: str, rec_out: str) -> None:
+        """
+        Событие EDL в формате, пригодном для отображения оффлайн клипов в Resolve и AVID.
+        """
+        self._buffer.write(f"{record_id} {clip_name} {track_type} {transition} "
+                           f"{src_in} {src_out} {rec_in} {rec_out}"
+                           f"\n* FROM CLIP NAME: {clip_name}\n")
+
+    def write_locator(self, timecode: str, name: str, track: str="V3", color: str="yellow") -> None:
+        """
+        Строка локатора AVID. Используется спец табуляция для корректного импорта в AVID.
+        """
+        self._buffer.write(f"PGM\t{timecode}\t{track}\t{color}\t{name}\n")
+
+    def write_srt_cue(self, index: int, start: str, end: str, text: str) -> None:
+        """
+        Субтитр SRT.
+        """
+        self._buffer.write(f"{index}\n{start} --> {end}\n{text}\n\n")
+
+    def commit(self) -> None:
+        """
+        Атомарно записывает буфер во все пути.
+        """
+        if self._closed:
+            return
+        # Как у open(path, "w"): переводы строк в формате платформы
+        data = self._buffer.getvalue().replace("\n", os.linesep).encode(self.encoding)
+        for path in self.paths:
+            folder, name = os.path.split(os.path.abspath(path))
+            tmp_path = os.path.join(folder, f".{name}.{os.urandom(6).hex()}.tmp")
+            fd = os.open(tmp_path, _TMP_FLAGS, 0o666)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        self.discard()
+
+    def discard(self) -> None:
+        """
+        Отбрасывает буфер без записи.
+        """
+        self._buffer.close()
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
@@ -0,0 +1,80 @@
+import os
+import pickle
+import threading
+from itertools import islice
+from pathlib import Path
+
+# Максимальное количество путей в кеше. При сохранении удаляются давно не использованные пути
+MAX_ENTRIES = 100000
+
+class ProbeCache:
+    """
+    Персистентный кеш результатов проб файлов и папок (listdir, заголовки EXR, MediaInfo).
+
+    Значения хранятся по пути и типу пробы и считаются валидными,
+    пока у пути не изменились размер и время модификации.
+    Если cache_path не указан, кеш работает только в памяти.
+
+    Пути хранятся в порядке последнего использования, при сохранении в кеше остаются
+    только max_entries последних, поэтому файл кеша не растет от проекта к проекту.
+    """
+    def __init__(self, cache_path: str=None, max_entries: int=MAX_ENTRIES):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    self._entries = pickle.load(f)
+            except Exception:
+                self._entries = {}
+
+    @staticmethod
+    def _stat_key(path: str) -> tuple:
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def probe(self, path: str, kind: str, func):
+        """
+        Возвращает результат пробы из кеша или вычисляет его через func(path) и сохраняет.
+        """
+        stat_key = self._stat_key(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["stat"] == stat_key and kind in entry["values"]:
+                # Перенос в конец словаря отмечает путь как недавно использованный
+                self._entries[path] = self._entries.pop(path)
+                self._dirty = True
+                return entry["values"][kind]
+
+        value = func(path)
+
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None or entry["stat"] != stat_key:
+                entry = {"stat": stat_key, "values": {}}
+            self._entries[path] = entry
+            entry["values"][kind] = value
+            self._dirty = True
+        return value
+
+    def save(self) -> None:
+        """
+        Атомарно сохраняет кеш на диск.
+        """
+        if not self.cache_path or not self._dirty:
+            return
+        with self._lock:
+            excess = len(self._entries) - self.max_entries
+            if excess > 0:
+                for path in list(islice(self._entries, excess)):
+                    del self._entries[path]
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
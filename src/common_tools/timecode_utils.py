@@ -0,0 +1,151 @@
+import numpy as np
+from functools import lru_cache
+
+# Разделители полей таймкода, которые принимает to_frames
+_SEPARATOR_CODES = np.array([ord(c) for c in ":;."], dtype=np.uint32)
+
+class TimecodeCodec:
+    """
+    Быстрый конвертер таймкодов HH:MM:SS:FF <-> целые фреймы для одного значения FPS.
+
+    Результаты полностью совпадают с библиотекой timecode (Timecode(fps, tc).frames и
+    str(Timecode(fps, frames=n))), включая нумерацию фреймов с единицы,
+    drop frame для 29.97/59.94 и переход через 24 часа.
+    """
+    def __init__(self, fps):
+        framerate = str(fps)
+        self.drop_frame = framerate in ("29.97", "59.94")
+
+        if self.drop_frame:
+            self.int_fps = {"29.97": 30, "59.94": 60}[framerate]
+            ffps = float(framerate)
+            self.drop_frames = int(round(ffps * 0.066666))
+        elif framerate.startswith(("23.976", "23.98")):
+            self.int_fps = 24
+            ffps = float(self.int_fps)
+            self.drop_frames = 0
+        else:
+            self.int_fps = int(float(framerate))
+            ffps = float(self.int_fps)
+            self.drop_frames = 0
+
+        if self.int_fps <= 0:
+            raise ValueError(f"Некорректное значение FPS: {fps}")
+
+        self.frames_per_10_minutes = int(round(ffps * 60 * 10))
+        self.frames_per_24_hours = int(round(ffps * 60 * 60 * 24))
+        self.frames_per_minute = int(round(ffps) * 60) - self.drop_frames
+        self.delimiter = ";" if self.drop_frame else ":"
+
+    def to_frames(self, timecode: str) -> int:
+        """
+        Переводит таймкод в номер фрейма (аналог Timecode(fps, timecode).frames).
+        """
+        bfr = timecode.replace(";", ":").replace(".", ":").split(":")
+        hours, minutes, seconds, frames = int(bfr[0]), int(bfr[1]), int(bfr[2]), int(bfr[3])
+
+        frame_number = (hours * 3600 + minutes * 60 + seconds) * self.int_fps + frames
+        if self.drop_frame:
+            total_minutes = 60 * hours + minutes
+            frame_number -= self.drop_frames * (total_minutes - total_minutes // 10)
+
+        return frame_number + 1
+
+    def to_timecode(self, frames: int) -> str:
+        """
+        Переводит номер фрейма в строку таймкода (аналог str(Timecode(fps, frames=frames))).
+        """
+        frames = int(frames)
+        if frames <= 0:
+            raise ValueError(f"Значение фреймов должно быть больше 0: {frames}")
+
+        frame_number = (frames - 1) % self.frames_per_24_hours
+
+        if self.drop_frame:
+            d, m = divmod(frame_number, self.frames_per_10_minutes)
+            frame_number += self.drop_frames * 9 * d
+            if m > self.drop_frames:
+                frame_number += self.drop_frames * ((m - self.drop_frames) // self.frames_per_minute)
+
+        total_seconds, frs = divmod(frame_number, self.int_fps)
+        total_minutes, secs = divmod(total_seconds, 60)
+        hrs, mins = divmod(total_minutes, 60)
+
+        return f"{hrs:02d}:{mins:02d}:{secs:02d}{self.delimiter}{frs:02d}"
+
+    def to_frames_array(self, timecodes) -> np.ndarray:
+        """
+        Векторная конвертация колонки таймкодов в массив фреймов int64.
+        """
+        timecodes = np.asarray(timecodes, dtype=str)
+        if timecodes.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Быстрый путь только для фиксированной ширины HH:MM:SS:FF
+        if not np.all(np.char.str_len(timecodes) == 11):
+            return np.array([self.to_frames(t) for t in timecodes.ravel()],
+                            dtype=np.int64).reshape(timecodes.shape)
+
+        # Символы UCS-4 читаются как коды, цифра = код - ord("0")
+        codes = timecodes.astype("U11").view(np.uint32).reshape(timecodes.size, -1)
+        digits = codes[:, [0, 1, 3, 4, 6, 7, 9, 10]].astype(np.int64) - ord("0")
+        separators = codes[:, [2, 5, 8]]
+        # Некорректные таймкоды разбираются скалярным путем, который выбрасывает ValueError
+        if not (np.all((digits >= 0) & (digits <= 9)) and np.all(np.isin(separators, _SEPARATOR_CODES))):
+            return np.array([self.to_frames(t) for t in timecodes.ravel()],
+                            dtype=np.int64).reshape(timecodes.shape)
+        hours = digits[:, 0] * 10 + digits[:, 1]
+        minutes = digits[:, 2] * 10 + digits[:, 3]
+        seconds = digits[:, 4] * 10 + digits[:, 5]
+        frames = digits[:, 6] * 10 + digits[:, 7]
+
+        frame_number = (hours * 3600 + minutes * 60 + seconds) * self.int_fps + frames
+        if self.drop_frame:
+            total_minutes = 60 * hours + minutes
+            frame_number -= self.drop_frames * (total_minutes - total_minutes // 10)
+
+        return (frame_number + 1).reshape(np.shape(timecodes))
+
+    def to_timecode_array(self, frames) -> list[str]:
+        """
+        Векторная конвертация массива фреймов в список строк таймкодов.
+        """
+        frames = np.asarray(frames, dtype=np.int64)
+        if np.any(frames <= 0):
+            raise ValueError("Значение фреймов должно быть больше 0")
+
+        frame_number = (frames - 1) % self.frames_per_24_hours
+
+        if self.drop_frame:
+            d, m = np.divmod(frame_number, self.frames_per_10_minutes)
+            frame_number = frame_number + self.drop_frames * 9 * d + np.where(
+                m > self.drop_frames,
+                self.drop_frames * ((m - self.drop_frames) // self.frames_per_minute),
+                0)
+
+        total_seconds, frs = np.divmod(frame_number, self.int_fps)
+        total_minutes, secs = np.divmod(total_seconds, 60)
+        hrs, mins = np.divmod(total_minutes, 60)
+
+        return [f"{h:02d}:{m:02d}:{s:02d}{self.delimiter}{f:02d}"
+                for h, m, s, f in zip(hrs.tolist(), mins.tolist(), secs.tolist(), frs.tolist())]
+
+@lru_cache(maxsize=None)
+def get_codec(fps) -> TimecodeCodec:
+    """
+    Возвращает закешированный конвертер для указанного FPS.
+    """
+    return TimecodeCodec(fps)
+
+@lru_cache(maxsize=65536)
+def timecode_to_frames(fps, timecode: str) -> int:
+    """
+    Переводит таймкод во фреймы. Повторные строки берутся из кеша.
+    """
+    return get_codec(fps).to_frames(timecode)
+
+def frames_to_timecode(fps, frames: int) -> str:
+    """
+    Переводит фреймы в строку таймкода.
+    """
+    return get_codec(fps).to_timecode(frames)
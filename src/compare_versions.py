@@ -20,7 +20,7 @@ from dvr_tools.css_style import apply_style
 from config.config_loader import load_config
 from config.config import get_config
 from config.global_config import GLOBAL_CONFIG
-from dvr_tools.resolve_utils import ResolveObjects
+from dvr_tools.resolve_utils import ResolveObjects, get_session
 
 logger = get_logger(__file__)
 
@@ -424,8 +424,9 @@ class VersionComparer:
         self.pattern_shot_number = self.config['patterns']["compare_versions_shot_soft_mask"]
         self.pattern_real_shot = self.config['patterns']["compare_versions_shot_no_prefix_mask"]
 
-        resolve = ResolveObjects()
-        self.project_manager = resolve.project_manager
+        # Одно подключение на все проекты, объекты проекта обновляются сессией после LoadProject
+        session = get_session()
+        self.project_manager = session.project_manager
         output_path = self.get_output_path(self.project, "txt", f"{self.project}_compare_report")
 
 
@@ -439,15 +440,14 @@ class VersionComparer:
             
             self.reel_num = self.get_reel_num(project)
 
-            resolve = ResolveObjects()
-            project_obj = self.project_manager.GetCurrentProject()
-            timeline = resolve.timeline
-            max_track = timeline.GetTrackCount("video")
+            project_obj = session.project
+            timeline = project_obj.GetCurrentTimeline()
 
             if timeline is None:
                 self.signals.error_signal.emit(f"Не найдена таймлиния")
                 return False
-                
+
+            max_track = timeline.GetTrackCount("video")
             all_timeline_items = self.get_timeline_items(1, max_track, timeline)
             timeline_items = self.get_target_tmln_items(all_timeline_items)
 
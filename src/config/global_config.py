@@ -11,6 +11,8 @@ GLOBAL_CONFIG = {
         "log_path_mac": r"/Volumes/share2/003_transcode_to_vfx/projects/log.log",
         "editdatabase_path_mac": r"/Volumes/share2/003_transcode_to_vfx/projects/Others/projects_data.json",
         "editdatabase_path_win": r"J:\003_transcode_to_vfx\projects\Others\projects_data.json",
+        "editdatabase_sqlite_path_mac": r"/Volumes/share2/003_transcode_to_vfx/projects/Others/projects_data.sqlite",
+        "editdatabase_sqlite_path_win": r"J:\003_transcode_to_vfx\projects\Others\projects_data.sqlite",
     },
 
     "patterns": {
@@ -50,7 +52,14 @@ GLOBAL_CONFIG = {
 
     "scripts_settings":{
         "autoconform": {"shots_path_win": r"R:/",
-                        "shots_path_mac": r"/Volumes/RAID/"},
+                        "shots_path_mac": r"/Volumes/RAID/",
+                        # "index" - пути-кандидаты берутся из n-граммного индекса имен шотов (маска patterns["shot_name"]),
+                        # затем проверяются тем же поиском подстрокой, поэтому результат совпадает с "substring".
+                        # Имена шотов с символами регулярных выражений ищутся полным перебором.
+                        # "substring" - поиск имени шота подстрокой по всем путям (как было раньше)
+                        "shot_lookup_mode": "index",
+                        # Количество потоков для предварительного чтения данных шотов (listdir, EXR, MediaInfo)
+                        "probe_workers": 16},
         "exr_delivery": {
                 "track_postfix": '_VT',
                 "colors": ["Orange", "Yellow", "Lime", "Violet", "Blue"],
@@ -82,6 +91,49 @@ GLOBAL_CONFIG = {
             },
         "compare_versions": {"extentions": ('.exr', '.mov', '.jpg'),
                              "required_fields": ['Entity', 'Reel', 'Path to Frames', 'Path to EXR']},
-        "get_shot": {"extentions": (".exr", ".jpg", ".tif", ".tiff", ".png")}
+        "get_shot": {"extentions": (".exr", ".jpg", ".tif", ".tiff", ".png"),
+                     # Количество параллельных потоков копирования кадров
+                     "copy_workers": 8,
+                     # Копирование с хешем BLAKE2b и манифестом в папке шота. Повторно не копируются файлы,
+                     # у которых в манифесте совпадают размер и mtime источника и размер копии.
+                     # Данные читаются в Python, поэтому быстрое копирование os.copy_file_range
+                     # (на стороне сервера/ядра) используется только при False
+                     "checksum": True,
+                     # Перед пропуском файла перечитывать копию и сверять хеш с манифестом.
+                     # Находит поврежденные копии того же размера, но читает все уже скопированные файлы
+                     "verify": False},
+        "edl_cache": {
+                # Дублировать распарсенные EDL в JSON файлы в локальной папке кеша пользователя
+                # (~/Library/Caches/autoconform/edl_cache, %LOCALAPPDATA%\autoconform\edl_cache)
+                "sidecar": False,
+                # Максимальное количество файлов кеша и их срок хранения, дни
+                "max_files": 500,
+                "max_age_days": 30},
+        "edit_database": {
+                # Режим журнала SQLite. "DELETE" - для базы на сетевом диске (SMB),
+                # "WAL" - только если база лежит на локальном диске
+                "journal_mode": "DELETE",
+                # Время ожидания блокировки базы другими рабочими станциями, сек
+                "lock_timeout": 60,
+                # Минимальный интервал между полными бэкапами базы, часы
+                "backup_interval_hours": 24
+            },
+        "sequence_checker": {
+                # Количество воркеров проверки секвенций. 0 - по количеству ядер
+                "workers": 0,
+                # "process" - пул процессов, "thread" - пул потоков с многопоточностью OIIO
+                "executor": "process"
+            },
+        "get_every_n_frame": {
+                # Количество параллельных потоков копирования
+                "copy_workers": 8,
+                # Пропускать уже скопированные файлы
+                "resume": True,
+                # Копирование с хешем и манифестом. False - пропуск по совпадению размера
+                # и быстрое копирование os.copy_file_range вместо чтения данных в Python
+                "checksum": True,
+                # Перед пропуском файла сверять хеш копии с манифестом (читает все уже скопированные файлы)
+                "verify": False
+            }
     }
 }
\ No newline at end of file
@@ -1,25 +1,115 @@
 import DaVinciResolveScript as dvr
 import re
+import threading
 from collections import Counter
 
 class GetTimelineObjectsError(Exception):
     pass
 
-class ResolveObjects:
+class ResolveSession:
     """
-    Класс получает основные объекты резолв.
+    Подключение к Resolve, общее для всего процесса (см. get_session).
 
+    dvr.scriptapp вызывается один раз, менеджер проектов кешируется вместе с подключением.
+    Проект, медиапул, корневая папка и таймлиния каждый раз запрашиваются заново: проект может быть
+    закрыт и открыт снова (LoadProject/CloseProject) с тем же идентификатором, и объекты
+    закрытого экземпляра проекта становятся недействительными.
+    Если старое подключение перестало отвечать (Resolve перезапущен), выполняется одно переподключение.
     """
     def __init__(self):
-        self.resolve = dvr.scriptapp("Resolve")
-        if self.resolve is None:
+        self._lock = threading.RLock()
+        self._resolve = None
+        self._project_manager = None
+
+    def _connect(self) -> None:
+        resolve = dvr.scriptapp("Resolve")
+        if resolve is None:
             raise RuntimeError("Ошибка подключения к Resolve")
-        
-        self.resolve_project_manager = self.resolve.GetProjectManager()
-        self.resolve_project = self.resolve_project_manager.GetCurrentProject()
+        self._resolve = resolve
+        self._project_manager = resolve.GetProjectManager()
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает подключение.
+        """
+        with self._lock:
+            self._resolve = None
+            self._project_manager = None
+
+    @property
+    def resolve(self):
+        with self._lock:
+            if self._resolve is None:
+                self._connect()
+            return self._resolve
+
+    @property
+    def project_manager(self):
+        with self._lock:
+            if self._resolve is None:
+                self._connect()
+            return self._project_manager
+
+    @property
+    def project(self):
+        """
+        Текущий проект с проверкой живости подключения.
+        """
+        with self._lock:
+            try:
+                project = self.project_manager.GetCurrentProject()
+            except Exception:
+                project = None
+            if project is None:
+                self._connect()
+                project = self._project_manager.GetCurrentProject()
+                if project is None:
+                    raise RuntimeError("Не открыт проект Resolve")
+            return project
+
+    @property
+    def mediapool(self):
+        return self.project.GetMediaPool()
+
+    @property
+    def root_folder(self):
+        return self.mediapool.GetRootFolder()
+
+    @property
+    def timeline(self):
+        return self.project.GetCurrentTimeline()
+
+    @property
+    def mediapool_current_folder(self):
+        return self.mediapool.GetCurrentFolder()
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> ResolveSession:
+    """
+    Общая для процесса сессия Resolve. Подключение выполняется при первом обращении к объектам.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = ResolveSession()
+        return _session
+
+class ResolveObjects:
+    """
+    Класс получает основные объекты резолв.
+    Объекты берутся из общей сессии (get_session), поэтому повторное создание
+    не переподключается к Resolve, а только запрашивает текущие объекты проекта.
+    """
+    def __init__(self, session: ResolveSession=None):
+        session = session or get_session()
+        self.resolve = session.resolve
+        self.resolve_project_manager = session.project_manager
+        self.resolve_project = session.project
         self.resolve_mediapool = self.resolve_project.GetMediaPool()
+        self.resolve_root_folder = self.resolve_mediapool.GetRootFolder()
         self.resolve_timeline = self.resolve_project.GetCurrentTimeline()
-        self.resolve_root_folder = self.resolve_mediapool.GetRootFolder()  
         self.resolve_mediapool_current_folder = self.resolve_mediapool.GetCurrentFolder()
 
     @property
@@ -1,24 +1,29 @@
-from timecode import Timecode as tc
 import re
 import sys
 import os
 import json
+import time
+import bisect
+import sqlite3
 import subprocess
 import random as rand
+import numpy as np
 from pathlib import Path
 from collections import Counter
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import PatternFill
 from datetime import datetime as dt, date as d
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QObject, QSize, QUrl
-from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QObject, QSize, QUrl, QAbstractItemModel, QModelIndex
 from PyQt5.QtWidgets import (QMessageBox, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QPushButton,  QApplication, QFileDialog, QWidget, QTextEdit, 
-    QTabWidget, QComboBox,  QTreeView, QHeaderView, QTextBrowser, QCheckBox)
-from timecode import Timecode as tc
+    QTabWidget, QComboBox,  QTreeView, QHeaderView, QTextBrowser, QCheckBox, QSpinBox)
+from common_tools.timecode_utils import timecode_to_frames, frames_to_timecode, get_codec
 from dvr_tools.css_style import apply_style
 from common_tools.edl_parsers import detect_edl_parser, EDLParserError, EDLParser
+from common_tools.file_lock import FileLock
+from common_tools.output_sink import OutputSink
+from common_tools.edit_diff import compare_edits, EditHistory
 from dvr_tools.logger_config import get_logger
 from config.config_loader import load_config
 from config.config import get_config
@@ -26,8 +31,12 @@ from config.global_config import GLOBAL_CONFIG
 
 logger = get_logger(__file__)
 
-DATA_PATH = {"win32": GLOBAL_CONFIG["paths"]["editdatabase_path_win"], 
+DATA_PATH = {"win32": GLOBAL_CONFIG["paths"]["editdatabase_sqlite_path_win"], 
+                        "darwin": GLOBAL_CONFIG["paths"]["editdatabase_sqlite_path_mac"]}[sys.platform]
+# База в старом JSON формате, используется для разового переноса в SQLite
+JSON_DATA_PATH = {"win32": GLOBAL_CONFIG["paths"]["editdatabase_path_win"], 
                         "darwin": GLOBAL_CONFIG["paths"]["editdatabase_path_mac"]}[sys.platform]
+DATABASE_SETTINGS = GLOBAL_CONFIG["scripts_settings"]["edit_database"]
 
 def get_output_path(project: str, ext: str, report_name: str, subfolder=None) -> str:
     """
@@ -48,26 +57,173 @@ def get_output_path(project: str, ext: str, report_name: str, subfolder=None) ->
     output_path.parent.mkdir(parents=True, exist_ok=True)
     return output_path
 
+# Поля записи монтажа шота в порядке, в котором они отдаются наружу
+EDIT_FIELDS = ("id", "shot_name", "src_name", "track_type", "transition", "src_in", "src_out",
+               "src_out_full", "rec_in", "rec_out", "is_actual", "edit_version", "add_data")
+
+EDIT_COLUMNS = ("record_id", "src_name", "track_type", "transition", "src_in", "src_out",
+                "src_out_full", "rec_in", "rec_out", "is_actual", "add_data")
+
+# Поля записи монтажа, которые можно изменить во вкладке View Database, и их колонки в таблице edits.
+# shot_name и edit_version - ключи записи, их изменение не поддерживается
+EDITABLE_FIELDS = {"id": "record_id", "src_name": "src_name", "track_type": "track_type",
+                   "transition": "transition", "src_in": "src_in", "src_out": "src_out",
+                   "src_out_full": "src_out_full", "rec_in": "rec_in", "rec_out": "rec_out",
+                   "is_actual": "is_actual", "add_data": "add_data"}
+
+SELECT_EDITS = """
+    SELECT e.record_id, s.shot_name, e.src_name, e.track_type, e.transition, e.src_in, e.src_out,
+           e.src_out_full, e.rec_in, e.rec_out, e.is_actual, e.edit_name, e.add_data
+    FROM edits e JOIN shots s ON s.id = e.shot_id
+"""
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS shots (
+        id INTEGER PRIMARY KEY,
+        project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+        shot_name TEXT NOT NULL,
+        UNIQUE (project_id, shot_name)
+    );
+    CREATE TABLE IF NOT EXISTS edits (
+        id INTEGER PRIMARY KEY,
+        project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+        shot_id INTEGER NOT NULL REFERENCES shots(id) ON DELETE CASCADE,
+        edit_name TEXT NOT NULL,
+        record_id TEXT,
+        src_name TEXT,
+        track_type TEXT,
+        transition TEXT,
+        src_in TEXT,
+        src_out TEXT,
+        src_out_full TEXT,
+        rec_in TEXT,
+        rec_out TEXT,
+        is_actual INTEGER NOT NULL DEFAULT 0,
+        add_data TEXT,
+        UNIQUE (shot_id, edit_name)
+    );
+    CREATE INDEX IF NOT EXISTS edits_project_edit ON edits(project_id, edit_name);
+    CREATE INDEX IF NOT EXISTS edits_project_actual ON edits(project_id, is_actual);
+"""
+
 class EditDatabase:
     """
     Класс базы данных монтажей.
+
+    Данные хранятся в SQLite: таблицы projects, shots и edits с индексами
+    по (проект, шот), (проект, монтаж) и статусу is_actual.
+
+    Первая запись открывает транзакцию BEGIN IMMEDIATE под межпроцессной блокировкой lock-файла,
+    save() фиксирует ее и снимает блокировку. Одновременные записи с разных рабочих станций
+    выполняются по очереди, и записываются только измененные строки.
     """
-    def __init__(self, data_base_path: str, project: str):
-        self.data_base = data_base_path
+    def __init__(self, data_base_path: str, project: str=None, json_path: str=None):
+        """
+        :param project: Текущий проект. Проект создается в базе при первом добавлении шота.
+        :param json_path: Путь к базе в старом JSON формате.
+        Если указан, данные из него один раз переносятся в SQLite.
+        """
+        self.data_base = str(data_base_path)
         self.project = project
 
-        if os.path.exists(data_base_path):
-            with open(data_base_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    self.data = {} 
-                else:
-                    self.data = json.loads(content)
+        timeout = DATABASE_SETTINGS.get("lock_timeout", 60)
+        Path(self.data_base).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = FileLock(f"{self.data_base}.lock", timeout=timeout)
+        self.connection = sqlite3.connect(self.data_base, timeout=timeout, isolation_level=None)
+        self.connection.execute(f"PRAGMA journal_mode = {DATABASE_SETTINGS.get('journal_mode', 'DELETE')}")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self._project_ids = {}  # Кеш id проектов, загружаемых по мере обращения
+
+        if not self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'edits'").fetchone():
+            with self.lock:
+                self.connection.executescript(SCHEMA)
+
+        if json_path and os.path.exists(json_path) and not self._get_meta("json_migrated"):
+            self._begin()
+            try:
+                # Другой клиент мог перенести данные, пока мы ждали блокировку
+                if not self._get_meta("json_migrated"):
+                    self.migrate_json(json_path)
+            except Exception:
+                # Частично перенесенные данные отменяются, блокировка и соединение освобождаются
+                self.close()
+                raise
+            self.save()
+
+    def _begin(self) -> None:
+        """
+        Открывает транзакцию записи, если она еще не открыта.
+        """
+        if self.connection.in_transaction:
+            return
+        self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.lock.release()
+            raise
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _project_id(self, project: str, create: bool=False) -> int | None:
+        """
+        Возвращает id проекта. При create=True создает проект, если его нет.
+        """
+        project_id = self._project_ids.get(project)
+        if project_id is not None:
+            return project_id
+
+        row = self.connection.execute("SELECT id FROM projects WHERE name = ?", (project,)).fetchone()
+        if row:
+            project_id = row[0]
+        elif create:
+            project_id = self.connection.execute("INSERT INTO projects (name) VALUES (?)", (project,)).lastrowid
         else:
-            self.data = {}
+            return None
 
-        if project not in self.data:
-            self.data[project] = {}
+        self._project_ids[project] = project_id
+        return project_id
+
+    def _shot_id(self, project_id: int, shot_name: str) -> int:
+        """
+        Возвращает id шота проекта, создавая шот при необходимости.
+        """
+        row = self.connection.execute(
+            "SELECT id FROM shots WHERE project_id = ? AND shot_name = ?", (project_id, shot_name)).fetchone()
+        if row:
+            return row[0]
+        return self.connection.execute(
+            "INSERT INTO shots (project_id, shot_name) VALUES (?, ?)", (project_id, shot_name)).lastrowid
+
+    @staticmethod
+    def _to_edit_data(row: tuple) -> dict:
+        """
+        Преобразует строку выборки SELECT_EDITS в словарь монтажа шота.
+        """
+        edit_data = dict(zip(EDIT_FIELDS, row))
+        edit_data["is_actual"] = bool(edit_data["is_actual"])
+        return edit_data
+
+    def _upsert_edit(self, project_id: int, shot_id: int, edit_name: str, values: tuple) -> None:
+        """
+        Добавляет или обновляет монтаж шота. Значения - в порядке EDIT_COLUMNS.
+        """
+        self.connection.execute(f"""
+            INSERT INTO edits (project_id, shot_id, edit_name, {", ".join(EDIT_COLUMNS)})
+            VALUES (?, ?, ?, {", ".join("?" * len(EDIT_COLUMNS))})
+            ON CONFLICT (shot_id, edit_name) DO UPDATE SET
+            {", ".join(f"{column} = excluded.{column}" for column in EDIT_COLUMNS)}
+        """, (project_id, shot_id, edit_name, *values))
 
     def add_shot(self, project: str, shot_name: str, edit_name: str, shot_id: str,
                 track_type: str, transition: str, 
@@ -79,50 +235,91 @@ class EditDatabase:
 
         :param update_status: Булево значение, указывающее добавлять ли текущий монтаж в статус 'actual' или нет.
         """
-        
-        if shot_name not in self.data[project]:
-            self.data[project][shot_name] = {}
+        self._begin()
+        project_id = self._project_id(project, create=True)
+        db_shot_id = self._shot_id(project_id, shot_name)
 
         if update_status:
-            for edit in self.data[project][shot_name].values():
-                edit["is_actual"] = False
-
-        self.data[project][shot_name][edit_name] = {
-            "id": shot_id,
-            "shot_name": shot_name,
-            "src_name": src_name,
-            "track_type": track_type,
-            "transition": transition,
-            "src_in": src_in,
-            "src_out": src_out,
-            "src_out_full": src_out_full,
-            "rec_in": rec_in,
-            "rec_out": rec_out,
-            "is_actual": update_status,
-            "edit_version": edit_name,
-            "add_data": dt.strftime(dt.today(), "%Y-%m-%d %H:%M:%S")
-        }
+            self.connection.execute("UPDATE edits SET is_actual = 0 WHERE shot_id = ?", (db_shot_id,))
 
-    def _remove_edit(self, project: str, input_edit) -> None:
+        self._upsert_edit(project_id, db_shot_id, edit_name, (
+            shot_id, src_name, track_type, transition, src_in, src_out, src_out_full,
+            rec_in, rec_out, int(bool(update_status)), dt.strftime(dt.today(), "%Y-%m-%d %H:%M:%S")))
+
+    def ingest_edl(self, parser, project: str, edit_name: str=None, update_status: bool=True,
+                   shot_mask=None) -> int:
         """
-        Удаляет все вхождения монтажа input_edit в указанном проекте.
+        Пакетное добавление монтажа из парсера EDL одной транзакцией.
+
+        Статус 'actual' у прежних монтажей шотов снимается одним запросом,
+        записи добавляются через executemany с общим временем добавления.
+
+        :param parser: Итерируемый парсер EDL (записи EDLEntry).
+        :param edit_name: Имя монтажа. Если не указано, берется из записей парсера.
+        :param update_status: Присвоить монтажу статус 'actual'.
+        :param shot_mask: Регулярное выражение (строка или скомпилированное) для отбора шотов.
+        :return: Количество добавленных записей.
         """
-        if project not in self.data:
-            return False
+        if isinstance(shot_mask, str):
+            shot_mask = re.compile(shot_mask)
 
-        project_data = self.data[project]
+        entries = [data for data in parser if shot_mask is None or shot_mask.match(data.edl_shot_name)]
+        if not entries:
+            return 0
 
-        shots_to_clean = []
-        for shot, edits in project_data.items():
+        self._begin()
+        try:
+            project_id = self._project_id(project, create=True)
+
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO shots (project_id, shot_name) VALUES (?, ?)",
+                [(project_id, shot_name) for shot_name in dict.fromkeys(data.edl_shot_name for data in entries)])
+            shot_ids = dict(self.connection.execute(
+                "SELECT shot_name, id FROM shots WHERE project_id = ?", (project_id,)))
+
+            if update_status:
+                self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS ingest_shots (shot_id INTEGER PRIMARY KEY)")
+                self.connection.execute("DELETE FROM temp.ingest_shots")
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO temp.ingest_shots (shot_id) VALUES (?)",
+                    [(shot_ids[data.edl_shot_name],) for data in entries])
+                self.connection.execute("""
+                    UPDATE edits SET is_actual = 0
+                    WHERE is_actual = 1 AND shot_id IN (SELECT shot_id FROM temp.ingest_shots)
+                """)
+
+            add_data = dt.strftime(dt.today(), "%Y-%m-%d %H:%M:%S")
+            is_actual = int(bool(update_status))
+            self.connection.executemany(f"""
+                INSERT INTO edits (project_id, shot_id, edit_name, {", ".join(EDIT_COLUMNS)})
+                VALUES (?, ?, ?, {", ".join("?" * len(EDIT_COLUMNS))})
+                ON CONFLICT (shot_id, edit_name) DO UPDATE SET
+                {", ".join(f"{column} = excluded.{column}" for column in EDIT_COLUMNS)}
+            """, [(project_id, shot_ids[data.edl_shot_name], edit_name or data.edl_edit_name,
+                   data.edl_record_id, data.edl_source_name, data.edl_track_type, data.edl_transition,
+                   data.edl_source_in, data.edl_source_out, data.edl_source_out_src,
+                   data.edl_record_in, data.edl_record_out, is_actual, add_data) for data in entries])
+        except Exception:
+            self.rollback()
+            raise
 
-            if input_edit in edits:
-                del edits[input_edit]
+        self.save()
+        return len(entries)
 
-            if not edits:
-                shots_to_clean.append(shot)
+    def _remove_edit(self, project: str, input_edit) -> None:
+        """
+        Удаляет все вхождения монтажа input_edit в указанном проекте.
+        """
+        project_id = self._project_id(project)
+        if project_id is None:
+            return False
 
-        for shot in shots_to_clean:
-            del project_data[shot]
+        self._begin()
+        self.connection.execute("DELETE FROM edits WHERE project_id = ? AND edit_name = ?", (project_id, input_edit))
+        self.connection.execute("""
+            DELETE FROM shots WHERE project_id = ?
+            AND NOT EXISTS (SELECT 1 FROM edits WHERE edits.shot_id = shots.id)
+        """, (project_id,))
 
         self.save()
 
@@ -130,10 +327,13 @@ class EditDatabase:
         """
         Удаляет проект.
         """
-        if project not in self.data:
+        project_id = self._project_id(project)
+        if project_id is None:
             return False
         
-        del self.data[project]
+        self._begin()
+        self.connection.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        self._project_ids.pop(project, None)
 
         self.save()
 
@@ -141,12 +341,13 @@ class EditDatabase:
         """
         Удаляет шоты.
         """
-        if project not in self.data:
+        project_id = self._project_id(project)
+        if project_id is None:
             return False
         shots = shots.split(" ")
-        for shot in shots:
-            if shot in self.data[project]:
-                del self.data[project][shot]
+        self._begin()
+        self.connection.executemany(
+            "DELETE FROM shots WHERE project_id = ? AND shot_name = ?", [(project_id, shot) for shot in shots])
 
         self.save()
 
@@ -154,80 +355,325 @@ class EditDatabase:
         """
         Возвращает словарь с шотами отфильтрованными по названию входящего монтажа.
         """
-        result_data = {}
-        project_data = self.data.get(project, {})
-        for shot, edit in project_data.items():
-            for edit_name, edit_data in edit.items():
-                if edit_name == input_edit_name:
-                    result_data.update({shot: edit_data})
-        
-        return result_data
+        rows = self.connection.execute(
+            SELECT_EDITS + " WHERE e.project_id = ? AND e.edit_name = ? ORDER BY s.id",
+            (self._project_id(project), input_edit_name))
+        return {row[1]: self._to_edit_data(row) for row in rows}
     
     def get_shots_by_actual(self, project: str) -> dict:
         """
         Возвращает шоты со статусом монтажа "is_actual": True.
         """
-        result_data = {}
-    
-        if self.data[project] == {}:
+        project_id = self._project_id(project)
+        if not self.connection.execute("SELECT 1 FROM edits WHERE project_id = ? LIMIT 1", (project_id,)).fetchone():
             raise KeyError("В указанном проекте нет монтажей")
 
-        project_data = self.data[project]
-        for shot, edit in project_data.items():
-            for _, edit_data in edit.items():
-                if edit_data.get("is_actual"):
-                    result_data.update({shot: edit_data})
-        
-        return result_data
+        rows = self.connection.execute(
+            SELECT_EDITS + " WHERE e.project_id = ? AND e.is_actual = 1 ORDER BY s.id, e.id", (project_id,))
+        return {row[1]: self._to_edit_data(row) for row in rows}
     
     def get_shots_by_edits(self, project: str, input_edits: list) -> dict:
         """
         Возвращает словарь с шотами отфильтрованными по названию входящих монтажей.
         Значения ключей содержат значения всех монтажей в параметре input_edits.
         """
+        if not input_edits:
+            return {}
+
+        edit_order = {edit_name: i for i, edit_name in reversed(list(enumerate(input_edits)))}
+        rows = self.connection.execute(
+            SELECT_EDITS + f" WHERE e.project_id = ? AND e.edit_name IN ({', '.join('?' * len(edit_order))}) ORDER BY s.id",
+            (self._project_id(project), *edit_order)).fetchall()
+        # Сортировка устойчивая: внутри монтажа сохраняется порядок шотов
+        rows.sort(key=lambda row: edit_order[row[11]])
+
         result_data = {}
-        project_data = self.data.get(project, {})
-        for input_edit in input_edits:
-            for shot, edit in project_data.items():
-                for edit_name, edit_data in edit.items():
-                    if edit_name == input_edit:
-                        result_data.setdefault(shot, []).append(edit_data)
+        for row in rows:
+            result_data.setdefault(row[1], []).append(self._to_edit_data(row))
         
         return result_data
     
     def get_edits(self, project: str) -> list:
         """
-        Возвращает список всех монтажей добавленных в базу данных.
+        Возвращает список всех монтажей в хронологическом порядке добавления в базу данных.
+        Порядок определяется временем добавления (add_data), так как id строк не сохраняют
+        этот порядок после переноса из JSON и сохранения данных через load_dict.
+        """
+        rows = self.connection.execute(
+            "SELECT edit_name FROM edits WHERE project_id = ? GROUP BY edit_name ORDER BY MIN(add_data), MIN(id)",
+            (self._project_id(project),))
+        return [row[0] for row in rows]
+
+    def get_shots_history(self, project: str, last_edits: int=None) -> tuple[list, dict]:
+        """
+        Загружает все монтажи проекта одним запросом.
+
+        :param last_edits: Ограничить историю N последними по времени добавления монтажами.
+        :return: Кортеж (edit_names, shots), где edit_names - монтажи в хронологическом порядке (см. get_edits),
+        shots - {shot_name: {edit_name: данные}}.
+        """
+        edit_names = self.get_edits(project)
+        if last_edits:
+            edit_names = edit_names[-last_edits:]
+        selected = set(edit_names)
+
+        shots = {}
+        rows = self.connection.execute(
+            SELECT_EDITS + " WHERE e.project_id = ? ORDER BY s.id, e.id", (self._project_id(project),))
+        for row in rows:
+            if row[11] in selected:
+                shots.setdefault(row[1], {})[row[11]] = self._to_edit_data(row)
+        return edit_names, shots
+
+    def to_dict(self, project: str=None) -> dict:
+        """
+        Возвращает данные в формате {проект: {шот: {монтаж: данные}}}.
+        Если project указан - только данные этого проекта.
+        """
+        data = {}
+        if project is None:
+            projects = self.connection.execute("SELECT id, name FROM projects ORDER BY id").fetchall()
+        else:
+            projects = [(self._project_id(project), project)]
+
+        for project_id, project_name in projects:
+            project_data = data.setdefault(project_name, {})
+            rows = self.connection.execute(
+                SELECT_EDITS + " WHERE e.project_id = ? ORDER BY s.id, e.id", (project_id,))
+            for row in rows:
+                project_data.setdefault(row[1], {})[row[11]] = self._to_edit_data(row)
+        return data
+
+    def update_edits(self, project: str, changes: dict) -> int:
+        """
+        Точечно обновляет поля монтажей шотов одной транзакцией и сохраняет базу.
+        Остальные данные проекта, в том числе добавленные с других рабочих станций, не затрагиваются.
+
+        :param changes: {(shot_name, edit_name): {поле: значение}}, поля - ключи EDITABLE_FIELDS.
+        :return: Количество обновленных записей. Записи, удаленные из базы, пропускаются.
         """
-        names = Counter()
-        shots = list(self.data[project].values())
-        for shot_edit in shots:
-            for edit_name, _ in shot_edit.items():
-                names.update([edit_name])
-        return list(names)
+        project_id = self._project_id(project)
+        if project_id is None or not changes:
+            return 0
+
+        self._begin()
+        try:
+            updated = 0
+            for (shot_name, edit_name), fields in changes.items():
+                columns = {EDITABLE_FIELDS[field]: value for field, value in fields.items() if field in EDITABLE_FIELDS}
+                if not columns:
+                    continue
+                if "is_actual" in columns:
+                    is_actual = columns["is_actual"]
+                    if isinstance(is_actual, str):
+                        is_actual = is_actual.lower() == "true"
+                    columns["is_actual"] = int(bool(is_actual))
+
+                updated += self.connection.execute(f"""
+                    UPDATE edits SET {", ".join(f"{column} = ?" for column in columns)}
+                    WHERE edit_name = ? AND shot_id = (SELECT id FROM shots WHERE project_id = ? AND shot_name = ?)
+                """, (*columns.values(), edit_name, project_id, shot_name)).rowcount
+        except Exception:
+            self.rollback()
+            raise
+
+        self.save()
+        return updated
+
+    def load_dict(self, data: dict) -> None:
+        """
+        Заменяет данные проектов из data (формат to_dict) и сохраняет базу.
+        Проекты, которых нет в data, не изменяются.
+        Используется для переноса из JSON: проект удаляется и создается заново,
+        поэтому для правок существующих данных используется update_edits.
+        """
+        self._begin()
+        for project, shots in data.items():
+            self.connection.execute("DELETE FROM projects WHERE name = ?", (project,))
+            self._project_ids.pop(project, None)
+            project_id = self._project_id(project, create=True)
+            for shot_name, edits in (shots or {}).items():
+                db_shot_id = self._shot_id(project_id, shot_name)
+                for edit_name, edit_data in (edits or {}).items():
+                    is_actual = edit_data.get("is_actual")
+                    if isinstance(is_actual, str):
+                        is_actual = is_actual.lower() == "true"
+                    self._upsert_edit(project_id, db_shot_id, edit_name, (
+                        edit_data.get("id"), edit_data.get("src_name"), edit_data.get("track_type"),
+                        edit_data.get("transition"), edit_data.get("src_in"), edit_data.get("src_out"),
+                        edit_data.get("src_out_full"), edit_data.get("rec_in"), edit_data.get("rec_out"),
+                        int(bool(is_actual)), edit_data.get("add_data")))
+        self.save()
+
+    def migrate_json(self, json_path: str) -> None:
+        """
+        Разовый перенос данных из базы в старом JSON формате.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+        data = json.loads(content) if content else {}
+
+        self._begin()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(json_path),))
+        self.load_dict(data)
+        logger.info(f"База монтажей перенесена из {json_path} в {self.data_base}")
 
     def save(self):
         """
-        Сохранить базу данных.
+        Сохранить базу данных: зафиксировать транзакцию и снять блокировку.
         """
-        with open(self.data_base, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)
+        try:
+            if self.connection.in_transaction:
+                self.connection.commit()
+        finally:
+            self.lock.release()
 
-    def backup(self):
+    def rollback(self):
+        """
+        Отменить несохраненные изменения и снять блокировку.
+        """
+        try:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+                # Проекты, созданные в отмененной транзакции, больше не существуют
+                self._project_ids.clear()
+        finally:
+            self.lock.release()
+
+    def backup(self, force: bool=False):
         """
         Бэкап базы данных.
+        Полная копия делается не чаще, чем раз в backup_interval_hours, если не указан force.
         """
-        backup_path = self.data_base.replace('.json', '_backup.json')
-        with open(backup_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)       
+        base_path = Path(self.data_base)
+        backup_path = base_path.with_name(f"{base_path.stem}_backup{base_path.suffix}")
+        interval = DATABASE_SETTINGS.get("backup_interval_hours", 24) * 3600
+        if not force and backup_path.exists() and time.time() - backup_path.stat().st_mtime < interval:
+            return
+
+        tmp_path = backup_path.with_name(f"{backup_path.name}.{os.getpid()}.tmp")
+        backup_connection = sqlite3.connect(tmp_path)
+        try:
+            self.connection.backup(backup_connection)
+        finally:
+            backup_connection.close()
+        os.replace(tmp_path, backup_path)
 
     def _clear(self):
         """
         Очистить базу данных.
         """
-        self.data = {}
-        with open(self.data_base, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False) 
+        self._begin()
+        self.connection.execute("DELETE FROM projects")
+        self._project_ids.clear()
+        self.save()
+
+    def close(self):
+        """
+        Закрыть соединение. Несохраненные изменения отменяются.
+        """
+        self.rollback()
+        self.connection.close()
+
+class SourceRangeIndex:
+    """
+    Интервальный индекс шотов монтажа по имени источника (src_name).
+
+    Для каждого src_name диапазоны (src_in, src_out_full) добавляются по возрастанию начала
+    в персистентное дерево отрезков по концам диапазонов. Узел хранит минимальный порядковый номер
+    шота в монтаже, версия дерева k содержит первые k диапазонов. Поиск первого по порядку
+    пересечения - бинарный поиск версии по началу и спуск по дереву: O(log M) на запрос.
+    """
+    def __init__(self, fps: int, shots: dict):
+        """
+        :param shots: Шоты монтажа {shot_name: shot_data} в формате EditDatabase.
+        """
+        self.shots = list(shots.values())
+        # Шоты с некорректными таймкодами: [(shot_name, ошибка)]
+        self.skipped = []
+        groups = {}
+        for order, shot_data in enumerate(self.shots):
+            try:
+                src_in = timecode_to_frames(fps, shot_data["src_in"])
+                src_out = timecode_to_frames(fps, shot_data["src_out_full"])
+            except Exception as e:
+                self.skipped.append((shot_data.get("shot_name"), str(e)))
+                continue
+            groups.setdefault(shot_data["src_name"], []).append((src_in, src_out, order))
+
+        self._index = {src_name: self._build(items) for src_name, items in groups.items()}
+
+    def _build(self, items: list) -> tuple:
+        """
+        Строит версии дерева для диапазонов одного источника.
+        Узел 0 - пустое дерево, каждая вставка копирует только путь от корня до листа.
+        """
+        items.sort(key=lambda item: item[0])
+        starts = [item[0] for item in items]
+        end_keys = sorted({item[1] for item in items})
+        empty = len(self.shots)
+        left, right, best = [0], [0], [empty]
+        roots = [0]
+        for _, src_out, order in items:
+            pos = bisect.bisect_left(end_keys, src_out)
+            node = roots[-1]
+            current = len(best)
+            roots.append(current)
+            left.append(0)
+            right.append(0)
+            best.append(min(best[node], order))
+            lo, hi = 0, len(end_keys) - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                child = len(best)
+                if pos <= mid:
+                    left[current], right[current] = child, right[node]
+                    node, hi = left[node], mid
+                else:
+                    left[current], right[current] = left[node], child
+                    node, lo = right[node], mid + 1
+                left.append(0)
+                right.append(0)
+                best.append(min(best[node], order))
+                current = child
+
+        return starts, end_keys, roots, left, right, best
+
+    def __contains__(self, src_name: str) -> bool:
+        return src_name in self._index
+
+    def find(self, src_name: str, src_in: int, src_out: int) -> dict | None:
+        """
+        Возвращает шот с тем же источником, диапазон которого пересекается с [src_in, src_out]
+        хотя бы в одном кадре. Из нескольких подходящих - первый по порядку в монтаже.
+        """
+        entry = self._index.get(src_name)
+        if entry is None:
+            return None
+
+        starts, end_keys, roots, left, right, best = entry
+        # Диапазоны с началом не позже src_out и концом не раньше src_in
+        count = bisect.bisect_right(starts, src_out)
+        first_end = bisect.bisect_left(end_keys, src_in)
+        if not count or first_end == len(end_keys):
+            return None
+
+        result = len(self.shots)
+        node = roots[count]
+        lo, hi = 0, len(end_keys) - 1
+        while node:
+            if first_end <= lo:
+                result = min(result, best[node])
+                break
+            mid = (lo + hi) // 2
+            if first_end <= mid:
+                result = min(result, best[right[node]])
+                node, hi = left[node], mid
+            else:
+                node, lo = right[node], mid + 1
+
+        return self.shots[result] if result < len(self.shots) else None
 
 class EDLInit(QObject):
     """
@@ -249,6 +695,7 @@ class EDLInit(QObject):
         """
         Основная логика.
         """
+        db = None
         try:
             db_path = DATA_PATH
 
@@ -256,7 +703,7 @@ class EDLInit(QObject):
             self.error.emit(f"Ошибка получения пути к базе данных: {e}")
         
         try:
-            db = EditDatabase(db_path, self.project)
+            db = EditDatabase(db_path, self.project, JSON_DATA_PATH)
         except Exception as e:
             self.error.emit(f"Ошибка получения объекта базы данных: {e}")
 
@@ -266,29 +713,17 @@ class EDLInit(QObject):
             self.error.emit(f"Ошибка парсинга EDL: {e}")
 
         try:
-            for data in parser_data:
-                match =  re.match(self.settings_config["patterns"]["compare_versions_shot_no_versions_mask"], data.edl_shot_name)
-                if match:
-                    db.add_shot(project=self.project,
-                                shot_name=data.edl_shot_name,
-                                edit_name=data.edl_edit_name,
-                                shot_id=data.edl_record_id,
-                                track_type=data.edl_track_type,
-                                transition=data.edl_transition,
-                                src_in=data.edl_source_in,
-                                src_out=data.edl_source_out,
-                                src_out_full=data.edl_source_out_src,
-                                rec_in=data.edl_record_in,
-                                rec_out=data.edl_record_out,
-                                src_name=data.edl_source_name,
-                                update_status=self.update_status
-                                )
-
-            db.save()
+            db.ingest_edl(parser_data, self.project,
+                          update_status=self.update_status,
+                          shot_mask=self.settings_config["patterns"]["compare_versions_shot_no_versions_mask"])
             db.backup()
             self.finished.emit("Данные успешно добавлены!")
         except Exception as e:
             self.error.emit(f"Ошибка добавления данных в базу: {e}")
+        finally:
+            # Несохраненные изменения отменяются, блокировка базы снимается
+            if db is not None:
+                db.close()
 
 class ShotRestorer(QObject):
     """
@@ -311,27 +746,15 @@ class ShotRestorer(QObject):
         """
         Переводит таймкоды в значения фреймов.
         """
-        return tc(fps, timecode).frames
+        return timecode_to_frames(fps, timecode)
 
     def frame_to_timecode(self, fps: int, frames: int) -> str:
         """
         Переводит фреймы в значения таймкодов.
         """
-        return str(tc(fps, frames=frames))
-
-    def overlap_range(self, fps: int, base_src_in: str, base_src_out: str, targ_src_in: str,
-                       targ_src_out: str) -> bool:
-        """
-        Возвращает True, если два диапазона таймкодов пересекаются хотя бы в одном кадре.
-        """
-        base_in  = self.timecode_to_frame(fps, base_src_in)
-        base_out = self.timecode_to_frame(fps, base_src_out)
-        targ_in  = self.timecode_to_frame(fps, targ_src_in)
-        targ_out = self.timecode_to_frame(fps, targ_src_out)
+        return frames_to_timecode(fps, frames)
 
-        return base_in <= targ_out and targ_in <= base_out
-    
-    def create_and_export_avid_loc(self, shot_info: tuple, output_path: Path, backup_output_path: Path) -> None:
+    def create_and_export_avid_loc(self, shot_info: tuple, loc_output: OutputSink) -> None:
         '''
         Создание и экспорт локатора AVID в аутпут файл.
         '''
@@ -340,12 +763,8 @@ class ShotRestorer(QObject):
             rec_in = self.timecode_to_frame(self.fps, shot_data.edl_record_in)
             rec_out = self.timecode_to_frame(self.fps, shot_data.edl_record_out)
             
-            with open(output_path, "a", encoding='utf8') as o, open(backup_output_path, "a", encoding='utf8') as ob:
-                timecode = int((rec_in + (rec_in + (rec_out - rec_in))) / 2)
-                # Используется спец табуляция для корректного импорта в AVID
-                output_string = f'PGM	{self.frame_to_timecode(self.fps, timecode)}	V3	yellow	{shot_name}\n'
-                o.write(output_string)
-                ob.write(output_string)
+            timecode = int((rec_in + (rec_in + (rec_out - rec_in))) / 2)
+            loc_output.write_locator(self.frame_to_timecode(self.fps, timecode), shot_name)
         except:
             message = f"Не удалось создать маркер для шота {shot_name}"
             logger.debug(message)
@@ -367,8 +786,9 @@ class ShotRestorer(QObject):
         """
         Основная логика.
         """
+        db = None
         try:
-            db = EditDatabase(DATA_PATH, self.project)
+            db = EditDatabase(DATA_PATH, self.project, JSON_DATA_PATH)
 
             if self.logic == "Edit":
                 base_edit = db.get_shots_by_edit(self.project, self.edit_name)
@@ -383,33 +803,33 @@ class ShotRestorer(QObject):
             loc_path = Path(str(self.target_edit).replace(".edl", f"_AVID_LOC_{d.today()}_{rand.randrange(10000, 99999)}.txt"))
             loc_backup_path = get_output_path(self.project, "txt", os.path.basename(self.target_edit).replace(".edl", f"_AVID_LOC"))
             
-            with open(loc_path, "w", encoding='utf8') as _, open(loc_backup_path, "w", encoding='utf8') as _:
-                pass
-            
-            with open(output_path, "w", encoding="utf-8") as o, open(backup_path, "w", encoding="utf-8") as ob:
+            with OutputSink(output_path, backup_path) as o, OutputSink(loc_path, loc_backup_path) as lo:
                 processed_shots_tmp = {}
+                source_index = SourceRangeIndex(self.fps, base_edit)
+                for shot_name, error in source_index.skipped:
+                    message = f"Шот {shot_name} базового монтажа пропущен: некорректный таймкод ({error})"
+                    logger.warning(message)
+                    self.progress.emit(message)
                 for target_edit_data in target_edit:
-                    for _, base_shot_data in base_edit.items():
-
-                        if base_shot_data["src_name"] == target_edit_data.edl_source_name and self.overlap_range(
-                            self.fps,
-                            base_shot_data["src_in"], base_shot_data["src_out_full"],
-                            target_edit_data.edl_source_in, target_edit_data.edl_source_out_src
-                        ):  
-                            self.create_and_export_avid_loc((target_edit_data, base_shot_data["shot_name"]), loc_path, loc_backup_path)
-
-                            str1 = (f"{target_edit_data.edl_record_id} {base_shot_data['shot_name']} "
-                                    f"{target_edit_data.edl_track_type} {target_edit_data.edl_transition} "
-                                    f"{target_edit_data.edl_source_in} {target_edit_data.edl_source_out} "
-                                    f"{target_edit_data.edl_record_in} {target_edit_data.edl_record_out}")
-                            str2 = f'\n* FROM CLIP NAME: {base_shot_data["shot_name"]}\n'
-                            o.write(str1)
-                            ob.write(str1)
-                            o.write(str2)
-                            ob.write(str2)
-
-                            processed_shots_tmp.setdefault(base_shot_data["shot_name"], []).append(target_edit_data)
-                            break
+                    if target_edit_data.edl_source_name not in source_index:
+                        continue
+
+                    base_shot_data = source_index.find(
+                        target_edit_data.edl_source_name,
+                        self.timecode_to_frame(self.fps, target_edit_data.edl_source_in),
+                        self.timecode_to_frame(self.fps, target_edit_data.edl_source_out_src)
+                    )
+                    if base_shot_data is None:
+                        continue
+
+                    self.create_and_export_avid_loc((target_edit_data, base_shot_data["shot_name"]), lo)
+
+                    o.write_edl_event(target_edit_data.edl_record_id, base_shot_data["shot_name"],
+                                      target_edit_data.edl_track_type, target_edit_data.edl_transition,
+                                      target_edit_data.edl_source_in, target_edit_data.edl_source_out,
+                                      target_edit_data.edl_record_in, target_edit_data.edl_record_out)
+
+                    processed_shots_tmp.setdefault(base_shot_data["shot_name"], []).append(target_edit_data)
 
             if processed_shots_tmp:                  
                 self.show_duplicates(processed_shots_tmp)
@@ -426,6 +846,10 @@ class ShotRestorer(QObject):
         except Exception as e:
             self.error.emit(f"Ошибка: {e}")
 
+        finally:
+            if db is not None:
+                db.close()
+
 class EDLComparator(QObject):
     """
     Класс служит для сравнения двух EDL и выдачи результата в виде отчета.
@@ -450,13 +874,13 @@ class EDLComparator(QObject):
         """
         Переводит таймкоды в значения фреймов.
         """
-        return tc(fps, timecode).frames
+        return timecode_to_frames(fps, timecode)
 
     def frame_to_timecode(self, fps: int, frames: int) -> str:
         """
         Переводит фреймы в значения таймкодов.
         """
-        return str(tc(fps, frames=frames))
+        return frames_to_timecode(fps, frames)
     
     def out_hyper(self, file_path: str) -> None:
         """
@@ -487,60 +911,6 @@ class EDLComparator(QObject):
 
         return target_edit
 
-    def overlap_range(self, fps: int, base_src_in: str, base_src_out: str, targ_src_in: str, 
-                      targ_src_out: str, shot_name: str, target_shot_data: str) -> bool:
-        """
-        Сравнивает диапазоны таймкодов.
-        Возвращает bool есть ли пересечение.
-        """
-        base_in = self.timecode_to_frame(fps, base_src_in)
-        base_out = self.timecode_to_frame(fps, base_src_out)
-        targ_in = self.timecode_to_frame(fps, targ_src_in)
-        targ_out = self.timecode_to_frame(fps, targ_src_out)
-
-        overlap_start = max(base_in, targ_in)
-        overlap_end = min(base_out, targ_out)
-
-        if overlap_start <= overlap_end:
-
-            start_diff = targ_in - base_in   # Сдвиг начала
-            end_diff = targ_out - base_out   # Сдвиг конца
-
-            if start_diff == 0 and end_diff == 0:
-                self.reedit_data.setdefault('No changes', []).append(shot_name)
-
-            elif (
-                (start_diff > 0 and end_diff < 0) or
-                (start_diff > 0 and end_diff == 0) or
-                (start_diff == 0 and end_diff < 0)
-                    ):
-                self.reedit_data.setdefault('Less', []).append((shot_name, ~start_diff + 1, end_diff))
-                self.reedit_data_edl.setdefault('Less', []).append(target_shot_data)
-
-            else:
-                self.reedit_data.setdefault('More', []).append((shot_name, ~start_diff + 1, end_diff))
-                self.reedit_data_edl.setdefault('More', []).append(target_shot_data)
-
-            return True
-        return False
-    
-    def is_leave(self) -> None:
-        """
-        Провеяем ушли ли шоты из нового монтажа.
-        """
-        for be_shot in self.base_edit:
-            if be_shot not in self.target_edit.keys():
-                self.reedit_data.setdefault('Leave', []).append(be_shot)
-
-    def is_new(self) -> None:
-        """
-        Проверяем появились ли новые шоты в новом монтаже.
-        """
-        for te_shot in self.target_edit:
-            if te_shot not in self.base_edit.keys():
-                self.reedit_data.setdefault('New', []).append(te_shot)
-                self.reedit_data_edl.setdefault('New', []).append(self.target_edit[te_shot])
-
     def export_to_excel(self) -> None:
         """
         Экспортирует reedit_data в Excel.
@@ -604,19 +974,12 @@ class EDLComparator(QObject):
         except Exception as e:
             raise 
         
-    def create_output_edl(self, shot: dict, output) -> None:
+    def create_output_edl(self, shot: dict, output: OutputSink) -> None:
         """
         Метод формирует аутпут файл в формате, пригодном для отображения оффлайн клипов в Resolve и AVID.
-
-        :param output: Файловый объект.
         """
-        str1 = (f"{shot['id']} {shot['shot_name']} "
-                f"{shot['track_type']} {shot['transition']} "
-                f"{shot['src_in']} {shot['src_out']} "
-                f"{shot['rec_in']} {shot['rec_out']}")
-        str2 = f"\n* FROM CLIP NAME: {shot['shot_name']}\n"
-        output.write(str1)
-        output.write(str2)
+        output.write_edl_event(shot['id'], shot['shot_name'], shot['track_type'], shot['transition'],
+                               shot['src_in'], shot['src_out'], shot['rec_in'], shot['rec_out'])
 
     def sort_output(self, reedit_data: dict) -> None:
         """
@@ -626,45 +989,21 @@ class EDLComparator(QObject):
         for status, data in reedit_data.items():
             output_path = get_output_path(self.project, 'edl', status,
                                           subfolder=folder_name)
-            with open(output_path, 'w', encoding="utf-8") as o:
-                pass
-            for shot_data in data:
-                with open(output_path, 'a', encoding="utf-8") as o:
+            with OutputSink(output_path) as o:
+                for shot_data in data:
                     self.create_output_edl(shot_data, o)
 
             logger.info(f"Сформирован EDL файл: {output_path}")
 
-    def find_cross(self) -> None:
-        """
-        Ищем пересекающиеся номера шотов и сравниваем значения.
-        """
-        for _, base_shot_data in self.base_edit.items():
-            for _, target_shot_data in self.target_edit.items():
-                # Сравниваем по именам шотов
-                if base_shot_data["shot_name"] == target_shot_data["shot_name"]:
-                    # Проверяем на предмет смены дубля
-                    if base_shot_data["src_name"] == target_shot_data["src_name"]:
-                        # Проверяем на предмет пересечения диапазонов
-                        if self.overlap_range(
-                            self.fps,
-                            base_shot_data["src_in"], base_shot_data["src_out_full"],
-                            target_shot_data["src_in"], target_shot_data["src_out_full"],
-                            base_shot_data["shot_name"], target_shot_data
-                        ):
-                            break
-                        else:
-                            self.reedit_data_edl.setdefault('Phase changed', []).append(base_shot_data)
-                    else:
-                        self.reedit_data_edl.setdefault('Take changed', []).append(base_shot_data)
-
     def run(self) -> None:
         """
         Основная логика.
         """
         self.reedit_data = {}
         self.reedit_data_edl = {}
+        db = None
         try:
-            db = EditDatabase(DATA_PATH, self.project)
+            db = EditDatabase(DATA_PATH, self.project, JSON_DATA_PATH)
 
             if self.base_logic == "Edit":
                 self.base_edit = db.get_shots_by_edit(self.project, self.base_edit_name)
@@ -679,11 +1018,7 @@ class EDLComparator(QObject):
             else:
                 self.target_edit = self.convert_parser_to_dict()
 
-            self.find_cross()
-
-            self.is_leave()
-
-            self.is_new()
+            self.reedit_data, self.reedit_data_edl = compare_edits(self.fps, self.base_edit, self.target_edit)
             
             result_path = self.export_to_excel()
 
@@ -703,6 +1038,108 @@ class EDLComparator(QObject):
         except Exception as e:
             self.error.emit(f"Ошибка: {e}")
 
+        finally:
+            if db is not None:
+                db.close()
+
+class EditHistoryReport(QObject):
+    """
+    Класс формирует отчет об изменениях шотов по цепочке последних монтажей проекта.
+    """
+    finished = pyqtSignal(str) 
+    progress = pyqtSignal(str)
+    error = pyqtSignal(str) 
+
+    def __init__(self, fps: int, project: str, last_edits: int):
+        super().__init__()
+        self.fps = fps
+        self.project = project
+        self.last_edits = last_edits
+
+    def out_hyper(self, file_path: str) -> None:
+        """
+        Выводит в GUI ссылку на аутпут документ.
+        """
+        url = Path(file_path).resolve().as_uri()
+        self.progress.emit(f'Посмотреть отчет: <a href="{url}">{url}</a></span>')
+
+    def export_to_excel(self, history: EditHistory) -> str:
+        """
+        Экспортирует матрицу изменений в Excel.
+        Формат: Shot | монтаж 1 | ... | монтаж N | Head | Tail.
+        В ячейке монтажа - изменение шота относительно предыдущего монтажа цепочки.
+        """
+        categories, start, end = history.changes()
+        head, tail = history.handles()
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "edit history"
+        ws.append(["Shot", *history.edit_names, "Head", "Tail"])
+
+        green_fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
+        red_fill   = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+        yellow_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+        fills = {"More": green_fill, "Less": red_fill, "New": green_fill, "Leave": red_fill,
+                 "Take changed": yellow_fill, "Phase changed": yellow_fill}
+
+        for i, shot_name in enumerate(history.shot_names):
+            row = [shot_name]
+            for j in range(len(history.edit_names)):
+                category = categories[i, j]
+                if category in ("More", "Less"):
+                    row.append(f"{category} {start[i, j]:+d}/{end[i, j]:+d}")
+                elif category:
+                    row.append(category)
+                elif history.present[i, j]:
+                    row.append("+")
+                else:
+                    row.append("-")
+            row.extend([int(head[i]), int(tail[i])])
+            ws.append(row)
+
+            for j, category in enumerate(categories[i], start=2):
+                if category in fills:
+                    ws.cell(row=ws.max_row, column=j).fill = fills[category]
+
+        # Автоширина
+        for col in range(1, ws.max_column + 1):
+            letter = get_column_letter(col)
+            max_len = max(len(str(cell.value)) for cell in ws[letter] if cell.value is not None)
+            ws.column_dimensions[letter].width = max_len + 2
+
+        filepath = get_output_path(self.project, "xlsx", "edit_history_report")
+        wb.save(filepath)
+        return filepath
+
+    def run(self) -> None:
+        """
+        Основная логика.
+        """
+        db = None
+        try:
+            db = EditDatabase(DATA_PATH, self.project, JSON_DATA_PATH)
+            edit_names, shots = db.get_shots_history(self.project, self.last_edits)
+            if not edit_names:
+                raise KeyError("В указанном проекте нет монтажей")
+
+            history = EditHistory(self.fps, edit_names, shots)
+            result_path = self.export_to_excel(history)
+            self.out_hyper(result_path)
+
+            logger.info(f"Сформирован отчет: {result_path}")
+            self.finished.emit(f"Обработка успешно завершена!")
+
+        except KeyError as ke:
+            self.error.emit(f"{ke}")
+
+        except Exception as e:
+            self.error.emit(f"Ошибка: {e}")
+
+        finally:
+            if db is not None:
+                db.close()
+
 class PhaseChecker(QObject):
     """
     Класс служит для сравнения двух EDL и выдачи результата в виде отчета.
@@ -723,137 +1160,150 @@ class PhaseChecker(QObject):
         """
         Переводит таймкоды в значения фреймов.
         """
-        return tc(self.fps, timecode).frames
+        return timecode_to_frames(self.fps, timecode)
 
     def frame_to_timecode(self, frames: int) -> str:
         """
         Переводит фреймы в значения таймкодов.
         """
-        return str(tc(self.fps, frames=frames))
+        return frames_to_timecode(self.fps, frames)
     
-    def create_edl(self, data) -> None:
+    def out_hyper(self, file_path: str) -> None:
         """
-        Создание EDL файла.
+        Выводит в GUI ссылку на аутпут документ.
         """
-        for shot in data:
-            id = shot["id"]
-            src_name = shot["src_name"]
-            track_type = shot["track_type"]
-            transition = shot["transition"]
-            src_in = shot["src_in"]
-            src_out = shot["src_out"]
-            rec_in = shot["rec_in"]
-            rec_out = shot["rec_out"]
-
-            with open("result_edl.edl", "a", encoding="utf-8") as o:
-                o.write(f"{id} {src_name} "
-                        f"{track_type} {transition} "
-                        f"{src_in} {src_out} "
-                        f"{rec_in} {rec_out}\n")
+        url = Path(file_path).resolve().as_uri()
+        self.progress.emit(f'Посмотреть EDL: <a href="{url}">{url}</a></span>')
 
-    def get_rec_out(self, src_in: str, src_out: str, rec_in: str) -> str:
+    def create_edl(self, data: list) -> str:
         """
-        Метод вычилсяет rec_out таймкод.
+        Создание EDL файла с полными диапазонами шотов.
+        Файл открывается один раз, события пишутся потоком.
         """
-        src_duration = self.timecode_to_frame(src_out) - self.timecode_to_frame(src_in)
-        rec_out = self.frame_to_timecode(self.timecode_to_frame(rec_in) + src_duration)
-        return rec_out
+        output_path = get_output_path(self.project, "edl", "max_range")
+        with OutputSink(output_path) as o:
+            for shot in data:
+                o.write(f"{shot['id']} {shot['src_name']} "
+                        f"{shot['track_type']} {shot['transition']} "
+                        f"{shot['src_in']} {shot['src_out']} "
+                        f"{shot['rec_in']} {shot['rec_out']}\n")
+        return output_path
 
     def get_max_range(self, filtred_data: dict) -> list:
         """
         Метод ищет самый ранний таймкод source_in и самый поздный таймкод source_out, 
         высчитывает rec_in и rec_out и устанавливает полученные значения в донора.
+
+        Таймкоды всех кандидатов переводятся во фреймы один раз, минимумы и максимумы
+        по шотам считаются через NumPy reduceat по непрерывным группам кандидатов.
         """
-        result = []
-        rec_in_data = []
-        rec_in_default = "01:00:00:00"
+        if not filtred_data:
+            return []
 
-        for shot_name, shot_data in filtred_data.items():
-            # Берём копию донора, чтобы не затирать исходные данные
-            edit_donor = dict(min(shot_data, key=lambda x: self.timecode_to_frame(x["src_in"])))
+        codec = get_codec(self.fps)
+        shot_names = list(filtred_data)
+        candidates = [shot_data for shots_data in filtred_data.values() for shot_data in shots_data]
+        counts = np.fromiter((len(shots_data) for shots_data in filtred_data.values()), dtype=np.int64, count=len(shot_names))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        groups = np.repeat(np.arange(len(shot_names)), counts)
 
-            # Выбираем минимальный src_in и максимальный src_out
-            min_src_in_edit = min(shot_data, key=lambda x: self.timecode_to_frame(x["src_in"]))
-            max_src_out_edit = max(shot_data, key=lambda x: self.timecode_to_frame(x["src_out_full"]))
+        src_in = codec.to_frames_array([x["src_in"] for x in candidates])
+        src_out = codec.to_frames_array([x["src_out_full"] for x in candidates])
 
-            # Вычитаем 1 кадр из src_out для корректного отображения в интерфейсе программы
-            src_out = self.frame_to_timecode(self.timecode_to_frame(max_src_out_edit['src_out_full']) - 1)
-            self.progress.emit(f"Полный диапазон кадров шота {shot_name}: {min_src_in_edit['src_in']} - {src_out}")
+        # Выбираем минимальный src_in и максимальный src_out
+        min_src_in = np.minimum.reduceat(src_in, starts)
+        max_src_out = np.maximum.reduceat(src_out, starts)
 
-            edit_donor["src_in"] = min_src_in_edit["src_in"]
-            edit_donor["src_out_full"] = max_src_out_edit["src_out_full"]
+        # Донор - первый кандидат с минимальным src_in
+        min_idx = np.flatnonzero(src_in == min_src_in[groups])
+        _, first = np.unique(groups[min_idx], return_index=True)
+        donors = min_idx[first]
 
-            # Обновляем rec_in/rec_out
-            if rec_in_data:
-                edit_donor["rec_in"] = rec_in_data[-1]
-            else:
-                edit_donor["rec_in"] = rec_in_default
+        # Шоты выстраиваются встык: rec_in текущего равен rec_out предыдущего
+        rec_in_default = codec.to_frames("01:00:00:00")
+        rec_out = rec_in_default + np.cumsum(max_src_out - min_src_in)
+        rec_in = np.concatenate(([rec_in_default], rec_out[:-1]))
 
-            edit_donor["rec_out"] = self.get_rec_out(
-                edit_donor["src_in"],
-                edit_donor["src_out_full"],
-                edit_donor["rec_in"]
-            )
+        # Вычитаем 1 кадр из src_out для корректного отображения в интерфейсе программы
+        src_out_display = codec.to_timecode_array(max_src_out - 1)
+        timecodes = zip(codec.to_timecode_array(min_src_in), codec.to_timecode_array(max_src_out),
+                        codec.to_timecode_array(rec_in), codec.to_timecode_array(rec_out))
 
-            # Запоминаем конец текущего для следующего шота
-            rec_in_data.append(edit_donor["rec_out"])
+        result = []
+        for i, (shot_name, (src_in_tc, src_out_tc, rec_in_tc, rec_out_tc)) in enumerate(zip(shot_names, timecodes)):
+            self.progress.emit(f"Полный диапазон кадров шота {shot_name}: {src_in_tc} - {src_out_display[i]}")
 
+            # Берём копию донора, чтобы не затирать исходные данные
+            edit_donor = dict(candidates[donors[i]])
+            edit_donor["src_in"] = src_in_tc
+            edit_donor["src_out_full"] = src_out_tc
+            edit_donor["src_out"] = src_out_tc
+            edit_donor["rec_in"] = rec_in_tc
+            edit_donor["rec_out"] = rec_out_tc
             result.append(edit_donor)
 
         return result
 
-    def compare(self, base_data: dict, trg_data: dict) -> None:
-        """
-        Метод сравнивает сорс диапазон шота в базовом монтаже с диапазонами
-        из выбранных для сравнения(trg_data_list) монтажей этого шота.
-        Ищет только те случаи, когда в trg_data_list есть диапазоны шире чем в базовом.
-        """
-        base_src_in = self.timecode_to_frame(base_data["src_in"])
-        base_src_out = self.timecode_to_frame(base_data["src_out_full"])
-        shot_name = base_data["shot_name"]
-
-        warnings = []
-        for trg_data in trg_data:
-            trg_src_in = self.timecode_to_frame(trg_data["src_in"])
-            trg_src_out = self.timecode_to_frame(trg_data["src_out_full"])
-
-            overlap_start = max(base_src_in, trg_src_in)
-            overlap_end = min(base_src_out, trg_src_out)
-
-            if overlap_start <= overlap_end:
-
-                start_diff = trg_src_in - base_src_in   # Сдвиг начала
-                end_diff = trg_src_out - base_src_out   # Сдвиг конца
-
-                if start_diff < 0 or end_diff > 0:
-                    self.filtred_data.setdefault(shot_name, []).append(trg_data)
-                    # Добавляем базовый монтаж в случае срабатывания условия для сравнения
-                    self.filtred_data.setdefault(shot_name, []).append(base_data)
+    def compare(self, base_edit: dict, target_edits: dict) -> dict:
+        """
+        Метод сравнивает сорс диапазоны шотов в базовом монтаже с диапазонами
+        этих шотов в выбранных для сравнения монтажах.
+        Ищет только те случаи, когда в target_edits есть диапазоны шире чем в базовом.
+
+        :return: Словарь {shot_name: [монтажи шире базового..., базовый монтаж]}.
+        Базовый монтаж добавляется после первого найденного более широкого диапазона.
+        """
+        codec = get_codec(self.fps)
+        pairs = [(base_shot_data, trg_data)
+                 for shot_name, base_shot_data in base_edit.items()
+                 for trg_data in target_edits.get(shot_name, ())]
+        if not pairs:
+            return {}
+
+        # Базовый диапазон переводится во фреймы один раз на шот и размножается по его кандидатам
+        shot_names = [shot_name for shot_name in base_edit if shot_name in target_edits]
+        base_shots = [base_edit[shot_name] for shot_name in shot_names]
+        counts = [len(target_edits[shot_name]) for shot_name in shot_names]
+        base_in = np.repeat(codec.to_frames_array([x["src_in"] for x in base_shots]), counts)
+        base_out = np.repeat(codec.to_frames_array([x["src_out_full"] for x in base_shots]), counts)
+        trg_in = codec.to_frames_array([trg["src_in"] for _, trg in pairs])
+        trg_out = codec.to_frames_array([trg["src_out_full"] for _, trg in pairs])
+
+        overlap = np.maximum(base_in, trg_in) <= np.minimum(base_out, trg_out)
+        wider = overlap & ((trg_in < base_in) | (trg_out > base_out))
+
+        filtred_data = {}
+        for idx in np.flatnonzero(wider):
+            base_shot_data, trg_data = pairs[idx]
+            shot_data = filtred_data.get(base_shot_data["shot_name"])
+            if shot_data is None:
+                # Добавляем базовый монтаж в случае срабатывания условия для сравнения
+                filtred_data[base_shot_data["shot_name"]] = [trg_data, base_shot_data]
+            else:
+                shot_data.append(trg_data)
 
-        if warnings:
-            no_dubl = str(*set(warnings))
-            self.progress.emit(no_dubl)
+        return filtred_data
 
     def run(self) -> None:
         """
         Основная логика.
         """
+        db = None
         try:
-            db = EditDatabase(DATA_PATH, self.project)
+            db = EditDatabase(DATA_PATH, self.project, JSON_DATA_PATH)
 
             base_edit = db.get_shots_by_edit(self.project, self.base_edit)
             target_edits = db.get_shots_by_edits(self.project, self.target_edits)
 
-            self.filtred_data = {}
-            for base_shot_name, base_shot_data in base_edit.items():
-                for trg_shot_name, trg_shot_data in target_edits.items():
-                    if base_shot_name == trg_shot_name:
-                        self.compare(base_shot_data, trg_shot_data)
-                            
+            self.filtred_data = self.compare(base_edit, target_edits)
             if self.filtred_data:
                 adjusted_ranges = self.get_max_range(self.filtred_data)
-            
-            #self.create_edl(adjusted_ranges)
+                result_path = self.create_edl(adjusted_ranges)
+                self.out_hyper(result_path)
+                logger.info(f"Сформирован EDL файл: {result_path}")
+            else:
+                self.progress.emit("Шоты с диапазоном шире базового монтажа не найдены")
+
             self.finished.emit(f"Обработка успешно завершена!")
 
         except KeyError as ke:
@@ -862,6 +1312,10 @@ class PhaseChecker(QObject):
         except Exception as e:
             self.error.emit(f"Ошибка: {e}")
 
+        finally:
+            if db is not None:
+                db.close()
+
 class LocsAndOffline(QObject):
 
     finished = pyqtSignal(str) 
@@ -879,13 +1333,13 @@ class LocsAndOffline(QObject):
         """
         Переводит таймкоды в значения фреймов.
         """
-        return tc(fps, timecode).frames
+        return timecode_to_frames(fps, timecode)
 
     def frame_to_timecode(self, fps: int, frames: int) -> str:
         """
         Переводит фреймы в значения таймкодов.
         """
-        return str(tc(fps, frames=frames))
+        return frames_to_timecode(fps, frames)
     
     def out_hyper(self, file_path: str) -> None:
         """
@@ -894,25 +1348,16 @@ class LocsAndOffline(QObject):
         url = Path(file_path).parent.as_uri()
         self.progress.emit(f'Путь к документам: <a href="{url}">{url}</a></span>')
 
-    def create_output_edl(self, shot: dict, output) -> None:
+    def create_output_edl(self, shot: dict, output: OutputSink) -> None:
         """
         Метод формирует аутпут файл в формате, пригодном для отображения оффлайн клипов в Resolve и AVID.
-
-        :param output: Файловый объект.
         """
-        str1 = (f"{shot['id']} {shot['shot_name']} "
-                f"{shot['track_type']} {shot['transition']} "
-                f"{shot['src_in']} {shot['src_out']} "
-                f"{shot['rec_in']} {shot['rec_out']}")
-        str2 = f"\n* FROM CLIP NAME: {shot['shot_name']}\n"
-        output.write(str1)
-        output.write(str2)
+        output.write_edl_event(shot['id'], shot['shot_name'], shot['track_type'], shot['transition'],
+                               shot['src_in'], shot['src_out'], shot['rec_in'], shot['rec_out'])
 
-    def create_locs(self, shot_data: list[dict], loc_output):
+    def create_locs(self, shot_data: list[dict], loc_output: OutputSink):
         '''
         Создание и экспорт локатора AVID в аутпут файл.
-
-        :param loc_output: Файловый объект.
         '''
         try:
             rec_in = shot_data["rec_in"]
@@ -922,9 +1367,7 @@ class LocsAndOffline(QObject):
             rec_out = self.timecode_to_frame(self.fps, rec_out)
 
             center_timecode = int((rec_in + (rec_in + (rec_out - rec_in))) / 2)
-            # Используется спец табуляция для корректного импорта в AVID
-            output_string = f'PGM	{self.frame_to_timecode(self.fps, center_timecode)}	V3	yellow	{shot_name}\n'
-            loc_output.write(output_string)
+            loc_output.write_locator(self.frame_to_timecode(self.fps, center_timecode), shot_name)
 
         except:
             message = f"Не удалось создать маркер для шота {shot_name}"
@@ -933,8 +1376,9 @@ class LocsAndOffline(QObject):
 
     def run(self):
 
+        db = None
         try:
-            db = EditDatabase(DATA_PATH, self.project)
+            db = EditDatabase(DATA_PATH, self.project, JSON_DATA_PATH)
 
             if self.target_logic == "Edit":
                 self.target_edit = db.get_shots_by_edit(self.project, self.target_edit_name)
@@ -945,11 +1389,8 @@ class LocsAndOffline(QObject):
 
             locs_output_path = get_output_path(self.project, 'txt', f"{self.target_edit_name}_AVID_LOCS")
 
-            with open(edl_output_path, 'w', encoding="utf-8") as o, open(locs_output_path, 'w', encoding="utf-8") as lo:
-                pass
-
-            for _, shot_data in self.target_edit.items():
-                with open(edl_output_path, 'a', encoding="utf-8") as o, open(locs_output_path, 'a', encoding="utf-8") as lo:
+            with OutputSink(edl_output_path) as o, OutputSink(locs_output_path) as lo:
+                for _, shot_data in self.target_edit.items():
                     self.create_output_edl(shot_data, o)
                     self.create_locs(shot_data, lo)
 
@@ -963,6 +1404,225 @@ class LocsAndOffline(QObject):
         except Exception as e:
             self.error.emit(f"Ошибка: {e}")
 
+        finally:
+            if db is not None:
+                db.close()
+
+class TreeNode:
+    """
+    Узел дерева View Database. Дочерние узлы создаются только при первом раскрытии.
+    """
+    __slots__ = ("key", "value", "parent", "row", "children")
+
+    def __init__(self, key, value, parent: "TreeNode"=None, row: int=0):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.children = None
+
+    @property
+    def is_container(self) -> bool:
+        return isinstance(self.value, (dict, list))
+
+    @property
+    def label(self) -> str:
+        return f"[{self.key}]" if isinstance(self.parent.value, list) else str(self.key)
+
+    def load_children(self) -> None:
+        items = self.value.items() if isinstance(self.value, dict) else enumerate(self.value)
+        self.children = [TreeNode(key, value, self, row) for row, (key, value) in enumerate(items)]
+
+class DatabaseTreeModel(QAbstractItemModel):
+    """
+    Ленивая модель дерева {проект: {шот: {монтаж: данные}}} для вкладки View Database.
+
+    Модель работает напрямую со словарем данных: строки уровня создаются при раскрытии
+    родителя (canFetchMore/fetchMore), изменения значений сразу записываются в словарь
+    и запоминаются в changes для точечного сохранения через EditDatabase.update_edits.
+    Редактируются только поля EDITABLE_FIELDS записей монтажей.
+    Поиск по шотам идет по суффиксному индексу имен шотов, без обхода модели.
+    """
+    HEADERS = ("Project / Shot / Edit", "Shot data")
+
+    def __init__(self, data: dict, parent=None):
+        super().__init__(parent)
+        self.store = data
+        # Измененные поля: {проект: {(шот, монтаж): {поле: значение}}}
+        self.changes = {}
+        self.root = TreeNode(None, data)
+        self.root.load_children()
+        # Индекс имен шотов: имя шота -> [(проект, шот)]
+        self.shot_index = {}
+        for project, shots in data.items():
+            for shot_name in shots:
+                self.shot_index.setdefault(shot_name, []).append((project, shot_name))
+        # Отсортированные суффиксы имен шотов и номера шотов в shot_index, строятся при первом поиске
+        self._suffixes = None
+        self._suffix_shots = None
+        self._shot_names = None
+
+    def node(self, index: QModelIndex) -> TreeNode:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row: int, column: int, parent: QModelIndex=QModelIndex()) -> QModelIndex:
+        parent_node = self.node(parent)
+        if parent_node.children is None or not 0 <= row < len(parent_node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self.node(parent).children
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent: QModelIndex=QModelIndex()) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent: QModelIndex=QModelIndex()) -> bool:
+        if parent.column() > 0:
+            return False
+        node = self.node(parent)
+        return node.is_container and len(node.value) > 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self.node(parent)
+        return node.is_container and node.children is None
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self.node(parent)
+        if not node.is_container or node.children is not None:
+            return
+        count = len(node.value)
+        if count:
+            self.beginInsertRows(parent, 0, count - 1)
+            node.load_children()
+            self.endInsertRows()
+        else:
+            node.children = []
+
+    def data(self, index: QModelIndex, role: int=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        node = index.internalPointer()
+        if index.column() == 0:
+            return node.label
+        return "" if node.is_container else str(node.value)
+
+    def setData(self, index: QModelIndex, value, role: int=Qt.EditRole) -> bool:
+        if role != Qt.EditRole or index.column() != 1:
+            return False
+        node = index.internalPointer()
+        if not self.is_editable_field(node):
+            return False
+
+        text = str(value)
+        if text.lower() == "false":
+            value = False
+        elif text.lower() == "true":
+            value = True
+        else:
+            value = text
+
+        node.value = value
+        node.parent.value[node.key] = value
+        self.record_change(node)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def node_path(self, node: TreeNode) -> tuple:
+        """
+        Путь ключей от корня до узла.
+        """
+        path = []
+        while node is not self.root:
+            path.append(node.key)
+            node = node.parent
+        return tuple(reversed(path))
+
+    def is_editable_field(self, node: TreeNode) -> bool:
+        """
+        True для полей записи монтажа (проект / шот / монтаж / поле), которые сохраняет update_edits.
+        Имена шотов и монтажей - ключи записей, их изменение не сохраняется.
+        """
+        return not node.is_container and node.key in EDITABLE_FIELDS and len(self.node_path(node)) == 4
+
+    def record_change(self, node: TreeNode) -> None:
+        """
+        Запоминает измененное поле записи монтажа по пути проект / шот / монтаж / поле.
+        """
+        project, shot_name, edit_name, field = self.node_path(node)
+        edit_changes = self.changes.setdefault(project, {}).setdefault((shot_name, edit_name), {})
+        edit_changes[field] = self.store[project][shot_name][edit_name][field]
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 1 and self.is_editable_field(index.internalPointer()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section: int, orientation, role: int=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def build_suffix_index(self) -> None:
+        """
+        Строит суффиксный массив имен шотов: подстрока имени - это начало одного из его суффиксов,
+        поэтому поиск подстроки сводится к бинарному поиску по отсортированным суффиксам.
+        """
+        pairs = sorted((shot_name[start:], number)
+                       for number, shot_name in enumerate(self.shot_index)
+                       for start in range(len(shot_name)))
+        self._suffixes = [suffix for suffix, _ in pairs]
+        self._suffix_shots = [number for _, number in pairs]
+        self._shot_names = list(self.shot_index)
+
+    def find_shots(self, query: str) -> list:
+        """
+        Ищет шоты, в имени которых есть query, бинарным поиском по суффиксному индексу.
+
+        :return: Пути (проект, шот) в порядке шотов в базе.
+        """
+        if not query:
+            return []
+        if self._suffixes is None:
+            self.build_suffix_index()
+
+        numbers = set()
+        position = bisect.bisect_left(self._suffixes, query)
+        while position < len(self._suffixes) and self._suffixes[position].startswith(query):
+            numbers.add(self._suffix_shots[position])
+            position += 1
+
+        return [path for number in sorted(numbers) for path in self.shot_index[self._shot_names[number]]]
+
+    def index_for_path(self, path: tuple) -> QModelIndex:
+        """
+        Возвращает индекс узла по пути ключей, подгружая строки промежуточных уровней.
+        """
+        index = QModelIndex()
+        for key in path:
+            if self.canFetchMore(index):
+                self.fetchMore(index)
+            node = self.node(index)
+            row = next((child.row for child in node.children if child.key == key), None)
+            if row is None:
+                return QModelIndex()
+            index = self.index(row, 0, index)
+        return index
+
 class EDLGui(QWidget):
 
     def __init__(self):
@@ -1215,6 +1875,18 @@ class EDLGui(QWidget):
         self.compare_start_btn.clicked.connect(self.start_comparison)
         layout.addWidget(self.compare_start_btn)
 
+        # Edit history
+        history_layout = QHBoxLayout()
+        history_layout.addWidget(QLabel("History of last edits:"))
+        self.history_edits_spin = QSpinBox()
+        self.history_edits_spin.setRange(2, 999)
+        self.history_edits_spin.setValue(20)
+        history_layout.addWidget(self.history_edits_spin)
+        self.history_start_btn = QPushButton("History Report")
+        self.history_start_btn.clicked.connect(self.start_history_report)
+        history_layout.addWidget(self.history_start_btn, 1)
+        layout.addLayout(history_layout)
+
         # Log
         self.log = QTextBrowser()
         self.log.setPlaceholderText("Compare report")
@@ -1445,6 +2117,13 @@ class EDLGui(QWidget):
 
         self.search_input.returnPressed.connect(self.search_shots)
 
+        # Во вкладке загружаются данные только выбранного проекта
+        self.view_project_cb = QComboBox()
+        self.view_project_cb.setFixedWidth(300)
+        self.view_project_cb.addItems(self.get_project())
+        self.view_project_cb.currentTextChanged.connect(lambda _: self.load_json_from_path(DATA_PATH))
+
+        search_layout.addWidget(self.view_project_cb)
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(self.btn_prev)
         search_layout.addWidget(self.btn_next)
@@ -1464,9 +2143,6 @@ class EDLGui(QWidget):
 
         self.data = None
 
-        if not os.path.exists(DATA_PATH):
-            return tab
-
         self.load_json_from_path(DATA_PATH)
 
         return tab
@@ -1503,92 +2179,54 @@ class EDLGui(QWidget):
 
     def load_json_from_path(self, database_path):
         """
-        Загружает датабазу во вкладке View Database.
+        Загружает во вкладке View Database данные проекта, выбранного в view_project_cb.
         """
         self.database_path = database_path
+        project = self.view_project_cb.currentText()
 
-        with open(database_path, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                self.data = {} 
-            else:
-                self.data = json.loads(content)
+        if not project or project == "Select Project":
+            self.data = {}
+        else:
+            db = EditDatabase(database_path, project, JSON_DATA_PATH)
+            try:
+                self.data = db.to_dict(project)
+            finally:
+                db.close()
                 
-        self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(["Project / Shot / Edit", "Shot data"])
-
-        self.build_tree(self.model.invisibleRootItem(), self.data)
-
+        self.model = DatabaseTreeModel(self.data)
         self.tree.setModel(self.model)
         self.set_row_height(30)
         self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.tree.setModel(self.model)
         self.tree_model = self.model 
 
-    def build_tree(self, parent, data):
-        """
-        Метод строит таблицу дерева датабазы во вкладке View Database.
-        """
-        if isinstance(data, dict):
-            for key, value in data.items():
-                key_item = QStandardItem(str(key))
-                key_item.setEditable(False)
-                if isinstance(value, (dict, list)):
-                    value_item = QStandardItem("")
-                    self.build_tree(key_item, value)
-                else:
-                    value_item = QStandardItem(str(value))
-                    value_item.setEditable(True)
-                parent.appendRow([key_item, value_item])
-
-        elif isinstance(data, list):
-            for index, value in enumerate(data):
-                key_item = QStandardItem(f"[{index}]")
-                key_item.setEditable(False)
-                if isinstance(value, (dict, list)):
-                    value_item = QStandardItem("")
-                    self.build_tree(key_item, value)
-                else:
-                    value_item = QStandardItem(str(value))
-                    value_item.setEditable(True)
-                parent.appendRow([key_item, value_item])
+        self.found_indexes = []
+        self.btn_prev.setEnabled(False)
+        self.btn_next.setEnabled(False)
 
     def save_json(self):
         """
         Сохраняет изменения во вкладке View Database.
         """
         try:
-            def read_tree(item):
-                data = {}
-                for row in range(item.rowCount()):
-                    key = item.child(row, 0).text()
-                    val_item = item.child(row, 1)
-
-                    if item.child(row, 0).hasChildren():
-                        data[key] = read_tree(item.child(row, 0))
-                    else:
-                        text = val_item.text()
-                        if text.lower() == "false":
-                            data[key] = False
-                        elif text.lower() == "true":
-                            data[key] = True
-                        else:
-                            data[key] = text
-
-                return data
-
-            root = self.model.invisibleRootItem()
-            new_data = read_tree(root)
-
-            with open(self.database_path, "w", encoding="utf-8") as f:
-                json.dump(new_data, f, ensure_ascii=False, indent=4)
-
-            self.on_finished(f"Изменения успешно сохранены: {self.database_path}")
+            # В базу пишутся только поля, измененные в модели
+            changes = self.model.changes
+            requested = sum(len(edits) for edits in changes.values())
+            updated = 0
+            db = EditDatabase(self.database_path)
+            try:
+                for project, edits in changes.items():
+                    updated += db.update_edits(project, edits)
+            finally:
+                db.close()
+            changes.clear()
+
+            if updated < requested:
+                self.on_error(f"Сохранено записей: {updated} из {requested}. "
+                              f"Остальные записи удалены из базы, обновите вкладку")
+            else:
+                self.on_finished(f"Изменения успешно сохранены: {self.database_path}")
             self.btn_save.setEnabled(True)
         except:
-            with open(self.database_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=4)
-
             self.on_error(f"Не удалось сохранить изменения")
             self.btn_save.setEnabled(True)
 
@@ -1597,19 +2235,7 @@ class EDLGui(QWidget):
         if not query:
             return
 
-        self.found_indexes = []
-        root = self.tree_model.invisibleRootItem()
-
-        def recursive_search(item):
-            for row in range(item.rowCount()):
-                child = item.child(row, 0)
-                if query in child.text():
-                    self.found_indexes.append(self.tree_model.indexFromItem(child))
-
-                if child.hasChildren():
-                    recursive_search(child)
-
-        recursive_search(root)
+        self.found_indexes = self.tree_model.find_shots(query)
 
         if not self.found_indexes:
             self.on_error(f"Шотов с номером '{query}' не найдено")
@@ -1626,7 +2252,8 @@ class EDLGui(QWidget):
         if not self.found_indexes:
             return
 
-        index = self.found_indexes[index_pos]
+        # Строки подгружаются только по пути к найденному шоту
+        index = self.tree_model.index_for_path(self.found_indexes[index_pos])
 
         # Развернуть родителей
         parent = index.parent()
@@ -1704,9 +2331,11 @@ class EDLGui(QWidget):
                 edit_cb.addItem("Select Edit")
                 return
 
-            db = EditDatabase(DATA_PATH, project_name)
-
-            edits_list = db.get_edits(project_name) or []
+            db = EditDatabase(DATA_PATH, project_name, JSON_DATA_PATH)
+            try:
+                edits_list = db.get_edits(project_name) or []
+            finally:
+                db.close()
             edits_list.insert(0, "Select Edit")
 
             edit_cb.clear()
@@ -1952,6 +2581,42 @@ class EDLGui(QWidget):
 
         self.thread.start()
 
+    def start_history_report(self):
+        """
+        Запуск отчета по истории монтажей проекта.
+        """
+        project = self.compare_project_cb.currentText().strip()
+        try:
+            fps = int(self.fps_input.text())
+            if fps <= 0:
+                raise ValueError("FPS должно быть больше 0")
+        except ValueError:
+            self.on_error("FPS должно быть целым числом больше 0")
+            return
+
+        if project == "Select Project":
+            self.on_error("Укажите проект")
+            return
+
+        self.thread = QThread()
+        self.worker = EditHistoryReport(fps, project, self.history_edits_spin.value())
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.history_start_btn.setEnabled(False)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.progress.connect(self.log.append)
+
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.thread.finished.connect(lambda: self.history_start_btn.setEnabled(True))
+        self.worker.error.connect(lambda: self.history_start_btn.setEnabled(True))
+        self.worker.error.connect(lambda: self.thread.quit())
+
+        self.thread.start()
+
     def locs_validate_inputs(self):
         """
         Валидация пользовательских данных из таба Locs&OfflineEDL.
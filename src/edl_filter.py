@@ -12,6 +12,7 @@ from config.global_config import GLOBAL_CONFIG
 from dvr_tools.css_style import apply_style
 from dvr_tools.logger_config import get_logger
 from common_tools.edl_parsers import detect_edl_parser, EDLParser
+from common_tools.output_sink import OutputSink
 
 logger = get_logger(__file__)
 
@@ -34,19 +35,12 @@ def get_output_path(project: str, ext: str, report_name: str) -> str:
     return output_path
 
 
-def create_output_edl(shot: EDLParser, output) -> None:
+def create_output_edl(shot: EDLParser, output: OutputSink) -> None:
     """
     Метод формирует аутпут файл в формате, пригодном для отображения оффлайн клипов в Resolve и AVID.
-
-    :param output: Файловый объект.
     """
-    str1 = (f"{shot.edl_record_id} {shot.edl_shot_name} "
-            f"{shot.edl_track_type} {shot.edl_transition} "
-            f"{shot.edl_source_in} {shot.edl_source_out} "
-            f"{shot.edl_record_in} {shot.edl_record_out}")
-    str2 = f'\n* FROM CLIP NAME: {shot.edl_shot_name}\n'
-    output.write(str1)
-    output.write(str2)
+    output.write_edl_event(shot.edl_record_id, shot.edl_shot_name, shot.edl_track_type, shot.edl_transition,
+                           shot.edl_source_in, shot.edl_source_out, shot.edl_record_in, shot.edl_record_out)
 
 def filter_edl(self, edl_path: str, input_shots: list[str], fps: int, project: str) -> str:
     """
@@ -55,9 +49,9 @@ def filter_edl(self, edl_path: str, input_shots: list[str], fps: int, project: s
     try:
         edl_parser = detect_edl_parser(fps, edl_path=edl_path)
 
-        edl_shot_names = Counter([i.edl_shot_name for i in edl_parser]) # Словарь имен шотов из EDL
+        edl_shot_data = list(edl_parser) # Объекты EDL парсера в списке
 
-        edl_shot_data = [i for i in edl_parser] # Объекты EDL парсера в списке
+        edl_shot_names = Counter([i.edl_shot_name for i in edl_shot_data]) # Словарь имен шотов из EDL
 
         input_shots_data = Counter(input_shots) # Словарь имен шотов из инпута
 
@@ -68,14 +62,10 @@ def filter_edl(self, edl_path: str, input_shots: list[str], fps: int, project: s
         backup_path = get_output_path(project, "edl", f"{file_name}")
 
         # Поиск шота из EDL в списке input_shots
-        with open(output_path, "w", encoding="utf-8") as o, open(backup_path, "w", encoding="utf-8") as ob:
-            pass
-
-        for shot_data in edl_shot_data:
-            with open(output_path, "a", encoding="utf-8") as o, open(backup_path, "a", encoding="utf-8") as ob:
+        with OutputSink(output_path, backup_path) as o:
+            for shot_data in edl_shot_data:
                 if shot_data.edl_shot_name in input_shots_data: 
                     create_output_edl(shot_data, o)
-                    create_output_edl(shot_data, ob)
 
         logger.info(f"Сохранены EDL файлы: \n{output_path}\n{backup_path}")
 
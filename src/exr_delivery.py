@@ -57,7 +57,6 @@ class NameSetter:
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
@@ -232,7 +231,6 @@ class DeliveryPipline:
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
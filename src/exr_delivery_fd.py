@@ -42,7 +42,6 @@ class NameSetter:
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
@@ -125,7 +124,6 @@ class EffectsAppender:
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
@@ -287,7 +285,6 @@ class DeliveryPipline:
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
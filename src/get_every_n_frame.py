@@ -1,73 +1,80 @@
 import sys
 import os
-import shutil
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QLabel, QLineEdit, QPushButton,
+    QApplication, QWidget, QLabel, QLineEdit, QPushButton, QCheckBox,
     QVBoxLayout, QHBoxLayout, QFileDialog, QMessageBox, QProgressBar
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from dvr_tools.logger_config import get_logger
 from dvr_tools.css_style import apply_style
+from common_tools.file_copy import copy_files, CopyError
+from config.global_config import GLOBAL_CONFIG
 
 logger = get_logger(__file__)
 
+COPY_SETTINGS = GLOBAL_CONFIG["scripts_settings"]["get_every_n_frame"]
+EXTENSIONS = ('.dng', '.exr', '.jpg')
+
 class CopyWorker(QThread):
     progress_changed = pyqtSignal(int)
     copy_finished = pyqtSignal()
     error_occured = pyqtSignal(str)
 
-    def __init__(self, current_path, target_path, step):
+    def __init__(self, current_path, target_path, step, resume=False, workers=8):
         super().__init__()
-        self.current_path = current_path
+        self.current_path = os.path.normpath(current_path)
         self.target_path = target_path
         self.step = step
+        self.resume = resume
+        self.workers = workers
+        self._percent = -1
+
+    def list_frames(self, path: str) -> list[str]:
+        with os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries
+                          if entry.name.lower().endswith(EXTENSIONS) and entry.is_file())
+
+    def collect_tasks(self) -> list[tuple[str, str]]:
+        """
+        Собирает пары (источник, назначение) для каждого step-го кадра.
+        Если в исходной папке есть подпапки - берутся кадры каждой подпапки,
+        иначе кадры самой папки. Каждая папка сканируется один раз.
+        """
+        with os.scandir(self.current_path) as entries:
+            subfolders = sorted(entry.name for entry in entries if entry.is_dir())
+
+        if subfolders:
+            folders = [(os.path.join(self.current_path, name), os.path.join(self.target_path, name))
+                       for name in subfolders]
+        else:
+            folders = [(self.current_path, os.path.join(self.target_path, os.path.basename(self.current_path)))]
+
+        tasks = []
+        for src_folder, dst_folder in folders:
+            frames = self.list_frames(src_folder)
+            tasks.extend((os.path.join(src_folder, name), os.path.join(dst_folder, name))
+                         for name in frames[::self.step])
+        return tasks
+
+    def on_progress(self, done: int, total: int) -> None:
+        percent = int((done / total) * 100)
+        if percent != self._percent:
+            self._percent = percent
+            self.progress_changed.emit(percent)
 
     def run(self):
-        all_tasks = []
-        exctentions = ('.dng', '.exr', '.jpg')
         try:
-            for tmp_path in os.listdir(self.current_path):
-                path = os.path.join(self.current_path, tmp_path)
-                if len([i[0] for i in os.walk(self.current_path)]) > 1:
-                    if os.path.isdir(path):
-                        files = [file for file in os.listdir(path) if file.lower().endswith(exctentions)]
-                        all_tasks.append((path, os.path.basename(path), files, True))
-                else:
-                    files = [file for file in os.listdir(self.current_path) if file.lower().endswith(exctentions)]
-                    all_tasks.append((self.current_path, os.path.basename(self.current_path), files, False))
-                    break
-
-            total_files = sum(len(files) // self.step + (1 if len(files) % self.step else 0) for _, _, files, _ in all_tasks)
-            copied = 0
-
-            for base_path, file_name, files, recurse in all_tasks:
-                for i in range(0, len(files), self.step):
-                    file = os.path.basename(files[i])
-                    if recurse:
-                        old_path = os.path.join(self.current_path, file_name, file)
-                        new_path = os.path.join(self.target_path, file_name, file)
-                    else:
-                        old_path = os.path.join(self.current_path, file)
-                        new_path = os.path.join(self.target_path, os.path.basename(self.current_path), file)
-
-                    try:
-                        shutil.copy(old_path, new_path)
-                    except Exception as e:
-                        try:
-                            seq_folder = os.path.dirname(new_path)
-                            os.makedirs(seq_folder, exist_ok=True)
-                            shutil.copy(old_path, new_path)
-                        except Exception as final_error:
-                            self.error_occured.emit(f"Ошибка копирования:\n{old_path} → {new_path}\n\n{final_error}")
-                            logger.exception(f"Ошибка копирования: {final_error}")
-                            return  # Останавливаем поток при ошибке
-
-                    copied += 1
-                    percent = int((copied / total_files) * 100)
-                    self.progress_changed.emit(percent)
+            tasks = self.collect_tasks()
+            copied, skipped = copy_files(tasks, self.workers, self.resume, self.on_progress,
+                                         checksum=COPY_SETTINGS["checksum"], verify=COPY_SETTINGS["verify"])
+            logger.info(f"Скопировано файлов: {copied}, пропущено (уже скопированы): {skipped}")
 
             self.copy_finished.emit()  # Только если всё прошло без ошибок
 
+        except CopyError as e:
+            self.error_occured.emit(f"Ошибка копирования:\n{e.src} → {e.dst}\n\n{e.error}")
+            logger.exception(f"Ошибка копирования: {e}")
+
         except Exception as inner_e:
             self.error_occured.emit(f"Глобальная ошибка копирования: {inner_e}")
             logger.exception(f"Глобальная ошибка копирования: {inner_e}")
@@ -113,6 +120,10 @@ class CopyApp(QWidget):
         self.step_editline = QLabel("Step:")
         step_layout.addWidget(self.step_editline)
         step_layout.addWidget(self.step_input)
+        step_layout.addSpacing(20)
+        self.resume_cb = QCheckBox("Skip copied files")
+        self.resume_cb.setChecked(COPY_SETTINGS["resume"])
+        step_layout.addWidget(self.resume_cb)
         step_layout.addStretch()
 
         self.progress_bar = QProgressBar()
@@ -162,7 +173,7 @@ class CopyApp(QWidget):
             return
 
         logger.debug("\n".join(("SetUp:", f"Current Path: {current}", f"Target Folder: {target}", f"Step: {step}")))
-        self.worker = CopyWorker(current, target, step)
+        self.worker = CopyWorker(current, target, step, self.resume_cb.isChecked(), COPY_SETTINGS["copy_workers"])
         self.worker.progress_changed.connect(self.progress_bar.setValue)
         self.worker.copy_finished.connect(self.on_copy_finished)
         self.worker.error_occured.connect(self.on_copy_error)
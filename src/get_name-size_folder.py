@@ -1,16 +1,155 @@
 import os
+import sys
+import csv
+import json
+import glob
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from common_tools.frame_sequence import FrameSequence
 
-def get_clip_info(target_path):
-    for clip in os.listdir(target_path):
-        clip_path = os.path.join(target_path, clip)
-        if os.path.isdir(clip_path):
-            total_file_size = 0
-            for seq_frame_path in os.listdir(clip_path):
-                total_file_size += os.path.getsize(os.path.join(clip_path, seq_frame_path))
-            print(os.path.basename(seq_frame_path), total_file_size)
-        if os.path.isfile(clip_path):
-            print(os.path.basename(clip_path), os.path.getsize(clip_path))
+# Расширения кадров секвенций. Остальные файлы (mov, mxf и т.д.) учитываются поштучно
+FRAME_EXTENSIONS = (".exr", ".dpx", ".tif", ".tiff", ".jpg", ".jpeg", ".png", ".ari", ".r3d", ".dng", ".cin")
+# Количество потоков обхода. На сетевом диске основное время - ожидание ответа сервера
+WORKERS = 16
+CSV_FIELDS = ["shot", "folder", "sequence", "frames", "bytes", "first", "last", "missing", "gaps"]
+
+def scan_entries(path: str, extensions: tuple) -> tuple[list[dict], list[str]]:
+    """
+    Один проход os.scandir по папке. Размеры берутся из DirEntry.stat(),
+    который на Windows не делает отдельного запроса к файлу.
+
+    :return: Кортеж (записи секвенций и отдельных файлов папки, подпапки).
+    """
+    names, sizes, files, subfolders = [], [], [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+            elif entry.is_file():
+                if entry.name.lower().endswith(extensions):
+                    names.append(entry.name)
+                    sizes.append(entry.stat().st_size)
+                else:
+                    files.append((entry.name, entry.stat().st_size))
+
+    items = [sequence_info(sequence) for sequence in FrameSequence.from_names(path, names, sizes)]
+    grouped = {name for sequence in items for name in sequence.pop("names")}
+    # Кадры без номера в имени учитываются как отдельные файлы
+    files.extend((name, size) for name, size in zip(names, sizes) if name not in grouped)
+    items.extend({"sequence": name, "frames": 1, "bytes": size, "first": None, "last": None,
+                  "missing": 0, "gaps": []} for name, size in sorted(files))
+    return items, subfolders
+
+def sequence_info(sequence: FrameSequence) -> dict:
+    gaps = sequence.gap_ranges()
+    return {
+        "sequence": sequence.pattern,
+        "frames": len(sequence),
+        "bytes": int(sequence.sizes.sum()),
+        "first": sequence.first,
+        "last": sequence.last,
+        "missing": sum(end - start + 1 for start, end in gaps),
+        "gaps": gaps,
+        "names": sequence.names,
+    }
+
+def crawl(roots: list[str], extensions: tuple=FRAME_EXTENSIONS, workers: int=WORKERS) -> tuple[dict, list[str]]:
+    """
+    Параллельный обход деревьев папок: каждая папка сканируется отдельной задачей пула,
+    подпапки ставятся в пул сразу по завершении сканирования родителя.
+
+    :return: Кортеж (инвентарь, ошибки чтения). Инвентарь - {папка: записи},
+    где папка - путь относительно общего родителя корней в формате posix.
+    """
+    roots = [os.path.normpath(root) for root in roots]
+    base = os.path.dirname(os.path.commonpath(roots))
+    inventory = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = {executor.submit(scan_entries, root, extensions): root for root in roots}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = pending.pop(future)
+                try:
+                    items, subfolders = future.result()
+                except OSError as e:
+                    errors.append(f"{folder}: {e}")
+                    continue
+                if items:
+                    inventory[os.path.relpath(folder, base).replace(os.sep, "/")] = items
+                for subfolder in subfolders:
+                    pending[executor.submit(scan_entries, subfolder, extensions)] = subfolder
+
+    return dict(sorted(inventory.items())), errors
+
+def format_gaps(gaps) -> str:
+    """
+    Пропуски в виде 1005-1007,1010.
+    """
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in gaps)
+
+def write_json(output, inventory: dict) -> None:
+    """
+    JSON с итогами по шотам: {папка: {"frames", "bytes", "sequences": [...]}}.
+    """
+    data = {folder: {"shot": folder.rsplit("/", 1)[-1],
+                     "frames": sum(item["frames"] for item in items),
+                     "bytes": sum(item["bytes"] for item in items),
+                     "sequences": items}
+            for folder, items in inventory.items()}
+    json.dump(data, output, ensure_ascii=False, indent=2)
+
+def write_csv(output, inventory: dict) -> None:
+    """
+    CSV с одной строкой на секвенцию или отдельный файл.
+    """
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for folder, items in inventory.items():
+        for item in items:
+            writer.writerow({**item, "shot": folder.rsplit("/", 1)[-1], "folder": folder,
+                             "gaps": format_gaps(item["gaps"])})
+
+def get_clip_info(roots: list[str], output_path: str | None=None, output_format: str | None=None,
+                  workers: int=WORKERS) -> int:
+    """
+    Инвентарь секвенций: количество кадров, размер, первый/последний кадр и пропуски.
+    Пишет отчет в output_path (формат по расширению .json/.csv) или в stdout.
+
+    :return: Код выхода: 0 - успех, 1 - часть папок не прочитана, 2 - нет ни одного корня.
+    """
+    started = time.perf_counter()
+    # Маски вида R:/CC_*/TRIM раскрываются здесь, так как cmd.exe их не раскрывает
+    paths = sorted({path for root in roots for path in (glob.glob(root) or [root]) if os.path.isdir(path)})
+    if not paths:
+        print(f"Папки не найдены: {', '.join(roots)}", file=sys.stderr)
+        return 2
+
+    inventory, errors = crawl(paths, workers=workers)
+    for error in errors:
+        print(f"Не удалось прочитать {error}", file=sys.stderr)
+
+    output_format = output_format or ("json" if output_path and output_path.lower().endswith(".json") else "csv")
+    writer = write_json if output_format == "json" else write_csv
+    if output_path:
+        with open(output_path, "w", encoding="utf-8", newline="") as output:
+            writer(output, inventory)
+    else:
+        writer(sys.stdout, inventory)
+
+    frames = sum(item["frames"] for items in inventory.values() for item in items)
+    total = sum(item["bytes"] for items in inventory.values() for item in items)
+    print(f"{len(inventory)} папок, {frames} файлов, {total / 1024 ** 3:.2f} GiB "
+          f"за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+    return 1 if errors else 0
 
 if __name__ == "__main__":
-    target_path = r"R:\CC_PROROK\TRIM\REEL_08_20240828"
-    get_clip_info(target_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Frame sequence inventory: frames, size and gaps per shot folder")
+    parser.add_argument("roots", nargs="+", help=r"root folders or masks, e.g. R:\CC_*\TRIM")
+    parser.add_argument("-o", "--output", default=None, help="report path (.json or .csv), stdout if omitted")
+    parser.add_argument("--format", choices=("csv", "json"), default=None, help="report format (default by extension)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="scan threads")
+    args = parser.parse_args()
+    sys.exit(get_clip_info(args.roots, args.output, args.format, args.workers))
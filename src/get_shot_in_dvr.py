@@ -1,7 +1,6 @@
 import DaVinciResolveScript as dvr
 import os
 import re
-import shutil
 from pathlib import Path
 from datetime import datetime
 from PyQt5.QtWidgets import (
@@ -11,11 +10,15 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from dvr_tools.logger_config import get_logger
 from dvr_tools.css_style import apply_style
+from common_tools.file_copy import iter_copy
 from config.global_config import GLOBAL_CONFIG
 
 logger = get_logger(__file__)
 
 EXTENTIONS = GLOBAL_CONFIG["scripts_settings"]["get_shot"]["extentions"]
+COPY_WORKERS = GLOBAL_CONFIG["scripts_settings"]["get_shot"]["copy_workers"]
+COPY_CHECKSUM = GLOBAL_CONFIG["scripts_settings"]["get_shot"]["checksum"]
+COPY_VERIFY = GLOBAL_CONFIG["scripts_settings"]["get_shot"]["verify"]
 
 class WorkerThread(QThread):
     finished_signal = pyqtSignal()
@@ -30,10 +33,7 @@ class WorkerThread(QThread):
 
     def run(self):
         try:
-            for shot_path in self.shot_paths:
-                shot_name = os.path.basename(shot_path)
-                self.shot_signal.emit(shot_name)
-                self.parent.process_shot(shot_path, self.progress_signal)
+            self.parent.ingest_shots(self.shot_paths, self.progress_signal, self.shot_signal)
             self.finished_signal.emit()
         except Exception as e:
             self.error_signal.emit(str(e))
@@ -179,7 +179,6 @@ class GetShotDvr(QWidget):
 
     def update_shot_label(self, name):
         self.current_shot_label.setText(f"Downloading: {name}")
-        self.progress_bar.setValue(0)
 
     def on_task_completed(self):
         self.show_message('Успех', 'Все файлы скопированы')
@@ -191,11 +190,61 @@ class GetShotDvr(QWidget):
         logger.exception(f'Ошибка обработки: {message}')
         self.toggle_button(False)
 
-    def process_shot(self, shot_path, progress_signal):
-        shot_path = self.cross_platform_name(shot_path)
-        shot_name = os.path.basename(shot_path)
+    def ingest_shots(self, shot_paths, progress_signal, shot_signal):
+        """
+        Конвейерная загрузка шотов: кадры всех шотов копируются общим пулом потоков,
+        а каждый шот импортируется в Resolve сразу после копирования его последнего кадра,
+        пока следующие шоты еще копируются. Импорт идет в порядке списка шотов.
+        """
+        destination_dir = self.get_destination_dir()
+
+        shots = []
+        tasks = []
+        task_shots = []
+        remaining = []
+        destinations = set()
+        for shot_path in shot_paths:
+            shot_path = self.cross_platform_name(shot_path)
+            shot_tasks = self.get_copy_tasks(shot_path, destination_dir)
+            # Каждое назначение копируется одной задачей: повторный шот в списке или одноименные
+            # кадры в подпапках не должны писать один файл из двух потоков
+            new_tasks = []
+            for task in shot_tasks:
+                if task[1] not in destinations:
+                    destinations.add(task[1])
+                    new_tasks.append(task)
+            task_shots.extend([len(shots)] * len(new_tasks))
+            tasks.extend(new_tasks)
+            remaining.append(len(new_tasks))
+            shots.append((shot_path, list(dict.fromkeys(target_file for _, target_file in shot_tasks))))
+
+        next_shot = 0
+
+        def import_ready_shots():
+            nonlocal next_shot
+            while next_shot < len(shots) and remaining[next_shot] == 0:
+                self.process_shot(*shots[next_shot])
+                next_shot += 1
+                if next_shot < len(shots):
+                    shot_signal.emit(os.path.basename(shots[next_shot][0]))
+
+        if shots:
+            shot_signal.emit(os.path.basename(shots[0][0]))
+        import_ready_shots()
+        percent = 0
+        # Запас очереди пула, чтобы копирование продолжалось во время импорта шота в Resolve
+        copied_frames = iter_copy(tasks, COPY_WORKERS, resume=True, metadata=True, max_pending=COPY_WORKERS * 4,
+                                  checksum=COPY_CHECKSUM, verify=COPY_VERIFY)
+        for done, (index, _) in enumerate(copied_frames, start=1):
+            remaining[task_shots[index]] -= 1
+            if int(done / len(tasks) * 100) != percent:
+                percent = int(done / len(tasks) * 100)
+                progress_signal.emit(percent)
+            if remaining[task_shots[index]] == 0:
+                import_ready_shots()
 
-        frames_list = self.copy_sequence_files(shot_path, progress_signal)
+    def process_shot(self, shot_path, frames_list):
+        shot_name = os.path.basename(shot_path)
 
         if self.resolve_add.isChecked():
             if frames_list:
@@ -240,40 +289,26 @@ class GetShotDvr(QWidget):
             logger.exception('Не удалось добавить клип на таймлайн')
             self.show_message('Ошибка', f'Не удалось добавить клип на таймлайн: {e}', True)
 
-    def copy_sequence_files(self, seq_path, progress_signal):
-        target_list = []
-        try:
-            current_date = datetime.now().strftime('%Y%m%d')
-            destination_dir = os.path.join(self.cross_platform_name(f'R:/{self.selected_project.currentText()}/VFX'), current_date)
-            os.makedirs(destination_dir, exist_ok=True)
-
-            shot_name = os.path.basename(seq_path)
-            shot_target_dir = os.path.join(destination_dir, shot_name)
-            os.makedirs(shot_target_dir, exist_ok=True)
-
-            all_files = []
-            for root, _, files in os.walk(seq_path):
-                for file in files:
-                    if file.lower().endswith(EXTENTIONS):
-                        all_files.append((root, file))
-
-            total = len(all_files)
-            for i, (root, file) in enumerate(all_files):
-                full_path = os.path.join(root, file)
-                target_file = os.path.join(shot_target_dir, file)
-
-                if not os.path.exists(target_file):
-                    shutil.copy2(full_path, target_file)
-
-                target_list.append(target_file)
-                percent = int((i + 1) / total * 100)
-                progress_signal.emit(percent)
-
-        except Exception as e:
-            self.show_message('Ошибка', f'Ошибка копирования файлов: {e}', True)
-            logger.exception(f'Ошибка копирования файлов')
-
-        return target_list
+    def get_destination_dir(self):
+        current_date = datetime.now().strftime('%Y%m%d')
+        destination_dir = os.path.join(self.cross_platform_name(f'R:/{self.selected_project.currentText()}/VFX'), current_date)
+        os.makedirs(destination_dir, exist_ok=True)
+        return destination_dir
+
+    def get_copy_tasks(self, seq_path, destination_dir):
+        """
+        Список пар (источник, назначение) для кадров шота.
+        Кадры из всех подпапок шота складываются в одну папку шота.
+        """
+        shot_target_dir = os.path.join(destination_dir, os.path.basename(seq_path))
+        os.makedirs(shot_target_dir, exist_ok=True)
+
+        tasks = []
+        for root, _, files in os.walk(seq_path):
+            for file in files:
+                if file.lower().endswith(EXTENTIONS):
+                    tasks.append((os.path.join(root, file), os.path.join(shot_target_dir, file)))
+        return tasks
     
 
 if __name__ == "__main__":
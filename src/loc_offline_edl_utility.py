@@ -15,6 +15,7 @@ from dvr_tools.css_style import apply_style
 from dvr_tools.logger_config import get_logger
 from dvr_tools.resolve_utils import ResolveObjects
 from common_tools.edl_parsers import detect_edl_parser, EDLParser, EDLParserError
+from common_tools.output_sink import OutputSink
 from config.config_loader import load_config
 from config.config import get_config
 from config.global_config import GLOBAL_CONFIG
@@ -206,15 +207,10 @@ class LogicProcessor:
             backup_path = get_output_path(self.project_name, "edl", os.path.basename(edl_path).replace(".edl", f"_converted"))
             items_data = self.get_edl_data()
 
-            with open(result_path, "w" ,encoding="utf-8") as o, open(backup_path, "w" ,encoding="utf-8") as ob:
+            with OutputSink(result_path, backup_path) as o:
                 for index, data in enumerate(items_data, start=1):
                     name, start_tc, end_tc = data
-                    index_str = index
-                    timecode_str = f"{start_tc} --> {end_tc}"
-                    name_str = name
-
-                    o.write(f"{index_str}\n{timecode_str}\n{name_str}\n\n")
-                    ob.write(f"{index_str}\n{timecode_str}\n{name_str}\n\n")
+                    o.write_srt_cue(index, start_tc, end_tc, name)
 
             logger.info(f"Сформированы SRT файлы: \n{result_path}\n{backup_path}")
             return True
@@ -246,12 +242,10 @@ class LogicProcessor:
             result_path = Path(str(srt_path).replace(".srt", "_converted.edl"))
             backup_path = get_output_path(self.project_name, "srt", os.path.basename(srt_path).replace(".srt", f"_converted"))
 
-            with open(result_path, 'w', encoding='utf-8') as o, open(backup_path, 'w', encoding='utf-8') as ob:
-                pass
-
             with open(srt_path, 'r', encoding='utf-8') as input:
                 srt = input.read().strip().split('\n\n')
 
+            with OutputSink(result_path, backup_path) as o:
                 for i in srt:
                     number, timecode_raw, shot_name = i.split('\n')
                     number = number.strip('\ufeff') # Удаление символа по началу самой первой строки
@@ -263,12 +257,9 @@ class LogicProcessor:
                     src_out = self.frame_to_timecode(self.timecode_to_frame(src_in) + rec_duration)
                     shot_name = shot_name.strip("<b>").strip("</b>")
 
-                    with open(result_path, 'a', encoding='utf-8') as o, open(backup_path, 'a', encoding='utf-8') as ob:
-                        # Жестко придерживаться табуляции, что бы корректно принимал AVID
-                        o.write(f"000{number}  {shot_name} V     C        {src_in} {src_out} {record_in} {record_out}\n")
-                        ob.write(f"000{number}  {shot_name} V     C        {src_in} {src_out} {record_in} {record_out}\n")
-                        o.write(f"* FROM CLIP NAME: {shot_name}\n")
-                        ob.write(f"* FROM CLIP NAME: {shot_name}\n")
+                    # Жестко придерживаться табуляции, что бы корректно принимал AVID
+                    o.write(f"000{number}  {shot_name} V     C        {src_in} {src_out} {record_in} {record_out}\n")
+                    o.write(f"* FROM CLIP NAME: {shot_name}\n")
 
             logger.info(f"Сформированы EDL файлы: \n{result_path}\n{backup_path}")
             return True
@@ -483,8 +474,9 @@ class LogicProcessor:
             return False
 
     def run(self) -> bool:
-        self.timeline = ResolveObjects().timeline
-        self.resolve = ResolveObjects().resolve
+        resolve = ResolveObjects()
+        self.timeline = resolve.timeline
+        self.resolve = resolve.resolve
         self.process_edl_logic = self.user_config["process_edl"]
         self.output_path = self.user_config["output_path"]
         self.edl_path = self.user_config["edl_path"]
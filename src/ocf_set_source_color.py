@@ -215,7 +215,6 @@ class GUI(QtWidgets.QWidget):
         Проверка подключения к API Resolve и получение основного объекта Resolve.
         """
         try:
-            resolve = ResolveObjects().resolve
             return ResolveObjects()
         except RuntimeError as re:
             raise
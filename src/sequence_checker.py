@@ -1,83 +1,412 @@
 import os
+import csv
+import json
+import time
+import sqlite3
 import numpy as np
 import OpenImageIO as oiio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import argparse
 import sys
+from common_tools.frame_sequence import scan_tree
 
-# --- Функция чтения EXR-файлов ---
-def read_exr(file_path):
-    """Читает EXR-файл и возвращает numpy-массив или None при ошибке."""
+# Порог средней разницы яркости между соседними кадрами
+TOLERANCE = 0.0001
+# Шаг прореживания строк и столбцов кадра при построении превью
+SAMPLE_STEP = 8
+# Количество кадров в одной задаче пула. Соседние задачи пересекаются на один кадр
+CHUNK_FRAMES = 64
+# Количество строк превью, после сравнения которых проверяется ранний выход
+COMPARE_ROWS = 32
+# Количество обработанных задач между коммитами кеша
+CACHE_COMMIT_EVERY = 32
+# Ограничение ProcessPoolExecutor на Windows
+MAX_WINDOWS_WORKERS = 61
+LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+# --- Функция чтения превью кадра ---
+def read_thumbnail(file_path, step=SAMPLE_STEP):
+    """
+    Читает кадр построчно с шагом step и возвращает уменьшенный luma-массив float32 или None при ошибке.
+    В памяти одновременно находится только одна строка кадра и само превью.
+    """
     try:
         inp = oiio.ImageInput.open(file_path)
         if not inp:
             return None
 
-        spec = inp.spec()
-        pixels = inp.read_image(oiio.FLOAT)
-        inp.close()
+        try:
+            spec = inp.spec()
+            channels = min(spec.nchannels, 3)
+            rows = range(spec.y, spec.y + spec.height, step)
+            thumbnail = np.empty((len(rows), len(range(0, spec.width, step))), dtype=np.float32)
 
-        if pixels is None or spec is None:
-            return None
+            for i, y in enumerate(rows):
+                scanline = inp.read_scanline(y, spec.z, oiio.FLOAT)
+                if scanline is None:
+                    return None
+                pixels = np.asarray(scanline).reshape(spec.width, spec.nchannels)[::step, :channels]
+                if channels == 3:
+                    thumbnail[i] = pixels @ LUMA_WEIGHTS
+                else:
+                    thumbnail[i] = pixels[:, 0]
+        finally:
+            inp.close()
 
-        return np.array(pixels)
-    except Exception as e:
+        return np.nan_to_num(thumbnail, copy=False)
+    except Exception:
         return None
 
-# --- Функция обработки пары кадров ---
-def process_frame_pair(file_pair):
-    """Обрабатывает пару кадров и возвращает информацию об артефактах."""
-    prev_path, curr_path = file_pair
-    tolerance = 0.0001
-    try:
-        prev_frame = read_exr(prev_path)
-        curr_frame = read_exr(curr_path)
+# --- Функция сравнения превью ---
+def is_freeze(prev_thumbnail, curr_thumbnail, tolerance=TOLERANCE):
+    """
+    Сравнивает превью соседних кадров по средней абсолютной разнице.
+    Сумма разницы накапливается по блокам строк, и сравнение прекращается,
+    как только она гарантированно превышает порог.
+    """
+    if prev_thumbnail.shape != curr_thumbnail.shape:
+        return False
 
-        if prev_frame is None or curr_frame is None:
-            return (prev_path, curr_path, f"Ошибка: Не удалось открыть кадр {os.path.basename(prev_path)} или {os.path.basename(curr_path)}.")
+    limit = tolerance * prev_thumbnail.size
+    total = 0.0
+    for start in range(0, prev_thumbnail.shape[0], COMPARE_ROWS):
+        stop = start + COMPARE_ROWS
+        total += float(np.abs(curr_thumbnail[start:stop] - prev_thumbnail[start:stop]).sum())
+        if total >= limit:
+            return False
+    return True
 
-        # Вычисляем разницу между кадрами
-        diff_np = np.abs(curr_frame - prev_frame)
-        mean_diff = np.mean(diff_np)
+# --- Функция обработки части секвенции ---
+def process_frames_chunk(frame_paths, report_first=True, step=SAMPLE_STEP, tolerance=TOLERANCE):
+    """
+    Проходит по кадрам скользящим окном из двух превью: каждый кадр декодируется один раз.
 
-        # Проверка на фриз-фреймы
-        if mean_diff < tolerance:
-            return (prev_path, curr_path, f"Найдены фриз-фреймы между кадрами {os.path.basename(prev_path)} и {os.path.basename(curr_path)}.")
+    Возвращает кортеж (verdicts, fingerprints, seconds):
+    verdicts - список (prev_path, curr_path, сообщение или None) для каждой пары части,
+    fingerprints - список (path, среднее, стандартное отклонение превью) для декодированных кадров,
+    seconds - время обработки части.
 
-    except Exception as e:
-        return (prev_path, curr_path, f"Ошибка при обработке кадров {os.path.basename(prev_path)}: {e}")
-    
-    return None
+    :param report_first: Вернуть вердикт первого кадра (ошибку его чтения).
+    False для частей секвенции, первый кадр которых уже проверен в предыдущей части.
+    """
+    started = time.perf_counter()
+    verdicts = []
+    fingerprints = []
+    prev_path, prev_thumbnail = None, None
+
+    for i, curr_path in enumerate(frame_paths):
+        message = None
+        try:
+            curr_thumbnail = read_thumbnail(curr_path, step)
+
+            if curr_thumbnail is None:
+                message = f"Ошибка: Не удалось открыть кадр {os.path.basename(curr_path)}."
+                fingerprints.append((curr_path, None, None))
+            else:
+                fingerprints.append((curr_path, float(curr_thumbnail.mean()), float(curr_thumbnail.std())))
+                if prev_thumbnail is not None and is_freeze(prev_thumbnail, curr_thumbnail, tolerance):
+                    message = f"Найдены фриз-фреймы между кадрами {os.path.basename(prev_path)} и {os.path.basename(curr_path)}."
+
+        except Exception as e:
+            curr_thumbnail = None
+            message = f"Ошибка при обработке кадров {os.path.basename(curr_path)}: {e}"
+
+        if i or report_first:
+            verdicts.append((prev_path, curr_path, message))
+        prev_path, prev_thumbnail = curr_path, curr_thumbnail
+
+    return verdicts, fingerprints, time.perf_counter() - started
+
+def split_frames(frame_paths, chunk_size=CHUNK_FRAMES):
+    """
+    Делит кадры секвенции на части, пересекающиеся на один кадр,
+    чтобы ни одна пара соседних кадров не потерялась на границе.
+    """
+    for start in range(0, max(len(frame_paths) - 1, 1), chunk_size):
+        yield frame_paths[start:start + chunk_size + 1], start == 0
+
+def dirty_runs(valid: list[bool]):
+    """
+    Группирует индексы пар без валидного кеша в непрерывные диапазоны [start, stop).
+    """
+    start = None
+    for i, is_valid in enumerate(valid):
+        if not is_valid and start is None:
+            start = i
+        elif is_valid and start is not None:
+            yield start, i
+            start = None
+    if start is not None:
+        yield start, len(valid)
+
+# --- Кеш проверки ---
+class FrameCache:
+    """
+    SQLite кеш проверки секвенций.
+
+    frames - размер, время модификации и статистика превью каждого кадра,
+    pairs - вердикт пары (предыдущий кадр, кадр) для параметров step и tolerance.
+    Вердикт пары валиден, пока оба кадра не изменились на диске.
+    """
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS frames (
+                path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                luma_mean REAL,
+                luma_std REAL
+            );
+            CREATE TABLE IF NOT EXISTS pairs (
+                curr_path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                prev_path TEXT,
+                step INTEGER NOT NULL,
+                tolerance REAL NOT NULL,
+                message TEXT
+            );
+            CREATE INDEX IF NOT EXISTS frames_folder ON frames(folder);
+            CREATE INDEX IF NOT EXISTS pairs_folder ON pairs(folder);
+        """)
+
+    def load_verdicts(self, sequence, step, tolerance) -> list:
+        """
+        Возвращает для каждой пары секвенции сохраненный вердикт
+        в виде (сообщение,) или None, если пару нужно проверить заново.
+        Пара с индексом 0 - первый кадр секвенции без предыдущего.
+        """
+        folder = sequence.path
+        frames = {path: (size, mtime_ns) for path, size, mtime_ns in self.connection.execute(
+            "SELECT path, size, mtime_ns FROM frames WHERE folder = ?", (folder,))}
+        pairs = {curr_path: (prev_path, pair_step, pair_tolerance, message)
+                 for curr_path, prev_path, pair_step, pair_tolerance, message in self.connection.execute(
+                     "SELECT curr_path, prev_path, step, tolerance, message FROM pairs WHERE folder = ?", (folder,))}
+
+        paths = sequence.paths
+        stats = list(zip(sequence.sizes.tolist(), sequence.mtimes.tolist()))
+        unchanged = [frames.get(path) == stat for path, stat in zip(paths, stats)]
+
+        verdicts = []
+        for i, path in enumerate(paths):
+            prev_path = paths[i - 1] if i else None
+            pair = pairs.get(path)
+            if (pair is not None and pair[0] == prev_path and pair[1] == step and pair[2] == tolerance
+                    and unchanged[i] and (i == 0 or unchanged[i - 1])):
+                verdicts.append((pair[3],))
+            else:
+                verdicts.append(None)
+        return verdicts
+
+    def store(self, sequence, verdicts, fingerprints, step, tolerance) -> None:
+        """
+        Сохраняет вердикты пар и статистику декодированных кадров.
+        """
+        folder = sequence.path
+        stats = dict(zip(sequence.paths, zip(sequence.sizes.tolist(), sequence.mtimes.tolist())))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO frames (path, folder, size, mtime_ns, luma_mean, luma_std) VALUES (?, ?, ?, ?, ?, ?)",
+            [(path, folder, *stats[path], mean, std) for path, mean, std in fingerprints])
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pairs (curr_path, folder, prev_path, step, tolerance, message) VALUES (?, ?, ?, ?, ?, ?)",
+            [(curr_path, folder, prev_path, step, tolerance, message) for prev_path, curr_path, message in verdicts])
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+
+# --- Пул воркеров ---
+def init_worker():
+    """
+    Инициализация процесса пула. OIIO работает в один поток,
+    параллелизм обеспечивается количеством процессов.
+    """
+    oiio.attribute("threads", 1)
 
+def get_executor(workers=None, executor_type="process"):
+    """
+    Создает пул воркеров.
+
+    :param workers: Количество воркеров. 0 или None - по количеству ядер.
+    :param executor_type: "process" - пул процессов, "thread" - пул потоков с многопоточностью OIIO.
+    """
+    workers = workers or os.cpu_count() or 1
+    if executor_type == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    if sys.platform == "win32":
+        workers = min(workers, MAX_WINDOWS_WORKERS)
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+# --- Прогресс и отчеты ---
+def emit(event, **data):
+    """
+    Пишет событие прогресса в stdout одной JSON строкой.
+    Не ASCII символы путей экранируются, поэтому строка читается при любой кодировке консоли.
+    """
+    print(json.dumps({"event": event, **data}), flush=True)
+
+def get_report_paths(output_path) -> tuple[str, str]:
+    """
+    Пути к JSON и CSV отчетам рядом с текстовым отчетом.
+    """
+    base = os.path.splitext(str(output_path))[0]
+    return f"{base}.json", f"{base}.csv"
+
+def write_reports(output_path, summary, folders) -> None:
+    """
+    Пишет JSON отчет с итогами и находками и CSV отчет с временем обработки по папкам.
+    """
+    json_path, csv_path = get_report_paths(output_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({**summary, "folders": folders}, f, ensure_ascii=False, indent=2)
+
+    fields = ["folder", "sequence", "frames", "frames_decoded", "bytes_decoded", "seconds", "findings"]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for folder in folders:
+            writer.writerow({**{key: folder[key] for key in fields[:-1]}, "findings": len(folder["findings"])})
+
+def finding(prev_path, curr_path, message) -> dict:
+    return {"prev": prev_path, "curr": curr_path, "message": message}
 
 # --- Функция сканирования папок ---
-def scan_folders(root_folder, output_path, extention):
+def scan_folders(root_folder, output_path, extention, step=SAMPLE_STEP, tolerance=TOLERANCE,
+                 workers=None, executor_type="process", cache_path=None):
+    """
+    Ставит части всех секвенций дерева в общую очередь пула и собирает результаты по папкам.
+    Задачи отправляются в пул по мере сканирования, поэтому обход дерева идет параллельно с проверкой.
 
-    messages = []  # Список для хранения всех сообщений об ошибках иы фриз-фреймах
+    Ход проверки пишется в stdout событиями JSON Lines:
+    scanned - итоги сканирования, finding - найденная ошибка, progress - скорость и ETA,
+    folder_done - итоги папки, done - итоги проверки.
 
+    :param cache_path: Путь к SQLite кешу. Если указан, заново проверяются
+    только пары с новыми или измененными кадрами, остальные вердикты берутся из кеша.
+    """
     if extention not in ["exr", "jpg"]:
+        emit("done", exit_code=2)
         sys.exit(2)
 
-    for folder, _, files in os.walk(root_folder):
-        exr_files = sorted([f for f in files if f.endswith(f".{extention}")])
-        if len(exr_files) < 2:
-            continue
+    started = time.perf_counter()
+    cache = FrameCache(cache_path) if cache_path else None
+    sequences = []  # (секвенция, пути кадров, вердикты пар, данные отчета) в порядке обхода
+    futures = []
+    pending = {}  # Количество незавершенных задач по секвенциям
+    frames_total = 0
+    frames_done = 0
+    bytes_done = 0
+
+    try:
+        with get_executor(workers, executor_type) as executor:
+            for sequence in scan_tree(root_folder, extention, with_stats=True):
+                if len(sequence) < 2:
+                    continue
+
+                paths = sequence.paths
+                if cache is not None:
+                    verdicts = cache.load_verdicts(sequence, step, tolerance)
+                else:
+                    verdicts = [None] * len(paths)
+
+                report = {"folder": sequence.path, "sequence": sequence.pattern, "frames": len(sequence),
+                          "frames_decoded": 0, "bytes_decoded": 0, "seconds": 0.0, "findings": []}
+                sequences.append((sequence, paths, verdicts, report))
 
-        file_pairs = [(os.path.join(folder, exr_files[i]),
-                        os.path.join(folder, exr_files[i + 1])) for i in range(len(exr_files) - 1)]
+                # Пара i проверяется вместе с предыдущим кадром i - 1
+                for start, stop in dirty_runs([verdict is not None for verdict in verdicts]):
+                    chunk_start = max(start - 1, 0)
+                    for chunk, is_first in split_frames(paths[chunk_start:stop]):
+                        report_first = is_first and start == 0
+                        future = executor.submit(process_frames_chunk, chunk, report_first, step, tolerance)
+                        chunk_bytes = int(sequence.sizes[chunk_start:chunk_start + len(chunk)].sum())
+                        futures.append((sequence, verdicts, report, chunk_start + (not report_first), chunk_bytes, future))
+                        pending[id(sequence)] = pending.get(id(sequence), 0) + 1
+                        frames_total += len(chunk)
+                        chunk_start += len(chunk) - 1
 
-        with ThreadPoolExecutor() as executor:
-            results = executor.map(process_frame_pair, file_pairs)
+                for i, verdict in enumerate(verdicts):
+                    if verdict is not None and verdict[0]:
+                        report["findings"].append(finding(paths[i - 1] if i else None, paths[i], verdict[0]))
+                        emit("finding", folder=sequence.path, cached=True, **report["findings"][-1])
+
+                if id(sequence) not in pending:
+                    emit("folder_done", folder=sequence.path, sequence=report["sequence"],
+                         frames=report["frames"], seconds=0.0, findings=len(report["findings"]))
+
+            emit("scanned", sequences=len(sequences), frames=sum(len(item[1]) for item in sequences),
+                 frames_to_decode=frames_total)
+
+            for done, (sequence, verdicts, report, index, chunk_bytes, future) in enumerate(futures, 1):
+                chunk_verdicts, fingerprints, seconds = future.result()
+                for offset, (prev_path, curr_path, message) in enumerate(chunk_verdicts):
+                    verdicts[index + offset] = (message,)
+                    if message:
+                        report["findings"].append(finding(prev_path, curr_path, message))
+                        emit("finding", folder=sequence.path, cached=False, **report["findings"][-1])
+
+                report["frames_decoded"] += len(fingerprints)
+                report["bytes_decoded"] += chunk_bytes
+                report["seconds"] += seconds
+                frames_done += len(fingerprints)
+                bytes_done += chunk_bytes
+
+                elapsed = time.perf_counter() - started
+                fps = frames_done / elapsed if elapsed else 0.0
+                emit("progress", folder=sequence.path, frames_done=frames_done, frames_total=frames_total,
+                     bytes_decoded=bytes_done, fps=round(fps, 2),
+                     mb_per_sec=round(bytes_done / elapsed / 1048576, 2) if elapsed else 0.0,
+                     eta=round((frames_total - frames_done) / fps, 1) if fps else None)
+
+                pending[id(sequence)] -= 1
+                if not pending[id(sequence)]:
+                    emit("folder_done", folder=sequence.path, sequence=report["sequence"],
+                         frames=report["frames"], seconds=round(report["seconds"], 3),
+                         findings=len(report["findings"]))
+
+                if cache is not None:
+                    cache.store(sequence, chunk_verdicts, fingerprints, step, tolerance)
+                    if done % CACHE_COMMIT_EVERY == 0:
+                        cache.commit()
+    finally:
+        if cache is not None:
+            cache.close()
+
+    messages = []
+    reports = []
+    for _, paths, verdicts, report in sequences:
+        for i, (message,) in enumerate(verdicts):
+            if message:
+                messages.append((paths[i - 1] if i else None, paths[i], message))
+        # Находки в порядке кадров, независимо от порядка завершения задач
+        if report["findings"]:
+            order = {path: i for i, path in enumerate(paths)}
+            report["findings"].sort(key=lambda item: order[item["curr"]])
+        report["seconds"] = round(report["seconds"], 3)
+        reports.append(report)
+
+    exit_code = 1 if messages else 0
+    seconds = time.perf_counter() - started
+    summary = {"root": str(root_folder), "extention": extention, "step": step, "tolerance": tolerance,
+               "exit_code": exit_code, "seconds": round(seconds, 3),
+               "frames": sum(len(item[1]) for item in sequences), "frames_decoded": frames_done,
+               "bytes_decoded": bytes_done, "findings": len(messages)}
+    write_reports(output_path, summary, reports)
 
-        for result in results:
-            if result:
-                messages.append(result)
     if messages:
         with open(output_path, "w", encoding="utf-8") as o:
             o.write("\n".join(i[2] for i in messages))
-        sys.exit(1)
-    else:        
-        sys.exit(0)
+
+    json_path, csv_path = get_report_paths(output_path)
+    emit("done", report_json=json_path, report_csv=csv_path, **summary)
+    sys.exit(exit_code)
 
 # --- Запуск приложения ---
 if __name__ == "__main__":
@@ -85,6 +414,12 @@ if __name__ == "__main__":
     parser.add_argument('exr_folder', type=str, help="Input exrs folder")
     parser.add_argument("output_path", type=str, help="result output to storage")
     parser.add_argument("extention", type=str, help="sequence extention (exr or jpg)")
+    parser.add_argument("--sample-step", type=int, default=SAMPLE_STEP, help="thumbnail downsample step")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="freeze frame mean difference threshold")
+    parser.add_argument("--workers", type=int, default=0, help="worker count (0 - cpu count)")
+    parser.add_argument("--executor", choices=("process", "thread"), default="process", help="worker pool type")
+    parser.add_argument("--cache", type=str, default=None, help="SQLite cache path for incremental checks")
     args = parser.parse_args()
-    scan_folders(args.exr_folder, args.output_path, args.extention)
+    scan_folders(args.exr_folder, args.output_path, args.extention, max(1, args.sample_step), args.tolerance,
+                 args.workers, args.executor, args.cache)
     
@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+pytest.importorskip("openpyxl")
+
+from edit_database import EditDatabase, DatabaseTreeModel, SourceRangeIndex
+from common_tools.edit_diff import EditHistory
+
+PROJECT = "TEST"
+
+def shot_data(shot_name: str, edit_name: str, add_data: str, src_in: str="01:00:00:00") -> dict:
+    return {"id": "001", "shot_name": shot_name, "src_name": "A001C001", "track_type": "V", "transition": "C",
+            "src_in": src_in, "src_out": "01:00:01:00", "src_out_full": "01:00:01:00",
+            "rec_in": "00:00:00:00", "rec_out": "00:00:01:00", "is_actual": False,
+            "edit_version": edit_name, "add_data": add_data}
+
+# Монтажи в хронологическом порядке. Первый шот есть только в поздних монтажах,
+# поэтому при вставке по шотам id строк не совпадают с порядком добавления монтажей
+EDITS = [("cut_v00", "2024-01-01 10:00:00"), ("cut_v01", "2024-01-02 10:00:00"),
+         ("cut_v02", "2024-01-03 10:00:00"), ("cut_v03", "2024-01-04 10:00:00")]
+SHOTS = {
+    "001_0010": ["cut_v02", "cut_v03"],
+    "001_0020": ["cut_v00", "cut_v02"],
+    "001_0030": ["cut_v03", "cut_v01"],
+}
+
+@pytest.fixture
+def db(tmp_path):
+    add_data = dict(EDITS)
+    data = {PROJECT: {shot: {edit: shot_data(shot, edit, add_data[edit]) for edit in edits}
+                      for shot, edits in SHOTS.items()}}
+    database = EditDatabase(tmp_path / "edits.sqlite", PROJECT)
+    database.load_dict(data)
+    yield database
+    database.close()
+
+def test_get_edits_chronological(db):
+    assert db.get_edits(PROJECT) == [edit for edit, _ in EDITS]
+
+def test_get_edits_order_survives_round_trip(db):
+    for _ in range(2):
+        db.load_dict(db.to_dict(PROJECT))
+        assert db.get_edits(PROJECT) == [edit for edit, _ in EDITS]
+
+def test_update_edits_keeps_concurrent_changes(db, tmp_path):
+    snapshot = db.to_dict(PROJECT)
+    model = DatabaseTreeModel(snapshot)
+
+    # Другая рабочая станция добавляет монтаж, пока открыта вкладка View Database
+    other = EditDatabase(tmp_path / "edits.sqlite", PROJECT)
+    other.add_shot(PROJECT, "001_0040", "cut_v04", "002", "V", "C", "01:00:00:00", "01:00:01:00",
+                   "01:00:01:00", "00:00:00:00", "00:00:01:00", "A001C002", True)
+    other.save()
+    other.close()
+
+    field = model.index_for_path((PROJECT, "001_0010", "cut_v03", "src_in"))
+    assert model.setData(model.index(field.row(), 1, field.parent()), "01:00:00:05")
+    actual = model.index_for_path((PROJECT, "001_0020", "cut_v02", "is_actual"))
+    assert model.setData(model.index(actual.row(), 1, actual.parent()), "true")
+
+    assert db.update_edits(PROJECT, model.changes[PROJECT]) == 2
+
+    data = db.to_dict(PROJECT)[PROJECT]
+    assert data["001_0010"]["cut_v03"]["src_in"] == "01:00:00:05"
+    assert data["001_0020"]["cut_v02"]["is_actual"] is True
+    assert "cut_v04" in data["001_0040"]
+    assert db.get_edits(PROJECT)[-1] == "cut_v04"
+
+def test_update_edits_skips_deleted_records(db):
+    assert db.update_edits(PROJECT, {("001_0010", "missing"): {"src_in": "01:00:00:01"}}) == 0
+
+def test_shots_history_selects_last_edits_chronologically(db):
+    db.load_dict(db.to_dict(PROJECT))
+    edit_names, shots = db.get_shots_history(PROJECT, 2)
+    assert edit_names == ["cut_v02", "cut_v03"]
+    assert {shot: sorted(edits) for shot, edits in shots.items()} == {
+        "001_0010": ["cut_v02", "cut_v03"], "001_0020": ["cut_v02"], "001_0030": ["cut_v03"]}
+
+    history = EditHistory(24, edit_names, shots)
+    categories = dict(zip(history.shot_names, history.changes()[0][:, 1]))
+    assert categories == {"001_0010": "No changes", "001_0020": "Leave", "001_0030": "New"}
+
+def test_tree_model_search_and_read_only_keys(db):
+    model = DatabaseTreeModel(db.to_dict(PROJECT))
+    assert model.find_shots("0010") == [(PROJECT, "001_0010")]
+    assert model.find_shots("1_00") == [(PROJECT, shot) for shot in SHOTS]
+    assert model.find_shots("002") == [(PROJECT, "001_0020")]
+    assert model.find_shots("zzz") == []
+
+    name = model.index_for_path((PROJECT, "001_0010", "cut_v02", "shot_name"))
+    name_value = model.index(name.row(), 1, name.parent())
+    assert not model.setData(name_value, "001_0099")
+    assert model.changes == {}
+
+def test_failed_json_migration_releases_database(tmp_path):
+    json_path = tmp_path / "edits.json"
+    json_path.write_text("{broken", encoding="utf-8")
+    with pytest.raises(ValueError):
+        EditDatabase(tmp_path / "edits.sqlite", PROJECT, str(json_path))
+
+    # Блокировка снята, перенос не отмечен выполненным и повторяется с исправленным файлом
+    json_path.write_text("{}", encoding="utf-8")
+    database = EditDatabase(tmp_path / "edits.sqlite", PROJECT, str(json_path))
+    try:
+        assert database._get_meta("json_migrated") == str(json_path)
+    finally:
+        database.close()
+
+def test_source_range_index_returns_first_overlap_in_edit_order():
+    shots = {name: {**shot_data(name, "cut_v00", "", src_in), "src_out_full": src_out}
+             for name, src_in, src_out in [("wide", "01:00:00:00", "01:00:10:00"),
+                                           ("short", "00:59:00:00", "01:00:01:00"),
+                                           ("late", "01:00:05:00", "01:00:06:00"),
+                                           ("broken", "01:00:0x:00", "01:00:06:00")]}
+    index = SourceRangeIndex(24, shots)
+    frame = lambda seconds: (3600 + seconds) * 24
+
+    assert index.find("A001C001", frame(5), frame(5))["shot_name"] == "wide"
+    assert index.find("A001C001", frame(-30), frame(-20))["shot_name"] == "short"
+    assert index.find("A001C001", frame(11), frame(12)) is None
+    assert index.find("B001C001", frame(5), frame(5)) is None
+    assert [name for name, _ in index.skipped] == ["broken"]
@@ -0,0 +1,32 @@
+import os
+from common_tools.file_copy import copy_files
+
+def make_tasks(tmp_path, count: int=8) -> list:
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    tasks = []
+    for i in range(count):
+        src = src_dir / f"frame.{1000 + i}.exr"
+        src.write_bytes(os.urandom(4096))
+        tasks.append((str(src), str(tmp_path / "dst" / src.name)))
+    return tasks
+
+def corrupt(path: str) -> None:
+    data = bytearray(open(path, "rb").read())
+    data[100] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_resume_skips_by_manifest(tmp_path):
+    tasks = make_tasks(tmp_path)
+    assert copy_files(tasks, resume=True, checksum=True) == (len(tasks), 0)
+    assert copy_files(tasks, resume=True, checksum=True) == (0, len(tasks))
+
+def test_verify_recopies_same_size_corruption(tmp_path):
+    tasks = make_tasks(tmp_path)
+    copy_files(tasks, resume=True, checksum=True)
+    src, dst = tasks[3]
+    corrupt(dst)
+
+    assert copy_files(tasks, resume=True, checksum=True, verify=True) == (1, len(tasks) - 1)
+    assert open(dst, "rb").read() == open(src, "rb").read()
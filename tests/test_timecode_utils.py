@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from timecode import Timecode
+from common_tools.timecode_utils import TimecodeCodec, get_codec, timecode_to_frames, frames_to_timecode
+
+# Non drop frame: 23.976, 24, 25. Drop frame: 29.97, 59.94
+FPS_VALUES = ["23.976", "24", "25", "29.97", "59.94"]
+
+def sample_frames(fps: str, count: int=2000) -> np.ndarray:
+    """
+    Случайные фреймы за двое суток и границы минут, десятиминуток и суток.
+    """
+    rng = np.random.default_rng(len(fps))
+    int_fps = int(round(float(fps)))
+    day = int(round(float(fps) * 86400)) if fps in ("29.97", "59.94") else int_fps * 86400
+    edges = []
+    for base in (int_fps * 60 * 9, int_fps * 60 * 10, day, int(day * 1.5)):
+        edges.extend(range(base - 4, base + 5))
+    return np.concatenate([rng.integers(1, 2 * day, count), np.array(edges), [1, 2]])
+
+@pytest.mark.parametrize("fps", FPS_VALUES)
+def test_to_timecode_matches_library(fps):
+    codec = TimecodeCodec(fps)
+    for frames in sample_frames(fps).tolist():
+        assert codec.to_timecode(frames) == str(Timecode(fps, frames=frames)), frames
+
+@pytest.mark.parametrize("fps", FPS_VALUES)
+def test_to_frames_matches_library(fps):
+    codec = TimecodeCodec(fps)
+    for frames in sample_frames(fps).tolist():
+        timecode = str(Timecode(fps, frames=frames))
+        assert codec.to_frames(timecode) == Timecode(fps, timecode).frames, timecode
+
+@pytest.mark.parametrize("fps", FPS_VALUES)
+def test_arrays_match_scalar(fps):
+    codec = get_codec(fps)
+    frames = sample_frames(fps)
+    timecodes = codec.to_timecode_array(frames)
+    assert timecodes == [codec.to_timecode(n) for n in frames.tolist()]
+    assert codec.to_frames_array(timecodes).tolist() == [codec.to_frames(tc) for tc in timecodes]
+
+@pytest.mark.parametrize("fps", ["25", "29.97"])
+def test_drop_frame_separator(fps):
+    codec = get_codec(fps)
+    assert codec.to_frames("01:00:00;00") == codec.to_frames("01:00:00:00") == Timecode(fps, "01:00:00:00").frames
+    assert codec.to_frames_array(["01:00:00;00", "01:00:00.00"]).tolist() == [codec.to_frames("01:00:00:00")] * 2
+
+def test_cached_helpers():
+    assert timecode_to_frames(24, "01:00:00:00") == Timecode("24", "01:00:00:00").frames
+    assert frames_to_timecode(24, 86401) == str(Timecode("24", frames=86401))
+    assert get_codec("25") is get_codec("25")
+
+@pytest.mark.parametrize("timecode", ["0a:00:00:00", "01-00-00-00", "01:00:0x:00", "01:00:00:0b"])
+def test_malformed_timecode_raises(timecode):
+    codec = get_codec(25)
+    with pytest.raises(ValueError):
+        codec.to_frames(timecode)
+    with pytest.raises(ValueError):
+        codec.to_frames_array(["01:00:00:00", timecode])
+
+def test_invalid_frames_raise():
+    codec = get_codec(25)
+    with pytest.raises(ValueError):
+        codec.to_timecode(0)
+    with pytest.raises(ValueError):
+        codec.to_timecode_array([1, 0])